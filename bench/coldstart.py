@@ -0,0 +1,107 @@
+"""
+Measure cold start of the server in fresh processes and fail when it
+exceeds its budget.
+
+    python -m bench.coldstart --runs 5
+    python -m bench.coldstart --own-budget-ms 80 --ready-budget-ms 2500
+
+Three numbers are reported (medians over --runs):
+  import   `import jira` in a fresh interpreter
+  own      import minus `import mcp.server.fastmcp` (the part this repo controls)
+  ready    spawning `uvicorn jira:app` until /metrics answers
+The slowest first-party modules from `-X importtime` are listed to point at
+a regression. Exits non-zero when a median is over its budget.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+import httpx
+
+from .run import ROOT, _free_port
+
+ENV = dict(
+    os.environ,
+    JIRA_BASE_URL="http://127.0.0.1:9",
+    JIRA_USER_EMAIL="bench@example.com",
+    JIRA_API_TOKEN="bench",
+    JIRA_USER_ID="bench",
+)
+
+def _import_ms(module: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=ENV, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def _ready_ms() -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "jira:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=ENV,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).raise_for_status()
+                return (time.perf_counter() - started) * 1000
+            except httpx.TransportError:
+                if process.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                if time.perf_counter() - started > 60:
+                    raise RuntimeError("server did not start")
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+
+def first_party_imports() -> List[Tuple[str, float]]:
+    """
+    Self time in ms of jira and utils.* modules, slowest first.
+    """
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import jira"], cwd=ROOT, env=ENV, capture_output=True, text=True, check=True)
+    modules: Dict[str, float] = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if self_us.strip().isdigit() and (name in ("jira", "utils") or name.startswith("utils.")):
+            modules[name] = int(self_us) / 1000
+    return sorted(modules.items(), key=lambda item: item[1], reverse=True)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold start benchmark with budgets.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--own-budget-ms", type=float, default=100)
+    parser.add_argument("--ready-budget-ms", type=float, default=3000)
+    args = parser.parse_args()
+
+    imports = [_import_ms("jira") for _ in range(args.runs)]
+    framework = [_import_ms("mcp.server.fastmcp") for _ in range(args.runs)]
+    ready = [_ready_ms() for _ in range(args.runs)]
+    results = {
+        "import": (statistics.median(imports), args.import_budget_ms),
+        "own": (max(0.0, statistics.median(imports) - statistics.median(framework)), args.own_budget_ms),
+        "ready": (statistics.median(ready), args.ready_budget_ms),
+    }
+
+    failed = False
+    for name, (value, budget) in results.items():
+        over = value > budget
+        failed = failed or over
+        print(f"{name:<8}{value:>9.1f} ms   budget {budget:.0f} ms{'   OVER BUDGET' if over else ''}")
+    print("slowest first-party modules (self time):")
+    for name, ms in first_party_imports()[:10]:
+        print(f"  {name:<28}{ms:>8.2f} ms")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
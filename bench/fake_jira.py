@@ -0,0 +1,331 @@
+"""
+Local stand-in for the Jira REST endpoints this server calls, for benchmarks.
+
+    python -m bench.fake_jira --port 8089 --latency-ms 40 --payload-kb 8
+
+Issues FAKE-1..FAKE-<issues> exist up front; created issues are kept in memory.
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+from typing import Any, Dict, List, Optional
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+STATUSES = [
+    {"id": "1", "name": "To Do"},
+    {"id": "3", "name": "In Progress"},
+    {"id": "10001", "name": "Done"},
+]
+
+FIELDS = [
+    {"id": "summary", "name": "Summary", "custom": False},
+    {"id": "description", "name": "Description", "custom": False},
+    {"id": "status", "name": "Status", "custom": False},
+    {"id": "priority", "name": "Priority", "custom": False},
+    {"id": "assignee", "name": "Assignee", "custom": False},
+    {"id": "updated", "name": "Updated", "custom": False},
+    {"id": "customfield_10007", "name": "Sprint", "custom": True},
+    {"id": "customfield_19805", "name": "Fin Business Cost Center", "custom": True},
+    {"id": "customfield_20408", "name": "Flows", "custom": True},
+    {"id": "customfield_20409", "name": "Beat Types", "custom": True},
+    {"id": "customfield_20411", "name": "Tag Types", "custom": True},
+]
+
+# Fields of the one create screen (project 31900, issue type 1); the edit screen drops project and issue type
+PRIORITIES = [{"id": "2", "name": "High"}, {"id": "3", "name": "Medium"}, {"id": "4", "name": "Low"}]
+SCREEN_FIELDS = [
+    {"fieldId": "project", "name": "Project", "required": True, "schema": {"type": "project", "system": "project"}, "allowedValues": [{"id": "31900", "key": "FAKE", "name": "Fake"}]},
+    {"fieldId": "issuetype", "name": "Issue Type", "required": True, "schema": {"type": "issuetype", "system": "issuetype"}, "allowedValues": [{"id": "1", "name": "Task"}]},
+    {"fieldId": "summary", "name": "Summary", "required": True, "schema": {"type": "string", "system": "summary"}},
+    {"fieldId": "description", "name": "Description", "required": False, "schema": {"type": "string", "system": "description"}},
+    {"fieldId": "priority", "name": "Priority", "required": False, "hasDefaultValue": True, "schema": {"type": "priority", "system": "priority"}, "allowedValues": PRIORITIES},
+    {"fieldId": "assignee", "name": "Assignee", "required": False, "schema": {"type": "user", "system": "assignee"}},
+    {"fieldId": "customfield_19805", "name": "Fin Business Cost Center", "required": True, "schema": {"type": "array", "items": "option", "customId": 19805}, "allowedValues": [{"id": "1", "value": "EDC & Enterprise"}, {"id": "2", "value": "Payments"}]},
+    {"fieldId": "customfield_20408", "name": "Flows", "required": False, "schema": {"type": "string", "customId": 20408}},
+    {"fieldId": "customfield_20409", "name": "Beat Types", "required": False, "schema": {"type": "string", "customId": 20409}},
+    {"fieldId": "customfield_20411", "name": "Tag Types", "required": False, "schema": {"type": "string", "customId": 20411}},
+]
+
+def _user(name: str) -> Dict[str, Any]:
+    return {
+        "self": f"http://fake-jira/rest/api/2/user?username={name}",
+        "name": name,
+        "key": name,
+        "emailAddress": f"{name}@example.com",
+        "avatarUrls": {f"{s}x{s}": f"http://fake-jira/secure/useravatar?size={s}&owner={name}" for s in (16, 24, 32, 48)},
+        "displayName": name.replace(".", " ").title(),
+        "active": True,
+        "timeZone": "UTC",
+    }
+
+class FakeJira:
+    """
+    In-memory issues, comments and projects plus the knobs shaping each response.
+    """
+
+    def __init__(self, issues: int = 500, comments: int = 20, payload_kb: float = 4, latency_ms: float = 0, jitter_ms: float = 0, project: str = "FAKE"):
+        self.project = project
+        self.payload = "lorem ipsum " * int(payload_kb * 1024 / 12)
+        self.comments_per_issue = comments
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.comments: Dict[str, List[Dict[str, Any]]] = {}
+        self._ids = itertools.count(10000)
+        self._numbers = itertools.count(1)
+        self.requests = 0
+        for _ in range(issues):
+            self._new_issue({"summary": "Seeded issue", "description": self.payload})
+
+    def _new_issue(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        issue_id = str(next(self._ids))
+        key = f"{self.project}-{next(self._numbers)}"
+        self.issues[key] = {
+            "expand": "renderedFields,names,schema,operations,editmeta,changelog,versionedRepresentations",
+            "id": issue_id,
+            "self": f"http://fake-jira/rest/api/2/issue/{issue_id}",
+            "key": key,
+            "fields": {
+                "summary": f"{fields.get('summary') or 'Issue'} {key}",
+                "description": fields.get("description") or self.payload,
+                "project": {"self": "http://fake-jira/rest/api/2/project/31900", "id": "31900", "key": self.project, "name": "Fake"},
+                "issuetype": {"self": "http://fake-jira/rest/api/2/issuetype/1", "id": "1", "name": "Task", "iconUrl": "http://fake-jira/task.svg"},
+                "status": dict(STATUSES[0], self="http://fake-jira/rest/api/2/status/1", iconUrl="http://fake-jira/status.png"),
+                "priority": {"self": "http://fake-jira/rest/api/2/priority/3", "id": "3", "name": "Medium", "iconUrl": "http://fake-jira/p.svg"},
+                "assignee": _user("john.doe"),
+                "reporter": _user("jane.roe"),
+                "created": "2024-01-01T10:00:00.000+0000",
+                "updated": "2024-01-01T10:00:00.000+0000",
+                "labels": ["bench"],
+                "customfield_10007": ["com.atlassian.greenhopper.service.sprint.Sprint@1f[id=9,rapidViewId=1,state=ACTIVE,name=Sprint 7,startDate=2024-01-01]"],
+                "customfield_19805": [{"self": "http://fake-jira/rest/api/2/customFieldOption/1", "value": "EDC & Enterprise", "id": "1"}],
+            },
+        }
+        self.comments[key] = [self._comment(key, i, "Seeded comment") for i in range(self.comments_per_issue)]
+        return self.issues[key]
+
+    def _comment(self, key: str, index: int, body: str) -> Dict[str, Any]:
+        return {
+            "self": f"http://fake-jira/rest/api/2/issue/{key}/comment/{index}",
+            "id": str(index),
+            "author": _user("jane.roe"),
+            "updateAuthor": _user("jane.roe"),
+            "body": body,
+            "created": f"2024-01-{index % 28 + 1:02d}T10:00:{index % 60:02d}.000+0000",
+            "updated": f"2024-01-{index % 28 + 1:02d}T10:00:{index % 60:02d}.000+0000",
+        }
+
+    async def delay(self) -> None:
+        self.requests += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+    def find(self, id_or_key: str) -> Optional[Dict[str, Any]]:
+        issue = self.issues.get(id_or_key.upper())
+        if issue is None:
+            issue = next((i for i in self.issues.values() if i["id"] == id_or_key), None)
+        return issue
+
+    def touch(self, issue: Dict[str, Any]) -> None:
+        issue["fields"]["updated"] = f"2024-02-01T10:00:00.{random.randint(0, 999):03d}+0000"
+
+def _project(issue: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    if not fields or fields in ("*all", "*navigable"):
+        return issue
+    wanted = set(fields.split(","))
+    return dict(issue, fields={k: v for k, v in issue["fields"].items() if k in wanted})
+
+def _keys_from_jql(jql: str) -> Optional[List[str]]:
+    if "key in (" not in jql:
+        return None
+    inner = jql.split("key in (", 1)[1].split(")", 1)[0]
+    return [k.strip().strip('"').upper() for k in inner.split(",") if k.strip()]
+
+def build_app(jira: FakeJira) -> Starlette:
+    async def issue(request: Request) -> Response:
+        await jira.delay()
+        found = jira.find(request.path_params["key"])
+        if found is None:
+            return JSONResponse({"errorMessages": ["Issue does not exist"]}, status_code=404)
+        if request.method == "PUT":
+            body = await request.json()
+            for field, value in (body.get("fields") or {}).items():
+                found["fields"][field] = value
+            jira.touch(found)
+            return Response(status_code=204)
+        body = _project(found, request.query_params.get("fields"))
+        if "transitions" in request.query_params.get("expand", ""):
+            body = dict(body, transitions=_transitions(found))
+        if "editmeta" in request.query_params.get("expand", ""):
+            body = dict(body, editmeta={"fields": {f["fieldId"]: f for f in SCREEN_FIELDS if f["fieldId"] not in ("project", "issuetype")}})
+        payload = json.dumps(body).encode()
+        etag = '"%s"' % hashlib.md5(payload).hexdigest()
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(payload, media_type="application/json", headers={"ETag": etag})
+
+    async def create(request: Request) -> Response:
+        await jira.delay()
+        body = await request.json()
+        created = jira._new_issue(body.get("fields") or {})
+        return JSONResponse({"id": created["id"], "key": created["key"], "self": created["self"]}, status_code=201)
+
+    async def bulk_create(request: Request) -> Response:
+        await jira.delay()
+        body = await request.json()
+        created = [jira._new_issue(update.get("fields") or {}) for update in body.get("issueUpdates", [])]
+        return JSONResponse({"issues": [{"id": i["id"], "key": i["key"], "self": i["self"]} for i in created], "errors": []}, status_code=201)
+
+    async def search(request: Request) -> Response:
+        await jira.delay()
+        params = request.query_params
+        jql = params.get("jql", "")
+        start_at = int(params.get("startAt", 0))
+        max_results = min(int(params.get("maxResults", 50)), 100)
+        keys = _keys_from_jql(jql)
+        matches = [jira.issues[k] for k in keys if k in jira.issues] if keys is not None else list(jira.issues.values())
+        # Like Jira, an unknown key fails the whole query unless validation is relaxed
+        missing = [k for k in keys or [] if k not in jira.issues]
+        warnings = [f"An issue with key '{k}' does not exist for field 'key'." for k in missing]
+        if warnings and params.get("validateQuery", "strict") not in ("warn", "false"):
+            return JSONResponse({"errorMessages": warnings, "errors": {}}, status_code=400)
+        page = matches[start_at:start_at + max_results]
+        body = {
+            "expand": "names,schema",
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(matches),
+            "issues": [_project(i, params.get("fields")) for i in page],
+        }
+        if warnings and params.get("validateQuery") == "warn":
+            body["warningMessages"] = warnings
+        return JSONResponse(body)
+
+    async def comments(request: Request) -> Response:
+        await jira.delay()
+        found = jira.find(request.path_params["key"])
+        if found is None:
+            return JSONResponse({"errorMessages": ["Issue does not exist"]}, status_code=404)
+        thread = jira.comments[found["key"]]
+        if request.method == "POST":
+            body = await request.json()
+            comment = jira._comment(found["key"], len(thread), body.get("body", ""))
+            thread.append(comment)
+            jira.touch(found)
+            return JSONResponse(comment, status_code=201)
+        start_at = int(request.query_params.get("startAt", 0))
+        max_results = int(request.query_params.get("maxResults", 50))
+        ordered = thread[::-1] if request.query_params.get("orderBy") == "-created" else thread
+        return JSONResponse({
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(thread),
+            "comments": ordered[start_at:start_at + max_results],
+        })
+
+    def _transitions(found: Dict[str, Any]) -> List[Dict[str, Any]]:
+        current = found["fields"]["status"]["id"]
+        return [
+            {"id": str(31 + i), "name": f"To {status['name']}", "to": dict(status), "fields": {}}
+            for i, status in enumerate(STATUSES) if status["id"] != current
+        ]
+
+    async def transitions(request: Request) -> Response:
+        await jira.delay()
+        found = jira.find(request.path_params["key"])
+        if found is None:
+            return JSONResponse({"errorMessages": ["Issue does not exist"]}, status_code=404)
+        if request.method == "GET":
+            return JSONResponse({"transitions": _transitions(found)})
+        body = await request.json()
+        match = next((t for t in _transitions(found) if t["id"] == body.get("transition", {}).get("id")), None)
+        if match is None:
+            return JSONResponse({"errorMessages": ["Transition is not valid"]}, status_code=400)
+        found["fields"]["status"] = dict(match["to"], self="http://fake-jira/rest/api/2/status", iconUrl="http://fake-jira/status.png")
+        jira.touch(found)
+        return Response(status_code=204)
+
+    def _project_body(project_id: str = "31900") -> Dict[str, Any]:
+        return {
+            "self": f"http://fake-jira/rest/api/2/project/{project_id}",
+            "id": project_id,
+            "key": jira.project,
+            "name": "Fake",
+            "description": jira.payload[:512],
+            "lead": _user("jane.roe"),
+            "projectTypeKey": "software",
+            "avatarUrls": {f"{s}x{s}": "http://fake-jira/projectavatar" for s in (16, 24, 32, 48)},
+            "components": [{"self": "http://fake-jira/component/1", "id": "1", "name": "Backend"}],
+            "issueTypes": [{"self": "http://fake-jira/issuetype/1", "id": "1", "name": "Task", "iconUrl": "x", "subtask": False}],
+            "versions": [{"self": "http://fake-jira/version/1", "id": "1", "name": "1.0", "archived": False, "released": True}],
+        }
+
+    async def project(request: Request) -> Response:
+        await jira.delay()
+        id_or_key = request.path_params["id_or_key"]
+        if id_or_key.upper() not in (jira.project, "31900"):
+            return JSONResponse({"errorMessages": ["No project could be found"]}, status_code=404)
+        return JSONResponse(_project_body())
+
+    async def project_search(request: Request) -> Response:
+        await jira.delay()
+        values = [_project_body(str(31900 + i)) for i in range(50)]
+        return JSONResponse({"startAt": 0, "maxResults": 50, "total": len(values), "isLast": True, "values": values})
+
+    async def fields(request: Request) -> Response:
+        await jira.delay()
+        return JSONResponse(FIELDS)
+
+    async def create_meta(request: Request) -> Response:
+        await jira.delay()
+        if request.path_params["project"].upper() not in (jira.project, "31900") or request.path_params["issue_type"] != "1":
+            return JSONResponse({"errorMessages": ["Issue type not found"]}, status_code=404)
+        start_at = int(request.query_params.get("startAt", 0))
+        max_results = int(request.query_params.get("maxResults", 50))
+        page = SCREEN_FIELDS[start_at:start_at + max_results]
+        return JSONResponse({"startAt": start_at, "maxResults": max_results, "total": len(SCREEN_FIELDS), "values": page})
+
+    return Starlette(routes=[
+        Route("/rest/api/2/issue", create, methods=["POST"]),
+        Route("/rest/api/2/issue/bulk", bulk_create, methods=["POST"]),
+        Route("/rest/api/2/issue/{key}", issue, methods=["GET", "PUT"]),
+        Route("/rest/api/2/issue/{key}/comment", comments, methods=["GET", "POST"]),
+        Route("/rest/api/2/issue/{key}/transitions", transitions, methods=["GET", "POST"]),
+        Route("/rest/api/2/search", search, methods=["GET"]),
+        Route("/rest/api/2/project/{id_or_key}", project, methods=["GET"]),
+        Route("/rest/api/3/project/search", project_search, methods=["GET"]),
+        Route("/rest/api/2/field", fields, methods=["GET"]),
+        Route("/rest/api/2/issue/createmeta/{project}/issuetypes/{issue_type}", create_meta, methods=["GET"]),
+    ])
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--issues", type=int, default=500, help="issues seeded up front")
+    parser.add_argument("--comments", type=int, default=20, help="comments per seeded issue")
+    parser.add_argument("--payload-kb", type=float, default=4, help="size of each issue description")
+    parser.add_argument("--latency-ms", type=float, default=0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random +/- spread around the latency")
+
+def from_arguments(args: argparse.Namespace) -> FakeJira:
+    return FakeJira(
+        issues=args.issues,
+        comments=args.comments,
+        payload_kb=args.payload_kb,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+    )
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(build_app(from_arguments(args)), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,230 @@
+"""
+Open many concurrent MCP sessions over /jira/sse and /jira/messages/ and run
+a mixed tool workload on each, stepping up the session count.
+
+    python -m bench.load --spawn --sessions 10,50,100,200 --duration 20
+    python -m bench.load --spawn --workers 4 --sessions 50,100,200
+    python -m bench.load --url http://127.0.0.1:7777/jira/sse --sessions 50
+
+With --spawn the fake Jira and the server (uvicorn jira:app) are started
+locally and the server's resident memory per open session and CPU use are
+reported; all client sessions share this process's event loop, so compare
+throughput against the server CPU column before blaming the server. For
+each step the report shows session setup time, per-call latency and
+throughput; the event loop is called saturated at the first step where
+throughput grows by less than --saturation-gain while p95 latency rises.
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+
+from . import fake_jira
+from .run import ROOT, _free_port, percentile, scenarios, start_fake_jira
+
+DEFAULT_MIX = "get_issue=4,get_issue_compact=1,search_issues=2,get_comments=2,add_comment=1,update_ticket=1"
+
+def parse_mix(mix: str, issues: int) -> List[Tuple[str, Callable[[int], Dict[str, Any]], int]]:
+    available = scenarios(issues)
+    workload = []
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        tool, make_args = available[name.strip()]
+        workload.append((tool, make_args, int(weight or 1)))
+    return workload
+
+def _rss_kib(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+def _cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        # utime and stime, in clock ticks
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def start_server(base_url: str, workers: int = 1) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(
+        os.environ,
+        JIRA_BASE_URL=base_url,
+        JIRA_USER_EMAIL="bench@example.com",
+        JIRA_API_TOKEN="bench",
+        JIRA_USER_ID="bench",
+        JIRA_RATE_LIMIT_ENABLED="false",
+    )
+    if workers > 1:
+        command = [sys.executable, "-c", f"from utils.workers import serve; serve('127.0.0.1', {port}, {workers})"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "jira:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    process = subprocess.Popen(
+        command,
+        cwd=ROOT,
+        env=env,
+        # FastMCP logs every request at INFO, which would bury the report
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    server = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{server}/metrics", timeout=1)
+            return process, f"{server}/jira/sse"
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+async def _session(url: str, workload: List[Tuple[str, Callable[[int], Dict[str, Any]], int]], opened: asyncio.Queue, go: asyncio.Event, stop: asyncio.Event, latencies: List[float], errors: List[int]) -> None:
+    """
+    One MCP client session over SSE. The whole lifecycle stays in one task,
+    as the SSE client's cancel scopes require: open and report the setup
+    time, wait for the step to start, call tools until told to stop, close.
+    """
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    started = time.perf_counter()
+    reported = False
+    try:
+        async with sse_client(url, sse_read_timeout=600) as (read, write):
+            async with ClientSession(read, write) as client:
+                await client.initialize()
+                await opened.put(time.perf_counter() - started)
+                reported = True
+                await go.wait()
+                tools = [(tool, make_args) for tool, make_args, _ in workload]
+                weights = [weight for _, _, weight in workload]
+                i = 0
+                while not stop.is_set():
+                    tool, make_args = random.choices(tools, weights)[0]
+                    call_started = time.perf_counter()
+                    try:
+                        result = await client.call_tool(tool, make_args(i))
+                        if result.isError:
+                            errors.append(1)
+                    except Exception:
+                        errors.append(1)
+                    latencies.append(time.perf_counter() - call_started)
+                    i += 1
+    except Exception:
+        if not reported:
+            await opened.put(None)
+
+async def run_step(url: str, count: int, workload: List[Tuple[str, Callable[[int], Dict[str, Any]], int]], duration: float, server_pid: Optional[int]) -> Dict[str, Any]:
+    rss_before = _rss_kib(server_pid) if server_pid else None
+    opened: asyncio.Queue = asyncio.Queue()
+    go, stop = asyncio.Event(), asyncio.Event()
+    latencies: List[float] = []
+    errors: List[int] = []
+    tasks = [asyncio.create_task(_session(url, workload, opened, go, stop, latencies, errors)) for _ in range(count)]
+
+    setup = [t for t in [await opened.get() for _ in range(count)] if t is not None]
+    rss_open = _rss_kib(server_pid) if server_pid else None
+
+    cpu_before = _cpu_seconds(server_pid) if server_pid else None
+    go.set()
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    stop.set()
+    elapsed = time.perf_counter() - started
+    cpu_after = _cpu_seconds(server_pid) if server_pid else None
+    calls = len(latencies)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    report = {
+        "sessions": count,
+        "failed_sessions": count - len(setup),
+        "setup_p50_ms": round(percentile(setup, 50) * 1000, 1),
+        "setup_p95_ms": round(percentile(setup, 95) * 1000, 1),
+        "calls": calls,
+        "errors": len(errors),
+        "throughput": round(calls / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+    if rss_before is not None and rss_open is not None and setup:
+        report["server_kib_per_session"] = round((rss_open - rss_before) / len(setup), 1)
+    if cpu_before is not None and cpu_after is not None:
+        # Near 100% means the server's single event loop is the bottleneck, not this load generator
+        report["server_cpu_percent"] = round((cpu_after - cpu_before) / elapsed * 100, 1)
+    return report
+
+def saturation_point(reports: List[Dict[str, Any]], min_gain: float) -> Optional[int]:
+    for previous, current in zip(reports, reports[1:]):
+        if current["throughput"] < previous["throughput"] * (1 + min_gain) and current["p95_ms"] > previous["p95_ms"]:
+            return current["sessions"]
+    return None
+
+async def main(args: argparse.Namespace) -> int:
+    processes: List[subprocess.Popen] = []
+    try:
+        url, server_pid = args.url, None
+        if args.spawn:
+            jira_process, base_url = start_fake_jira(args)
+            processes.append(jira_process)
+            server_process, url = start_server(base_url, args.workers)
+            processes.append(server_process)
+            # With workers the dispatcher's own usage is reported; compare throughput across --workers instead
+            server_pid = server_process.pid
+
+        workload = parse_mix(args.mix, args.issues)
+        columns = f"{'sessions':>9}{'failed':>7}{'setup p50':>10}{'setup p95':>10}{'calls':>8}{'errors':>7}{'calls/s':>9}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}"
+        print(columns + (f"{'KiB/session':>12}{'server cpu%':>12}" if server_pid else ""))
+        reports = []
+        for count in (int(n) for n in args.sessions.split(",")):
+            report = await run_step(url, count, workload, args.duration, server_pid)
+            reports.append(report)
+            print(
+                f"{report['sessions']:>9}{report['failed_sessions']:>7}{report['setup_p50_ms']:>10}{report['setup_p95_ms']:>10}"
+                f"{report['calls']:>8}{report['errors']:>7}{report['throughput']:>9}{report['p50_ms']:>8}{report['p95_ms']:>8}{report['p99_ms']:>8}"
+                + (f"{report.get('server_kib_per_session', ''):>12}{report.get('server_cpu_percent', ''):>12}" if server_pid else "")
+            )
+        saturated = saturation_point(reports, args.saturation_gain)
+        if saturated is not None:
+            cpu = next(r.get("server_cpu_percent") for r in reports if r["sessions"] == saturated)
+            if cpu is not None and cpu < 90:
+                print(f"Throughput stopped scaling at about {saturated} sessions with the server at {cpu}% CPU; "
+                      "the load generator or fake Jira may be the limit")
+            else:
+                print(f"Event loop saturated at about {saturated} sessions")
+        else:
+            print("No saturation within the tested session counts")
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                # uvicorn waits for SSE streams to drain on shutdown
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the MCP SSE transport with many concurrent sessions.")
+    parser.add_argument("--url", default="http://127.0.0.1:7777/jira/sse", help="SSE endpoint of a running server")
+    parser.add_argument("--spawn", action="store_true", help="start a fake Jira and a server instead of using --url")
+    parser.add_argument("--sessions", default="10,50,100", help="comma separated session counts to step through")
+    parser.add_argument("--duration", type=float, default=15, help="seconds of load per step")
+    parser.add_argument("--workers", type=int, default=1, help="with --spawn, run this many worker processes behind the dispatcher")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight pairs (see bench.run)")
+    parser.add_argument("--saturation-gain", type=float, default=0.1, help="throughput gain below which a step counts as saturated")
+    fake_jira.add_arguments(parser)
+    sys.exit(asyncio.run(main(parser.parse_args())))
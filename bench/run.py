@@ -0,0 +1,234 @@
+"""
+Drive every MCP tool against the local fake Jira and report throughput,
+latency percentiles and (optionally) allocations.
+
+    python -m bench.run --concurrency 1,8,32 --calls 200 --latency-ms 40
+    python -m bench.run --json bench.json
+    python -m bench.run --baseline bench.json --max-regression 0.25
+
+Tools are called through an in-memory MCP client session, so request
+validation and result serialization are part of every measurement. Exits
+non-zero when --baseline is given and a scenario got slower than allowed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+
+from . import fake_jira
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _issue(issues: int) -> str:
+    return f"FAKE-{random.randint(1, issues)}"
+
+def scenarios(issues: int) -> Dict[str, Tuple[str, Callable[[int], Dict[str, Any]]]]:
+    """
+    Scenario name -> (tool name, arguments for call number i).
+    """
+    return {
+        "get_issue": ("get_issue_tool", lambda i: {"issue_key": _issue(issues)}),
+        "get_issue_compact": ("get_issue_tool", lambda i: {"issue_key": _issue(issues), "fields": "triage", "shape": "compact"}),
+        "get_issues_batch": ("get_issues_batch_tool", lambda i: {"issue_keys": [_issue(issues) for _ in range(20)], "fields": "summary"}),
+        "search_issues": ("search_issues_tool", lambda i: {"project_key": "FAKE", "assignee": "bench", "max_results": 50}),
+        "search_issues_all": ("search_issues_tool", lambda i: {"project_key": "FAKE", "assignee": "bench", "max_results": 300, "fetch_all": True, "fields": "summary"}),
+        "search_text": ("search_text_tool", lambda i: {"query": "lorem ipsum"}),
+        "get_comments": ("get_comments_tool", lambda i: {"issue_key": _issue(issues)}),
+        "add_comment": ("add_comment_tool", lambda i: {"issue_key": _issue(issues), "comment": f"bench comment {i}"}),
+        "get_project_by_id": ("get_project_by_id_tool", lambda i: {"project_id": "31900"}),
+        "get_project_by_key": ("get_project_by_key_tool", lambda i: {"project_key": "FAKE"}),
+        "get_multiple_projects": ("get_multiple_projects_tool", lambda i: {"random_string": "bench"}),
+        "create_ticket": ("create_jira_ticket_tool", lambda i: {"summary": f"bench {i}", "description": "created by bench", "project_id": "31900"}),
+        "create_tickets_bulk": ("create_jira_tickets_bulk_tool", lambda i: {"tickets": [{"summary": f"bench {i}.{n}", "description": "created by bench", "project_id": "31900"} for n in range(10)]}),
+        "update_ticket": ("update_jira_ticket_tool", lambda i: {"issue_key": _issue(issues), "summary": f"updated {i}"}),
+        "transition_ticket": ("update_jira_ticket_tool", lambda i: {"issue_key": _issue(issues), "status_name": random.choice(["To Do", "In Progress", "Done"])}),
+        "bulk_update": ("bulk_update_jira_tickets_tool", lambda i: {"issue_keys": [_issue(issues) for _ in range(10)], "summary": f"bulk {i}"}),
+    }
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_fake_jira(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    """
+    Run the fake Jira in its own process so it does not compete with the
+    server under test for the event loop.
+    """
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "bench.fake_jira", "--port", str(port),
+        "--issues", str(args.issues), "--comments", str(args.comments),
+        "--payload-kb", str(args.payload_kb), "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+    ]
+    process = subprocess.Popen(command, cwd=ROOT)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/rest/api/2/field", timeout=1)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("fake Jira did not start")
+
+def configure(base_url: str, keep_rate_limit: bool) -> None:
+    """
+    Point the server at the fake Jira. Must run before jira.py is imported.
+    """
+    os.environ.update({
+        "JIRA_BASE_URL": base_url,
+        "JIRA_USER_EMAIL": "bench@example.com",
+        "JIRA_API_TOKEN": "bench",
+        "JIRA_USER_ID": "bench",
+        "JIRA_MIRROR_PROJECTS": "",
+        # Indexed once up front for search_text_tool, without a snapshot file
+        "JIRA_TEXT_INDEX_PROJECTS": "FAKE",
+        "JIRA_TEXT_INDEX_PATH": "",
+    })
+    if not keep_rate_limit:
+        os.environ["JIRA_RATE_LIMIT_ENABLED"] = "false"
+
+# Result flags the tools set to false on failure
+_FAILURE_FLAGS = ("success", "isIssueLogged", "isIssueUpdated")
+
+def failed(text: str) -> bool:
+    """
+    Whether a tool result reports a failure, either overall or for any one
+    item of a bulk call's results.
+    """
+    try:
+        body = json.loads(text)
+    except ValueError:
+        return False
+    if not isinstance(body, dict):
+        return False
+    items = [body] + [item for item in body.get("results") or [] if isinstance(item, dict)]
+    return any(item.get(flag) is False for item in items for flag in _FAILURE_FLAGS)
+
+def percentile(samples: List[float], q: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+async def run_scenario(session: Any, tool: str, make_args: Callable[[int], Dict[str, Any]], calls: int, concurrency: int, allocations: bool) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(calls))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            result = await session.call_tool(tool, make_args(i))
+            latencies.append(time.perf_counter() - started)
+            text = result.content[0].text if result.content else ""
+            if result.isError or failed(text):
+                errors += 1
+
+    if allocations:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "calls": calls,
+        "errors": errors,
+        "throughput": round(calls / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+    if allocations:
+        _, peak = tracemalloc.get_traced_memory()
+        report["peak_alloc_kib"] = round((peak - baseline) / 1024, 1)
+    return report
+
+def regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    failures = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            failures.append(f"{name}: p95 {result['p95_ms']}ms vs baseline {before['p95_ms']}ms")
+        if result["throughput"] < before["throughput"] * (1 - tolerance):
+            failures.append(f"{name}: {result['throughput']} calls/s vs baseline {before['throughput']}")
+    return failures
+
+async def main(args: argparse.Namespace) -> int:
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    process, base_url = start_fake_jira(args)
+    try:
+        configure(base_url, args.keep_rate_limit)
+        sys.path.insert(0, ROOT)
+        os.chdir(ROOT)
+        import jira
+        from utils.client import JiraClient
+        from utils.textindex import TextIndexSync
+        # Per-request httpx and per-call MCP log lines would dominate the measurement
+        logging.disable(logging.INFO)
+
+        selected = scenarios(args.issues)
+        if args.scenarios:
+            selected = {name: selected[name] for name in args.scenarios.split(",")}
+        levels = [int(c) for c in args.concurrency.split(",")]
+
+        if args.allocations:
+            tracemalloc.start()
+        results: Dict[str, Dict[str, Any]] = {}
+        await JiraClient.startup()
+        await TextIndexSync.sync_all()
+        async with create_connected_server_and_client_session(jira.mcp._mcp_server) as session:
+            print(f"{'scenario':<24}{'conc':>5}{'calls':>7}{'errors':>7}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}" + (f"{'peak KiB':>10}" if args.allocations else ""))
+            for name, (tool, make_args) in selected.items():
+                for concurrency in levels:
+                    report = await run_scenario(session, tool, make_args, args.calls, concurrency, args.allocations)
+                    results[f"{name}@{concurrency}"] = report
+                    print(
+                        f"{name:<24}{concurrency:>5}{report['calls']:>7}{report['errors']:>7}{report['throughput']:>10}"
+                        f"{report['p50_ms']:>9}{report['p95_ms']:>9}{report['p99_ms']:>9}"
+                        + (f"{report['peak_alloc_kib']:>10}" if args.allocations else "")
+                    )
+        await JiraClient.shutdown()
+    finally:
+        process.terminate()
+        process.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = regressions(results, json.load(f), args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the MCP tools against a local fake Jira.")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma separated concurrency levels")
+    parser.add_argument("--calls", type=int, default=200, help="calls per scenario and concurrency level")
+    parser.add_argument("--scenarios", help="comma separated subset of scenarios")
+    parser.add_argument("--allocations", action="store_true", help="trace allocations (slows every call down)")
+    parser.add_argument("--keep-rate-limit", action="store_true", help="leave the client-side rate limiter on")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against results written by --json")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p95/throughput change against the baseline")
+    fake_jira.add_arguments(parser)
+    sys.exit(asyncio.run(main(parser.parse_args())))
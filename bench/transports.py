@@ -0,0 +1,150 @@
+"""
+Compare the SSE transport (/jira/sse) with stateless streamable HTTP
+(/jira/mcp/) on the same spawned server.
+
+    python -m bench.transports --clients 8 --calls 400 --idle 200
+    python -m bench.transports --workers 4
+
+Two numbers per transport:
+  latency  per-call p50/p95/p99 and calls/s with --clients clients sharing --calls
+           calls of the --mix workload
+  idle     server resident memory held per client after --idle clients have
+           connected one by one, initialized and made one call, then sit idle
+"""
+import argparse
+import asyncio
+import contextlib
+import random
+import sys
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from . import fake_jira
+from .load import DEFAULT_MIX, _rss_kib, parse_mix, start_server
+from .run import percentile, start_fake_jira
+
+TRANSPORTS = ("sse", "streamable_http")
+
+@contextlib.asynccontextmanager
+async def connect(transport: str, server: str) -> AsyncIterator[Any]:
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+    from mcp.client.streamable_http import streamablehttp_client
+
+    if transport == "sse":
+        streams = sse_client(f"{server}/jira/sse", sse_read_timeout=600)
+    else:
+        streams = streamablehttp_client(f"{server}/jira/mcp/", sse_read_timeout=600)
+    async with streams as (read, write, *_):
+        async with ClientSession(read, write) as client:
+            await client.initialize()
+            yield client
+
+async def measure_latency(transport: str, server: str, workload: List[Tuple[str, Callable[[int], Dict[str, Any]], int]], clients: int, calls: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(calls))
+    tools = [(tool, make_args) for tool, make_args, _ in workload]
+    weights = [weight for _, _, weight in workload]
+
+    # Each client's whole lifecycle stays in one task, as the client cancel scopes require
+    async def client_task() -> None:
+        nonlocal errors
+        async with connect(transport, server) as client:
+            for i in counter:
+                tool, make_args = random.choices(tools, weights)[0]
+                started = time.perf_counter()
+                try:
+                    result = await client.call_tool(tool, make_args(i))
+                    errors += bool(result.isError)
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_task() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+async def measure_idle(transport: str, server: str, server_pid: int, clients: int, settle: float) -> Optional[float]:
+    """
+    KiB of server memory per connected idle client, or None when /proc is unavailable.
+    """
+    rss_before = _rss_kib(server_pid)
+    opened: asyncio.Queue = asyncio.Queue()
+    stop = asyncio.Event()
+
+    async def client_task() -> None:
+        try:
+            async with connect(transport, server) as client:
+                await client.list_tools()
+                await opened.put(True)
+                await stop.wait()
+        except Exception:
+            await opened.put(False)
+
+    # Opened one after another: the RSS delta is then what stays held per client, not the
+    # allocator's high-water mark from many concurrent handshakes
+    tasks, connected = [], 0
+    for _ in range(clients):
+        tasks.append(asyncio.create_task(client_task()))
+        connected += await opened.get()
+    await asyncio.sleep(settle)
+    rss_idle = _rss_kib(server_pid)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if rss_before is None or rss_idle is None or not connected:
+        return None
+    return round((rss_idle - rss_before) / connected, 1)
+
+def _stop(process: Any) -> None:
+    process.terminate()
+    try:
+        # uvicorn waits for SSE streams to drain on shutdown
+        process.wait(timeout=10)
+    except Exception:
+        process.kill()
+        process.wait()
+
+async def main(args: argparse.Namespace) -> int:
+    jira_process, base_url = start_fake_jira(args)
+    try:
+        workload = parse_mix(args.mix, args.issues)
+        print(f"{'transport':<17}{'calls':>7}{'errors':>7}{'calls/s':>9}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'idle KiB/client':>17}")
+        for transport in TRANSPORTS:
+            # A fresh server per transport, idle memory first, so neither inherits the other's heap growth
+            server_process, url = start_server(base_url, args.workers)
+            try:
+                server = url.rsplit("/jira/sse", 1)[0]
+                # Untimed calls first, so lazy imports and one-off allocations are not counted against clients
+                await measure_latency(transport, server, workload, 4, 40)
+                # With --workers this is the dispatcher: SSE streams stay proxied through it, stateless requests do not
+                idle = await measure_idle(transport, server, server_process.pid, args.idle, args.settle)
+                report = await measure_latency(transport, server, workload, args.clients, args.calls)
+            finally:
+                _stop(server_process)
+            print(
+                f"{transport:<17}{report['calls']:>7}{report['errors']:>7}{report['throughput']:>9}"
+                f"{report['p50_ms']:>8}{report['p95_ms']:>8}{report['p99_ms']:>8}{'' if idle is None else idle:>17}"
+            )
+    finally:
+        _stop(jira_process)
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the SSE and stateless streamable-HTTP transports.")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients for the latency run")
+    parser.add_argument("--calls", type=int, default=400, help="tool calls per transport, shared by the clients")
+    parser.add_argument("--idle", type=int, default=200, help="idle clients for the memory measurement")
+    parser.add_argument("--settle", type=float, default=2, help="seconds to wait before reading idle memory")
+    parser.add_argument("--workers", type=int, default=1, help="run this many worker processes behind the dispatcher")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight pairs (see bench.run)")
+    fake_jira.add_arguments(parser)
+    sys.exit(asyncio.run(main(parser.parse_args())))
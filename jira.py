@@ -1,40 +1,27 @@
-from typing import Any, Dict, List
-from dotenv import load_dotenv
-import httpx
+import contextlib
 import json
 import os
-from mcp.server.fastmcp import FastMCP
-from utils.issue.create import create_jira_ticket
-from utils.project.get_all import get_all_projects
-from utils.project.get import get_project
-from utils.issue.get import get_issue
-from utils.issue.comments import get_comments, add_comment
-from utils.issue.search import search_issues
-from typing import Optional
-from utils.config import JiraConfig
-import uvicorn
+from typing import Any, Dict, List, Optional
+from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from starlette.applications import Starlette
 from starlette.routing import Mount, Route
-from mcp.server.fastmcp.server import Settings, Context
-from sse_starlette.sse import ServerSentEvent
-from mcp.server.sse import SseServerTransport
-from pydantic_settings import BaseSettings
-from starlette.responses import JSONResponse
-
-# Load environment variables
-load_dotenv()
+from starlette.responses import JSONResponse, PlainTextResponse
+# Settings are read once here (utils.config also applies .env); tool
+# implementations and their dependencies are imported on first use
+from utils.config import JiraConfig
+from utils import metrics
+from utils.tracing import Tracer, traced_tool
 
-# Load MCP configuration from JSON
-with open('jira-mcp.json', 'r') as config_file:
+# Load MCP configuration from JSON next to this file, whatever the working directory
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jira-mcp.json'), 'r') as config_file:
     mcp_config = json.load(config_file)
 
 # Get server configuration
 SERVER_HOST = mcp_config['server']['host']
 SERVER_PORT = 7777  # Use a completely new port
 
-# Initialize FastMCP settings
-settings = Settings(port=SERVER_PORT, debug=False)
-
 # Initialize FastMCP with configuration from JSON
 mcp = FastMCP(
     mcp_config['name'],
@@ -42,7 +29,7 @@ mcp = FastMCP(
     port=SERVER_PORT
 )
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def create_jira_ticket_tool(
     issue_type: str = "1",
     summary: str = "",
@@ -82,6 +69,7 @@ async def create_jira_ticket_tool(
         ...     assignee="john.doe"
         ... )
     """
+    from utils.issue.create import create_jira_ticket
     return await create_jira_ticket(
         summary=summary,
         description=description,
@@ -95,13 +83,50 @@ async def create_jira_ticket_tool(
         beat_types=beat_types,
     )
 
-@mcp.tool()
-async def get_project_by_id_tool(project_id: str) -> Any:
+@mcp.tool(structured_output=False)
+async def create_jira_tickets_bulk_tool(
+    tickets: List[Dict[str, Any]],
+    concurrency: int = None,
+) -> Dict[str, Any]:
+    """
+    Create many Jira tickets at once using Jira's bulk issue endpoint.
+
+    Args:
+        tickets (List[Dict[str, Any]]): One dictionary per ticket. Each accepts the same keys as
+            create_jira_ticket_tool: summary, description, issue_type, project_id, priority, assignee,
+            fin_business_cost_center, flows, tag_types, beat_types. summary is required; missing
+            keys get the same defaults.
+        concurrency (int, optional): Maximum number of bulk requests (of up to 50 tickets each)
+            sent at the same time. Defaults to JIRA_BULK_CONCURRENCY.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - isIssueLogged: Boolean indicating if every ticket was created
+            - created / failed: Number of tickets created and failed
+            - results: One entry per ticket in input order with the created issue or the error
+
+    Example:
+        >>> await create_jira_tickets_bulk_tool(tickets=[
+        ...     {"summary": "Subtask 1", "description": "First part"},
+        ...     {"summary": "Subtask 2", "description": "Second part", "priority": "High"},
+        ... ])
+    """
+    defaults = {"description": "", "issue_type": "1", "project_id": "31900", "priority": "Medium"}
+    from utils.issue.create import create_jira_tickets_bulk
+    return await create_jira_tickets_bulk(
+        [{**defaults, **ticket} for ticket in tickets],
+        concurrency=concurrency,
+    )
+
+@mcp.tool(structured_output=False)
+async def get_project_by_id_tool(project_id: str, shape: str = None) -> Any:
     """
     Retrieve project details using the project ID.
 
     Args:
         project_id (str): The unique identifier of the Jira project.
+        shape (str, optional): "compact" for flat records with display names and no avatars or
+            self links, or "raw" for Jira's JSON. Defaults to JIRA_RESPONSE_SHAPE ("raw").
 
     Returns:
         Any: Project details including name, key, lead, and other metadata.
@@ -109,15 +134,19 @@ async def get_project_by_id_tool(project_id: str) -> Any:
     Example:
         >>> await get_project_by_id_tool(project_id="31900")
     """
-    return await get_project(project_id=project_id)
+    from utils.project.get import get_project
+    from utils.shape import shape_result
+    return await shape_result(await get_project(project_id=project_id), "project", shape)
 
-@mcp.tool()
-async def get_project_by_key_tool(project_key: str) -> Any:
+@mcp.tool(structured_output=False)
+async def get_project_by_key_tool(project_key: str, shape: str = None) -> Any:
     """
     Retrieve project details using the project key.
 
     Args:
         project_key (str): The project key (e.g., 'FCA', 'PROJ', etc.).
+        shape (str, optional): "compact" for flat records with display names and no avatars or
+            self links, or "raw" for Jira's JSON. Defaults to JIRA_RESPONSE_SHAPE ("raw").
 
     Returns:
         Any: Project details including name, ID, lead, and other metadata.
@@ -125,15 +154,19 @@ async def get_project_by_key_tool(project_key: str) -> Any:
     Example:
         >>> await get_project_by_key_tool(project_key="FCA")
     """
-    return await get_project(project_key=project_key)
+    from utils.project.get import get_project
+    from utils.shape import shape_result
+    return await shape_result(await get_project(project_key=project_key), "project", shape)
 
-@mcp.tool()
-async def get_multiple_projects_tool(random_string: str):
+@mcp.tool(structured_output=False)
+async def get_multiple_projects_tool(random_string: str, shape: str = None):
     """
     Retrieve details of all accessible Jira projects.
 
     Args:
         random_string (str): A placeholder parameter required by the tool framework.
+        shape (str, optional): "compact" for flat records with display names and no avatars or
+            self links, or "raw" for Jira's JSON. Defaults to JIRA_RESPONSE_SHAPE ("raw").
 
     Returns:
         List[Dict]: A list of dictionaries containing details of all projects.
@@ -142,45 +175,104 @@ async def get_multiple_projects_tool(random_string: str):
     Example:
         >>> await get_multiple_projects_tool(random_string="dummy")
     """
-    return await get_all_projects()
+    from utils.project.get_all import get_all_projects
+    from utils.shape import shape_result
+    return await shape_result(await get_all_projects(), "projects", shape)
 
-@mcp.tool()
-async def get_issue_tool(issue_key: str):
+@mcp.tool(structured_output=False)
+async def get_issue_tool(issue_key: str, fields: str = None, expand: str = None, shape: str = None):
     """
     Retrieve detailed information about a specific Jira issue.
 
     Args:
         issue_key (str): The unique key of the issue (e.g., 'FCA-1234').
+        fields (str, optional): Field preset ("summary", "triage", "full") or comma separated
+            field ids to return. Defaults to None (Jira's full default field set).
+        expand (str, optional): Comma separated Jira expand options (e.g. "renderedFields,changelog").
+            Defaults to None.
+        shape (str, optional): "compact" for flat records with display names and no avatars or
+            self links, or "raw" for Jira's JSON. Defaults to JIRA_RESPONSE_SHAPE ("raw").
 
     Returns:
         Dict: Complete issue details including summary, description, status,
             assignee, reporter, comments, and custom fields.
 
     Example:
-        >>> await get_issue_tool(issue_key="FCA-1234")
+        >>> await get_issue_tool(issue_key="FCA-1234", fields="triage")
+    """
+    from utils.issue.get import get_issue
+    from utils.shape import shape_result
+    return await shape_result(await get_issue(issue_key, fields=fields, expand=expand), "issue", shape)
+
+@mcp.tool(structured_output=False)
+async def get_issues_batch_tool(
+    issue_keys: List[str],
+    fields: str = None,
+    expand: str = None,
+    shape: str = None
+) -> Any:
+    """
+    Retrieve many Jira issues in one call.
+
+    Args:
+        issue_keys (List[str]): Keys of the issues to retrieve (e.g., ['FCA-1234', 'FCA-1235']).
+            Duplicates are ignored.
+        fields (str, optional): Field preset ("summary", "triage", "full") or comma separated
+            field ids to return. Defaults to None (Jira's default field set).
+        expand (str, optional): Comma separated Jira expand options. Defaults to None.
+        shape (str, optional): "compact" for flat records with display names and no avatars or
+            self links, or "raw" for Jira's JSON. Defaults to JIRA_RESPONSE_SHAPE ("raw").
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - issues: Map of issue key to issue details for every key that was found
+            - errors: Map of issue key to error message for keys that could not be fetched
+            - success: Boolean indicating if every key was fetched
+
+    Example:
+        >>> await get_issues_batch_tool(issue_keys=["FCA-1234", "FCA-1235"], fields="summary")
     """
-    return await get_issue(issue_key)
+    from utils.issue.get import get_issues_batch
+    from utils.shape import shape_result
+    return await shape_result(await get_issues_batch(issue_keys, fields=fields, expand=expand), "issues", shape)
 
-@mcp.tool()
-async def get_comments_tool(issue_key: str) -> Dict[str, Any]:
+@mcp.tool(structured_output=False)
+async def get_comments_tool(
+    issue_key: str,
+    start_at: int = 0,
+    max_results: Optional[int] = None,
+    order_by: Optional[str] = None,
+    since: Optional[str] = None,
+    shape: str = None
+) -> Any:
     """
-    Retrieve all comments associated with a Jira issue.
+    Retrieve comments associated with a Jira issue, optionally one page at a time.
 
     Args:
         issue_key (str): The unique key of the issue (e.g., 'FCA-1234').
+        start_at (int, optional): Index of the first comment to return. Defaults to 0.
+        max_results (Optional[int]): Maximum number of comments to return. Defaults to all.
+        order_by (Optional[str]): 'created' (oldest first, default) or '-created' (newest first).
+        since (Optional[str]): Only return comments created after this timestamp
+            (e.g. '2024-01-31T10:00:00.000+0000').
+        shape (str, optional): "compact" for flat records with display names and no avatars or
+            self links, or "raw" for Jira's JSON. Defaults to JIRA_RESPONSE_SHAPE ("raw").
 
     Returns:
         Dict[str, Any]: A dictionary containing:
-            - comments: List of all comments with author, content, and timestamp
+            - comments: startAt, maxResults, total and the comments with author, content, and timestamp
             - error: Error information if the request fails
             - success: Boolean indicating if the request was successful
 
     Example:
-        >>> await get_comments_tool(issue_key="FCA-1234")
+        >>> await get_comments_tool(issue_key="FCA-1234", order_by="-created", max_results=5)
     """
-    return await get_comments(issue_key)
+    from utils.issue.comments import get_comments
+    from utils.shape import shape_result
+    result = await get_comments(issue_key, start_at=start_at, max_results=max_results, order_by=order_by, since=since)
+    return await shape_result(result, "comments", shape)
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def add_comment_tool(issue_key: str, comment: str) -> Dict[str, Any]:
     """
     Add a new comment to an existing Jira issue.
@@ -201,9 +293,10 @@ async def add_comment_tool(issue_key: str, comment: str) -> Dict[str, Any]:
         ...     comment="Implementation completed, ready for review."
         ... )
     """
+    from utils.issue.comments import add_comment
     return await add_comment(issue_key, comment)
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def search_issues_tool(
     project_key: str = "FCA",
     assignee: str = JiraConfig.USER_ID,
@@ -223,7 +316,11 @@ async def search_issues_tool(
     priority: str = None,
     issue_type: str = None,
     status: List[str] = None,
-) -> Dict[str, Any]:
+    fetch_all: bool = False,
+    fields: str = None,
+    expand: str = None,
+    shape: str = None,
+) -> Any:
     """
     Search for Jira issues using various filters and criteria.
 
@@ -246,6 +343,13 @@ async def search_issues_tool(
         priority (str, optional): Issue priority level. Defaults to None.
         issue_type (str, optional): Type of the issue. Defaults to None.
         status (List[str], optional): List of issue statuses to filter by. Defaults to None.
+        fetch_all (bool, optional): Page through all matches (fetching pages concurrently)
+            instead of a single request; max_results then caps the overall result count. Defaults to False.
+        fields (str, optional): Field preset ("summary", "triage", "full") or comma separated
+            field ids to return for each issue. Defaults to None (Jira's default field set).
+        expand (str, optional): Comma separated Jira expand options. Defaults to None.
+        shape (str, optional): "compact" for flat records with display names and no avatars or
+            self links, or "raw" for Jira's JSON. Defaults to JIRA_RESPONSE_SHAPE ("raw").
 
     Returns:
         Dict[str, Any]: A dictionary containing:
@@ -263,46 +367,96 @@ async def search_issues_tool(
         ...     max_results=10
         ... )
     """
-    jql_conditions = [f"project = {project_key}"]
-    
-    if assignee and assignee.lower() != 'null':
-        jql_conditions.append(f"assignee = {assignee}")
-    if reporter:
-        jql_conditions.append(f"reporter = {reporter}")
-    if fixVersion:
-        jql_conditions.append(f'fixVersion = "{fixVersion}"')
-    if dev_assignee:
-        jql_conditions.append(f'"Dev Assignee" = "{dev_assignee}"')
-    if qa_assignee:
-        jql_conditions.append(f'"QA Assignee" = "{qa_assignee}"')
-    if be_delivery_date:
-        jql_conditions.append(f'cf[20109] = "{be_delivery_date}"')
-    if fe_delivery_date:
-        jql_conditions.append(f'cf[20108] = "{fe_delivery_date}"')
-    if dev_delivery_date:
-        jql_conditions.append(f'cf[19204] = "{dev_delivery_date}"')
-    if qa_delivery_date:
-        jql_conditions.append(f'cf[19205] = "{qa_delivery_date}"')
-    if qa_required:
-        jql_conditions.append(f'cf[13303] = "{qa_required}"')
-    if dependent_systems:
-        jql_conditions.append(f'cf[15506] = "{dependent_systems}"')
-    if epic_link:
-        jql_conditions.append(f'cf[10008] = "{epic_link}"')
-    if sprint:
-        jql_conditions.append(f'cf[10007] = "{sprint}"')
-    if priority:
-        jql_conditions.append(f'priority = "{priority}"')
-    if issue_type:
-        jql_conditions.append(f'issuetype = "{issue_type}"')
-    if status:
-        joined = ', '.join(f'"{s}"' for s in status)
-        jql_conditions.append(f"status in ({joined})")
-
-    jql = " AND ".join(jql_conditions) + " ORDER BY updated DESC"
-    return await search_issues(jql, max_results)
-
-@mcp.tool()
+    from utils.shape import shape_result
+    filters = {
+        "assignee": assignee if assignee and assignee.lower() != 'null' else None,
+        "reporter": reporter,
+        "fixVersion": fixVersion,
+        "dev_assignee": dev_assignee,
+        "qa_assignee": qa_assignee,
+        "be_delivery_date": be_delivery_date,
+        "fe_delivery_date": fe_delivery_date,
+        "dev_delivery_date": dev_delivery_date,
+        "qa_delivery_date": qa_delivery_date,
+        "qa_required": qa_required,
+        "dependent_systems": dependent_systems,
+        "epic_link": epic_link,
+        "sprint": sprint,
+        "priority": priority,
+        "issue_type": issue_type,
+        "status": status,
+    }
+
+    # Serve from the local mirror when this project is mirrored and fresh enough
+    if JiraConfig.MIRROR_PROJECTS:
+        from utils.mirror import MirrorSync
+        mirrored = await MirrorSync.search(project_key, filters, max_results, fields=fields, expand=expand)
+        if mirrored is not None:
+            return await shape_result(mirrored, "search", shape)
+
+    # Canonical JQL, so equivalent filters share an entry in the short-lived search cache
+    from utils.issue.jql import search_jql
+    from utils.issue.search import search_project_issues
+    jql = search_jql(project_key, filters)
+    result = await search_project_issues(project_key, jql, max_results, paginate=fetch_all, fields=fields, expand=expand)
+    return await shape_result(result, "search", shape)
+
+@mcp.tool(structured_output=False)
+async def search_text_tool(query: str, project_key: str = None, max_results: int = 10) -> Dict[str, Any]:
+    """
+    Find Jira issues whose summary, description or comments mention the given words,
+    ranked by relevance, using the local full-text index instead of Jira's `text ~` search.
+
+    Args:
+        query (str): Words to look for (e.g., "payment timeout retry").
+        project_key (str, optional): Only return issues from this project. Defaults to None (all indexed projects).
+        max_results (int, optional): Maximum number of issues to return. Defaults to 10.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - results: List of matching issues with key, relevance score and summary, best match first
+            - indexed_issues: Number of issues currently in the index
+            - success: Boolean indicating if the search was successful
+            - error: Error information if the index is disabled
+
+    Example:
+        >>> await search_text_tool(query="login SSO failure", project_key="FCA")
+    """
+    from utils.textindex import TextIndexSync
+    return TextIndexSync.search(query, project=project_key, limit=max_results)
+
+@mcp.tool(structured_output=False)
+async def get_field_metadata_tool(
+    project_id: str = "31900",
+    issue_type: str = "1",
+    issue_key: str = None,
+    field: str = None,
+) -> Dict[str, Any]:
+    """
+    List the fields that can be set when creating an issue of a type in a project, or when
+    editing an existing issue, with their ids, types, whether they are required and their
+    allowed values (options, priorities, ...). Served from a cache refreshed in the background.
+
+    Args:
+        project_id (str, optional): ID or key of the project whose create screen to describe. Defaults to "31900".
+        issue_type (str, optional): ID or name of the issue type. Defaults to "1" (Bug).
+        issue_key (str, optional): Describe this issue's edit screen instead (e.g., 'FCA-1234').
+        field (str, optional): Only describe this field, by id or name (e.g., "Flows" or "priority").
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - fields: List of fields with id, name, type, required and allowedValues
+            - screen: Which create or edit screen was described
+            - success: Boolean indicating if the lookup was successful
+            - error: Error information if Jira returned no metadata
+
+    Example:
+        >>> await get_field_metadata_tool(project_id="31900", issue_type="1", field="Beat Types")
+    """
+    from utils.issue.meta import describe_fields
+    return await describe_fields(project=project_id, issue_type=issue_type, issue_key=issue_key, field=field)
+
+@mcp.tool(structured_output=False)
 async def update_jira_ticket_tool(
     issue_key: str,
         summary: str = None,
@@ -350,6 +504,86 @@ async def update_jira_ticket_tool(
         beat_types=beat_types,
     )
 
+@mcp.tool(structured_output=False)
+async def bulk_update_jira_tickets_tool(
+    issue_keys: List[str],
+    ctx: Context,
+    summary: str = None,
+    description: str = None,
+    status_name: str = None,
+    priority: str = None,
+    assignee: str = None,
+    fin_business_cost_center: List[str] = None,
+    flows: str = None,
+    tag_types: str = None,
+    beat_types: str = None,
+    concurrency: int = None,
+) -> Dict[str, Any]:
+    """
+    Apply the same update (fields and/or status transition) to many Jira tickets at once.
+
+    Per-ticket results are streamed back as progress notifications while the update runs.
+
+    Args:
+        issue_keys (List[str]): Keys of the Jira tickets to update (e.g., ['FCA-1234', 'FCA-1235']).
+        summary (str): Updated title/summary for every ticket.
+        description (str): Updated description for every ticket.
+        status_name (str): The **name** of the status to transition every ticket to (e.g., "Done").
+        priority (str): Updated priority level.
+        assignee (str): Username of the person to whom the tickets should be reassigned.
+        fin_business_cost_center (List[str]): Updated financial business cost center.
+        flows (str): Updated workflow flows.
+        tag_types (str): Updated types of tags.
+        beat_types (str): Updated types of beats.
+        concurrency (int, optional): Maximum tickets updated at the same time.
+            Defaults to JIRA_UPDATE_CONCURRENCY.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - isIssueUpdated (bool): Whether every ticket was updated
+            - updated / failed (int): Number of tickets updated and failed
+            - results (List[Dict]): Per-ticket issue_key, isIssueUpdated and response or error
+
+    Example:
+        >>> await bulk_update_jira_tickets_tool(
+        ...     issue_keys=["FCA-1234", "FCA-1235"],
+        ...     status_name="Done"
+        ... )
+    """
+    from utils.issue.update import iter_bulk_update
+    total = len({key.strip().upper() for key in issue_keys if key and key.strip()})
+    results = []
+    async for result in iter_bulk_update(
+        issue_keys,
+        status_name=status_name,
+        concurrency=concurrency,
+        summary=summary,
+        description=description,
+        priority=priority,
+        assignee=assignee,
+        fin_business_cost_center=fin_business_cost_center,
+        flows=flows,
+        tag_types=tag_types,
+        beat_types=beat_types,
+    ):
+        results.append(result)
+        outcome = "updated" if result["isIssueUpdated"] else f"failed: {result['error']}"
+        await ctx.info(f"{result['issue_key']} {outcome}")
+        await ctx.report_progress(len(results), total)
+
+    updated = sum(1 for result in results if result["isIssueUpdated"])
+    return {
+        "isIssueUpdated": updated == len(results),
+        "updated": updated,
+        "failed": len(results) - updated,
+        "results": results
+    }
+
+# Record latency and in-flight counts (and, when enabled, trace spans) for every registered tool.
+# Metrics wrap the trace so the span still sees the result before it is encoded
+for tool in mcp._tool_manager.list_tools():
+    tool.fn = metrics.timed_tool(tool.name)(traced_tool(tool.name)(tool.fn))
+
 # Create SSE transport for /jira/messages/
 sse = SseServerTransport("/jira/messages/")
 
@@ -363,6 +597,7 @@ async def handle_sse(request):
     
     # Ensure we wait for proper initialization
     async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
+        metrics.sse_sessions.inc()
         try:
             # Run the server with initialization options
             await mcp._mcp_server.run(
@@ -373,23 +608,130 @@ async def handle_sse(request):
         except Exception as e:
             print(f"Error in MCP server: {str(e)}")
             raise
+        finally:
+            metrics.sse_sessions.dec()
 
 sse_route = Route("/jira/sse", endpoint=handle_sse)
 
+# Stateless streamable-HTTP transport: every POST is a self-contained MCP exchange answered with JSON,
+# so no session outlives its request and calls can go to any process or replica
+streamable_http = StreamableHTTPSessionManager(app=mcp._mcp_server, json_response=True, stateless=True)
+
+async def handle_streamable_http(scope, receive, send):
+    await streamable_http.handle_request(scope, receive, send)
+
+streamable_http_route = Mount("/jira/mcp", app=handle_streamable_http)
+
+# Route exposing cache hit/miss counters for scraping
+async def handle_cache_stats(request):
+    from utils.cache import cache_stats
+    return JSONResponse(cache_stats())
+
+cache_stats_route = Route("/jira/cache/stats", endpoint=handle_cache_stats)
+
+# Route exposing rate limiter queue depth and throttle counters
+async def handle_rate_limit_stats(request):
+    from utils.client import JiraClient
+    return JSONResponse(JiraClient.rate_limit_stats())
+
+rate_limit_stats_route = Route("/jira/ratelimit/stats", endpoint=handle_rate_limit_stats)
+
+# Route exposing retry and hedging counters for idempotent reads
+async def handle_retry_stats(request):
+    from utils.retry import retry_stats
+    return JSONResponse(retry_stats)
+
+retry_stats_route = Route("/jira/retry/stats", endpoint=handle_retry_stats)
+
+# Route exposing how many concurrent identical reads were coalesced
+async def handle_single_flight_stats(request):
+    from utils.singleflight import single_flight_stats
+    return JSONResponse(single_flight_stats())
+
+single_flight_stats_route = Route("/jira/singleflight/stats", endpoint=handle_single_flight_stats)
+
+# Route exposing local mirror sync and hit counters
+async def handle_mirror_stats(request):
+    from utils.mirror import MirrorSync
+    return JSONResponse(MirrorSync.stats)
+
+mirror_stats_route = Route("/jira/mirror/stats", endpoint=handle_mirror_stats)
+
+# Route exposing full-text index sync and query counters
+async def handle_text_index_stats(request):
+    from utils.textindex import TextIndexSync
+    return JSONResponse({**TextIndexSync.stats, "indexed_issues": len(TextIndexSync.index)})
+
+text_index_stats_route = Route("/jira/textindex/stats", endpoint=handle_text_index_stats)
+
+# Route exposing field metadata refresh counters
+async def handle_field_meta_stats(request):
+    from utils.issue.meta import FieldMetaSync
+    return JSONResponse(FieldMetaSync.stats)
+
+field_meta_stats_route = Route("/jira/fieldmeta/stats", endpoint=handle_field_meta_stats)
+
+# Route exposing how many traces and spans were written
+async def handle_trace_stats(request):
+    return JSONResponse({**Tracer.stats, "enabled": Tracer.enabled()})
+
+trace_stats_route = Route("/jira/trace/stats", endpoint=handle_trace_stats)
+
+# Prometheus scrape endpoint: tool and Jira request latency, payload sizes, in-flight counts, SSE sessions
+async def handle_metrics(request):
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+metrics_route = Route("/metrics", endpoint=handle_metrics)
+
+# Open the shared Jira HTTP client (and the optional mirror, text index and field metadata refresh) on startup and close them on shutdown
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    from utils.client import JiraClient
+    # The mirror (sqlite3) and text index are only imported when configured
+    background = []
+    if JiraConfig.MIRROR_PROJECTS:
+        from utils.mirror import MirrorSync
+        background.append(MirrorSync)
+    if JiraConfig.TEXT_INDEX_PROJECTS:
+        from utils.textindex import TextIndexSync
+        background.append(TextIndexSync)
+    if JiraConfig.FIELD_VALIDATION:
+        from utils.issue.meta import FieldMetaSync
+        background.append(FieldMetaSync)
+
+    await JiraClient.startup()
+    for engine in background:
+        await engine.start()
+    try:
+        async with streamable_http.run():
+            yield
+    finally:
+        for engine in reversed(background):
+            await engine.stop()
+        await JiraClient.shutdown()
+        await Tracer.flush()
+
 # Create Starlette app
 app = Starlette(
     debug=True,
-    routes=[messages_route, sse_route]
+    routes=[messages_route, sse_route, streamable_http_route, cache_stats_route, rate_limit_stats_route, retry_stats_route, single_flight_stats_route, mirror_stats_route, text_index_stats_route, field_meta_stats_route, trace_stats_route, metrics_route],
+    lifespan=lifespan
 )
 
 if __name__ == "__main__":
-    
-    config = uvicorn.Config(
-        app,
-        host=SERVER_HOST,
-        port=SERVER_PORT,
-        log_level="info",
-    )
-    server = uvicorn.Server(config)
-    import asyncio
-    asyncio.run(server.serve())
+    if JiraConfig.WORKERS > 1:
+        # Sessions live in worker memory, so a dispatcher pins each one to its worker
+        from utils.workers import serve
+        serve(SERVER_HOST, SERVER_PORT, JiraConfig.WORKERS)
+    else:
+        import asyncio
+        import uvicorn
+
+        config = uvicorn.Config(
+            app,
+            host=SERVER_HOST,
+            port=SERVER_PORT,
+            log_level="info",
+        )
+        server = uvicorn.Server(config)
+        asyncio.run(server.serve())
@@ -0,0 +1,100 @@
+import httpx
+from typing import Any, Dict, Optional
+from .config import JiraConfig
+from .ratelimit import AdaptiveRateLimiter, RateLimitedTransport
+from .metrics import MetricsTransport
+from .tracing import Tracer, TracingTransport
+
+class JiraClient:
+    """
+    Process-wide pooled HTTP client shared by every Jira call.
+
+    The client is opened on server startup and closed on shutdown so that
+    connections to Jira are kept alive across tool invocations instead of
+    paying a new TCP+TLS handshake per request.
+    """
+    _client: Optional[httpx.AsyncClient] = None
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+
+    @classmethod
+    def _build(cls) -> httpx.AsyncClient:
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {JiraConfig.API_TOKEN}"
+        }
+
+        # If you have a cookie for session authentication, add it here
+        cookies = {}
+        if JiraConfig.SESSION_COOKIE:
+            cookies = {"JSESSIONID": JiraConfig.SESSION_COOKIE}
+
+        limits = httpx.Limits(
+            max_connections=JiraConfig.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=JiraConfig.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=JiraConfig.HTTP_KEEPALIVE_EXPIRY,
+        )
+
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it
+        http2 = JiraConfig.HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("JIRA_HTTP2 is set but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+
+        # Metrics (and tracing) wrap the raw transport so each attempt (including throttled ones) is recorded
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        if Tracer.enabled():
+            transport = TracingTransport(transport)
+        transport = MetricsTransport(transport)
+        if JiraConfig.RATE_LIMIT_ENABLED:
+            cls.rate_limiter = AdaptiveRateLimiter(
+                rate=JiraConfig.RATE_LIMIT_RPS,
+                burst=JiraConfig.RATE_LIMIT_BURST,
+                max_concurrency=JiraConfig.RATE_LIMIT_MAX_CONCURRENCY,
+                min_concurrency=JiraConfig.RATE_LIMIT_MIN_CONCURRENCY,
+            )
+            transport = RateLimitedTransport(
+                transport,
+                cls.rate_limiter,
+                max_retries=JiraConfig.RATE_LIMIT_MAX_RETRIES,
+            )
+
+        return httpx.AsyncClient(
+            headers=headers,
+            cookies=cookies,
+            timeout=JiraConfig.HTTP_TIMEOUT,
+            transport=transport,
+        )
+
+    @classmethod
+    async def startup(cls) -> None:
+        """Open the shared client. Called from the Starlette lifespan."""
+        if cls._client is None or cls._client.is_closed:
+            cls._client = cls._build()
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close the shared client and release pooled connections."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    @classmethod
+    def get(cls) -> httpx.AsyncClient:
+        """
+        Return the shared client, creating it lazily when the server lifespan
+        has not run (e.g. stdio transport or scripts).
+        """
+        if cls._client is None or cls._client.is_closed:
+            cls._client = cls._build()
+        return cls._client
+
+    @classmethod
+    def rate_limit_stats(cls) -> Dict[str, Any]:
+        """Queue depth, throttle counters and current window of the shared rate limiter."""
+        if cls.rate_limiter is None:
+            return {"enabled": False}
+        return {"enabled": True, **cls.rate_limiter.stats()}
@@ -1,5 +1,29 @@
 import os
-from typing import Optional
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+
+# Every setting below is read once, at import, so .env has to be applied first
+load_dotenv()
+
+def _parse_hedge_delay(value: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    JIRA_HEDGE_DELAY as (seconds, latency percentile as a fraction); both None
+    when hedging is off or the setting is not a number of seconds or "p<N>".
+    """
+    setting = (value or "").strip().lower()
+    if not setting or setting == "off":
+        return None, None
+    try:
+        if setting.startswith("p"):
+            percentile = float(setting[1:])
+            if 0 < percentile <= 100:
+                return None, percentile / 100
+        elif float(setting) >= 0:
+            return float(setting), None
+    except ValueError:
+        pass
+    print(f"Ignoring invalid JIRA_HEDGE_DELAY {value!r}, hedging is off")
+    return None, None
 
 class JiraConfig:
     BASE_URL: str = os.getenv('JIRA_BASE_URL')
@@ -8,6 +32,107 @@ class JiraConfig:
     USER_ID: str = os.getenv('JIRA_USER_ID')
     SESSION_COOKIE: Optional[str] = os.getenv('JIRA_SESSION_COOKIE')
 
+    # Shared HTTP client settings
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv('JIRA_HTTP_MAX_CONNECTIONS', '100'))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv('JIRA_HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv('JIRA_HTTP_KEEPALIVE_EXPIRY', '30'))
+    HTTP_TIMEOUT: float = float(os.getenv('JIRA_HTTP_TIMEOUT', '30'))
+    HTTP2: bool = os.getenv('JIRA_HTTP2', 'false').lower() == 'true'
+
+    # Project lookup cache
+    PROJECT_CACHE_TTL: float = float(os.getenv('JIRA_PROJECT_CACHE_TTL', '3600'))
+    PROJECT_CACHE_MAXSIZE: int = int(os.getenv('JIRA_PROJECT_CACHE_MAXSIZE', '512'))
+
+    # Issue revalidation cache
+    ISSUE_CACHE_TTL: float = float(os.getenv('JIRA_ISSUE_CACHE_TTL', '1800'))
+    ISSUE_CACHE_MAXSIZE: int = int(os.getenv('JIRA_ISSUE_CACHE_MAXSIZE', '1024'))
+
+    # Paginated search
+    SEARCH_PAGE_SIZE: int = int(os.getenv('JIRA_SEARCH_PAGE_SIZE', '100'))
+    SEARCH_CONCURRENCY: int = int(os.getenv('JIRA_SEARCH_CONCURRENCY', '4'))
+    SEARCH_CACHE_TTL: float = float(os.getenv('JIRA_SEARCH_CACHE_TTL', '30'))
+    SEARCH_CACHE_MAXSIZE: int = int(os.getenv('JIRA_SEARCH_CACHE_MAXSIZE', '256'))
+
+    # Batch issue fetch
+    BATCH_CHUNK_SIZE: int = int(os.getenv('JIRA_BATCH_CHUNK_SIZE', '50'))
+    BATCH_CONCURRENCY: int = int(os.getenv('JIRA_BATCH_CONCURRENCY', '4'))
+
+    # Bulk issue creation
+    BULK_CHUNK_SIZE: int = int(os.getenv('JIRA_BULK_CHUNK_SIZE', '50'))
+    BULK_CONCURRENCY: int = int(os.getenv('JIRA_BULK_CONCURRENCY', '2'))
+
+    # Bulk issue updates
+    UPDATE_CONCURRENCY: int = int(os.getenv('JIRA_UPDATE_CONCURRENCY', '8'))
+
+    # Transition resolution cache
+    TRANSITION_CACHE_TTL: float = float(os.getenv('JIRA_TRANSITION_CACHE_TTL', '3600'))
+    TRANSITION_CACHE_MAXSIZE: int = int(os.getenv('JIRA_TRANSITION_CACHE_MAXSIZE', '512'))
+
+    # Client-side rate limiting (token bucket + AIMD concurrency window); floored
+    # so a zero setting slows requests down instead of stopping them
+    RATE_LIMIT_ENABLED: bool = os.getenv('JIRA_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_RPS: float = max(float(os.getenv('JIRA_RATE_LIMIT_RPS', '10')), 0.1)
+    RATE_LIMIT_BURST: int = max(int(os.getenv('JIRA_RATE_LIMIT_BURST', '20')), 1)
+    RATE_LIMIT_MAX_CONCURRENCY: int = max(int(os.getenv('JIRA_RATE_LIMIT_MAX_CONCURRENCY', '20')), 1)
+    RATE_LIMIT_MIN_CONCURRENCY: int = max(int(os.getenv('JIRA_RATE_LIMIT_MIN_CONCURRENCY', '1')), 1)
+    RATE_LIMIT_MAX_RETRIES: int = int(os.getenv('JIRA_RATE_LIMIT_MAX_RETRIES', '2'))
+
+    # Retries and hedging for idempotent reads
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv('JIRA_RETRY_MAX_ATTEMPTS', '3'))
+    RETRY_BASE_DELAY: float = float(os.getenv('JIRA_RETRY_BASE_DELAY', '0.2'))
+    RETRY_MAX_DELAY: float = float(os.getenv('JIRA_RETRY_MAX_DELAY', '2'))
+    RETRY_DEADLINE: float = float(os.getenv('JIRA_RETRY_DEADLINE', '30'))
+    HEDGE_DELAY: Optional[float]
+    HEDGE_PERCENTILE: Optional[float]
+    HEDGE_DELAY, HEDGE_PERCENTILE = _parse_hedge_delay(os.getenv('JIRA_HEDGE_DELAY'))
+    HEDGE_FALLBACK_DELAY: float = float(os.getenv('JIRA_HEDGE_FALLBACK_DELAY', '1'))
+
+    # Local SQLite mirror of project issues (disabled unless projects are listed)
+    MIRROR_PROJECTS: List[str] = [p.strip().upper() for p in os.getenv('JIRA_MIRROR_PROJECTS', '').split(',') if p.strip()]
+    MIRROR_DB_PATH: str = os.getenv('JIRA_MIRROR_DB_PATH', 'jira-mirror.sqlite3')
+    MIRROR_SYNC_INTERVAL: float = float(os.getenv('JIRA_MIRROR_SYNC_INTERVAL', '60'))
+    MIRROR_FULL_SYNC_INTERVAL: float = float(os.getenv('JIRA_MIRROR_FULL_SYNC_INTERVAL', '86400'))
+    MIRROR_SYNC_OVERLAP_MINUTES: int = int(os.getenv('JIRA_MIRROR_SYNC_OVERLAP_MINUTES', '2'))
+    MIRROR_MAX_STALENESS: float = float(os.getenv('JIRA_MIRROR_MAX_STALENESS', '180'))
+
+    # Offline full-text index (disabled unless projects are listed)
+    TEXT_INDEX_PROJECTS: List[str] = [p.strip().upper() for p in os.getenv('JIRA_TEXT_INDEX_PROJECTS', '').split(',') if p.strip()]
+    TEXT_INDEX_PATH: Optional[str] = os.getenv('JIRA_TEXT_INDEX_PATH', 'jira-text-index.json')
+    TEXT_INDEX_SYNC_INTERVAL: float = float(os.getenv('JIRA_TEXT_INDEX_SYNC_INTERVAL', '120'))
+    TEXT_INDEX_FULL_SYNC_INTERVAL: float = float(os.getenv('JIRA_TEXT_INDEX_FULL_SYNC_INTERVAL', '86400'))
+    TEXT_INDEX_CONCURRENCY: int = int(os.getenv('JIRA_TEXT_INDEX_CONCURRENCY', '4'))
+    TEXT_INDEX_SYNC_OVERLAP_MINUTES: int = int(os.getenv('JIRA_TEXT_INDEX_SYNC_OVERLAP_MINUTES', '2'))
+
+    # Comment paging and per-issue comment cache
+    COMMENT_PAGE_SIZE: int = int(os.getenv('JIRA_COMMENT_PAGE_SIZE', '100'))
+    COMMENT_CACHE_TTL: float = float(os.getenv('JIRA_COMMENT_CACHE_TTL', '600'))
+    COMMENT_CACHE_MAXSIZE: int = int(os.getenv('JIRA_COMMENT_CACHE_MAXSIZE', '256'))
+
+    # Response shaping ("raw" Jira JSON or "compact" records) and field name cache
+    RESPONSE_SHAPE: str = os.getenv('JIRA_RESPONSE_SHAPE', 'raw').strip().lower()
+    FIELD_CACHE_TTL: float = float(os.getenv('JIRA_FIELD_CACHE_TTL', '86400'))
+
+    # Create/edit screen metadata used to check fields before writes, warmed for
+    # "project:issue type" pairs on startup and refreshed in the background
+    FIELD_VALIDATION: bool = os.getenv('JIRA_FIELD_VALIDATION', 'true').lower() == 'true'
+    FIELD_META_TTL: float = float(os.getenv('JIRA_FIELD_META_TTL', '3600'))
+    FIELD_META_MAXSIZE: int = int(os.getenv('JIRA_FIELD_META_MAXSIZE', '256'))
+    FIELD_META_REFRESH_INTERVAL: float = float(os.getenv('JIRA_FIELD_META_REFRESH_INTERVAL', '1800'))
+    FIELD_META_WARM: List[str] = [p.strip() for p in os.getenv('JIRA_FIELD_META_WARM', '31900:1').split(',') if p.strip()]
+
+    # Opt-in request tracing: spans of sampled or slow tool calls appended as JSONL
+    TRACE_ENABLED: bool = os.getenv('JIRA_TRACE_ENABLED', 'false').lower() == 'true'
+    TRACE_SAMPLE_RATE: float = float(os.getenv('JIRA_TRACE_SAMPLE_RATE', '0.01'))
+    TRACE_SLOW_MS: float = float(os.getenv('JIRA_TRACE_SLOW_MS', '2000'))
+    TRACE_PATH: str = os.getenv('JIRA_TRACE_PATH', 'jira-traces.jsonl')
+    TRACE_FORMAT: str = os.getenv('JIRA_TRACE_FORMAT', 'jsonl').strip().lower()
+    TRACE_BUFFER_SIZE: int = int(os.getenv('JIRA_TRACE_BUFFER_SIZE', '100'))
+
+    # Worker processes behind a session-affine dispatcher (1 runs the app in-process);
+    # the dispatcher numbers them, and worker 0 runs the mirror and text index syncs
+    WORKERS: int = int(os.getenv('JIRA_WORKERS', '1'))
+    WORKER_INDEX: int = int(os.getenv('JIRA_WORKER_INDEX', '0'))
+
     @classmethod
     def validate_config(cls) -> None:
         required_vars = {
@@ -19,4 +144,4 @@ class JiraConfig:
         
         missing_vars = [var for var, value in required_vars.items() if not value]
         if missing_vars:
-            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}") 
\ No newline at end of file
+            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
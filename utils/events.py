@@ -0,0 +1,21 @@
+from typing import Callable, List
+
+# Callbacks run after this server writes to an issue (create, update, transition, comment)
+_write_listeners: List[Callable[[str], None]] = []
+
+def on_issue_write(listener: Callable[[str], None]) -> Callable[[str], None]:
+    """
+    Register a callback taking the written issue's key. Usable as a decorator.
+    """
+    _write_listeners.append(listener)
+    return listener
+
+def issue_written(issue_key: str) -> None:
+    """
+    Tell every registered cache that issue_key was just written to.
+    """
+    for listener in _write_listeners:
+        try:
+            listener(issue_key)
+        except Exception as e:
+            print(f"Error in issue write listener {listener.__name__}: {e}")
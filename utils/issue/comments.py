@@ -1,45 +1,169 @@
+import asyncio
 import httpx
-from typing import Dict, Any, List
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 from ..config import JiraConfig
+from ..client import JiraClient
+from ..retry import get_with_retry
+from ..singleflight import single_flight
+from ..cache import TTLCache
+from ..events import issue_written, on_issue_write
 import json
 
-async def get_comments(issue_key: str) -> Dict[str, Any]:
+# Comments of recently read issues in created order; later reads only fetch the tail
+comment_cache = TTLCache(
+    "comments",
+    ttl=JiraConfig.COMMENT_CACHE_TTL,
+    maxsize=JiraConfig.COMMENT_CACHE_MAXSIZE,
+)
+
+async def _fetch_comment_page(client: httpx.AsyncClient, url: str, start_at: int, max_results: int) -> Dict[str, Any]:
+    params = {
+        "startAt": start_at,
+        "maxResults": max_results,
+        "orderBy": "created"
+    }
+    response = await get_with_retry(client, url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+async def _fetch_all_comments(client: httpx.AsyncClient, url: str) -> List[Dict[str, Any]]:
+    """
+    Every comment in created order. The first page tells us the total and the
+    remaining pages are fetched concurrently.
+    """
+    page_size = JiraConfig.COMMENT_PAGE_SIZE
+    first = await _fetch_comment_page(client, url, 0, page_size)
+    comments = list(first.get("comments", []))
+    step = max(first.get("maxResults") or len(comments) or page_size, 1)
+    pages = await asyncio.gather(*(
+        _fetch_comment_page(client, url, start, step)
+        for start in range(step, first.get("total", 0), step)
+    ))
+    for page in pages:
+        comments.extend(page.get("comments", []))
+    return comments
+
+async def fetch_all_comments(issue_key: str) -> List[Dict[str, Any]]:
+    """
+    Every comment of an issue straight from Jira, leaving comment_cache
+    untouched; for background readers such as the text index.
     """
-    Get all comments for a Jira issue.
-    
+    JiraConfig.validate_config()
+    url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{issue_key}/comment"
+    return await _fetch_all_comments(JiraClient.get(), url)
+
+async def _synced_comments(client: httpx.AsyncClient, issue_key: str, url: str) -> List[Dict[str, Any]]:
+    """
+    All comments of an issue, reusing the cached head and fetching only the
+    comments created since. The tail is read from the last cached comment on;
+    everything is fetched again when that comment moved or changed, or when
+    Jira's total disagrees with the merged list. Only the last cached comment
+    is compared, so edits to earlier ones show once the entry expires or this
+    server writes to the issue.
+    """
+    cache_key = issue_key.upper()
+    cached = comment_cache.get(cache_key)
+    if not cached:
+        comments = await _fetch_all_comments(client, url)
+    else:
+        last = cached[-1]
+        comments = list(cached[:-1])
+        while True:
+            page = await _fetch_comment_page(client, url, len(comments), JiraConfig.COMMENT_PAGE_SIZE)
+            page_comments = page.get("comments", [])
+            if last is not None:
+                first = page_comments[0] if page_comments else {}
+                if first.get("id") != last.get("id") or first.get("updated") != last.get("updated"):
+                    comments = await _fetch_all_comments(client, url)
+                    break
+                last = None
+            comments.extend(page_comments)
+            if not page_comments or len(comments) >= page.get("total", 0):
+                if len(comments) != page.get("total", len(comments)):
+                    comments = await _fetch_all_comments(client, url)
+                break
+    comment_cache.set(cache_key, comments)
+    return comments
+
+@on_issue_write
+def invalidate_comments(issue_key: str) -> None:
+    """
+    Drop the cached comments of an issue this server just wrote to.
+    """
+    comment_cache.invalidate(issue_key.upper())
+
+def _parse_time(value: str) -> datetime:
+    """
+    Parse a Jira timestamp ("2024-01-31T10:00:00.000+0000") or an ISO 8601 one.
+    """
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+@single_flight("comments")
+async def get_comments(
+    issue_key: str,
+    start_at: int = 0,
+    max_results: Optional[int] = None,
+    order_by: Optional[str] = None,
+    since: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Get the comments for a Jira issue.
+
+    Comments already read are cached per issue so repeated reads only fetch
+    the comments added since.
+
     Args:
         issue_key: The key of the issue to get comments for
-        
+        start_at: Index of the first comment to return (default 0)
+        max_results: Maximum number of comments to return (default all)
+        order_by: "created" (oldest first, default) or "-created" (newest first)
+        since: Only return comments created after this timestamp
+            (e.g. "2024-01-31T10:00:00.000+0000" or "2024-01-31T10:00:00+00:00")
+
     Returns:
         Dict containing the comments
     """
     JiraConfig.validate_config()
     url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{issue_key}/comment"
-    
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JiraConfig.API_TOKEN}"
-    }
-    
-    # If you have a cookie for session authentication, add it here
-    cookies = {}
-    if hasattr(JiraConfig, 'SESSION_COOKIE') and JiraConfig.SESSION_COOKIE:
-        cookies = {"JSESSIONID": JiraConfig.SESSION_COOKIE}
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=headers,
-                cookies=cookies
-            )
+        client = JiraClient.get()
+        if order_by not in (None, "created", "+created", "-created"):
+            raise ValueError("order_by must be 'created' or '-created'")
+
+        # A single window of an issue we have not read yet is cheaper to ask Jira for directly
+        if max_results is not None and since is None and comment_cache.get(issue_key.upper()) is None:
+            response = await get_with_retry(client, url, params={
+                "startAt": start_at,
+                "maxResults": max_results,
+                "orderBy": order_by or "created"
+            })
             response.raise_for_status()
             json_response = response.json()
-            return {
-                "success": True,
-                "comments": json_response
+        else:
+            comments = await _synced_comments(client, issue_key, url)
+            if since:
+                cutoff = _parse_time(since)
+                comments = [c for c in comments if c.get("created") and _parse_time(c["created"]) > cutoff]
+            if order_by == "-created":
+                comments = comments[::-1]
+            end = start_at + max_results if max_results is not None else None
+            window = comments[start_at:end]
+            json_response = {
+                "startAt": start_at,
+                "maxResults": len(window),
+                "total": len(comments),
+                "comments": window
             }
+        return {
+            "success": True,
+            "comments": json_response
+        }
     except httpx.HTTPStatusError as e:
         return {
             "success": False,
@@ -54,46 +178,34 @@ async def get_comments(issue_key: str) -> Dict[str, Any]:
 async def add_comment(issue_key: str, comment: str) -> Dict[str, Any]:
     """
     Add a comment to a Jira issue.
-    
+
     Args:
         issue_key: The key of the issue to add comment to
         comment: The comment text to add
-        
+
     Returns:
         Dict containing the response from Jira
     """
     JiraConfig.validate_config()
     url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{issue_key}/comment"
-    
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JiraConfig.API_TOKEN}"
-    }
-    
-    # If you have a cookie for session authentication, add it here
-    cookies = {}
-    if hasattr(JiraConfig, 'SESSION_COOKIE') and JiraConfig.SESSION_COOKIE:
-        cookies = {"JSESSIONID": JiraConfig.SESSION_COOKIE}
 
     payload = {
         "body": comment
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                headers=headers,
-                cookies=cookies
-            )
-            response.raise_for_status()
-            json_response = response.json()
-            return {
-                "success": True,
-                "response": json_response
-            }
+        client = JiraClient.get()
+        response = await client.post(
+            url,
+            json=payload
+        )
+        response.raise_for_status()
+        issue_written(issue_key)
+        json_response = response.json()
+        return {
+            "success": True,
+            "response": json_response
+        }
     except httpx.HTTPStatusError as e:
         return {
             "success": False,
@@ -103,4 +215,4 @@ async def add_comment(issue_key: str, comment: str) -> Dict[str, Any]:
         return {
             "success": False,
             "error": f"An error occurred: {str(e)}"
-        } 
\ No newline at end of file
+        }
@@ -1,10 +1,14 @@
 import os
 import json
+import asyncio
 import httpx
 from typing import Dict, Any, Optional, List
 from ..config import JiraConfig
+from ..client import JiraClient
+from ..events import issue_written
+from .meta import prepare_create_fields
 
-async def create_jira_ticket(
+def build_create_fields(
     summary: str,
     description: str,
     project_id: str = "20648",
@@ -15,43 +19,11 @@ async def create_jira_ticket(
     flows: str = "*",  # Default value for customfield_20408
     tag_types: str = "*",  # Default value for customfield_20411
     beat_types: str = "*",  # Default value for customfield_20409
-    # reporter: Optional[str] = None,
-    # custom_fields: Optional[Dict[str, Any]] = None,
-    # parent_key: Optional[str] = None,
-    # labels: Optional[List[str]] = None,
-    # security_id: Optional[str] = None,
-    # original_estimate: Optional[str] = None,
-    # remaining_estimate: Optional[str] = None,
-    # versions: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
-    Create a Jira ticket with the given parameters
-    Args:
-        summary: Title of the ticket
-        description: Description of the ticket
-        project_id: ID of the project
-        issue_type: Type of issue (default is "1" for Bug)
-        priority: Priority of the ticket
-        assignee: Username of the assignee
-        fin_business_cost_center: List of Fin_Business Cost Center values (customfield_19805)
-        flows: Flows value (customfield_20408)
-        tag_types: Tag Types value (customfield_20411)
-        beat_types: Beat Types value (customfield_20409)
-    Returns:
-        Dict containing the response from Jira
+    Build the `fields` object for a new issue, shared by single and bulk creation.
+    See create_jira_ticket for the meaning of each argument.
     """
-    JiraConfig.validate_config()
-    url = JiraConfig.BASE_URL + "/rest/api/2/issue"
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JiraConfig.API_TOKEN}",
-    }
-
-    # Add cookie if configured
-    if hasattr(JiraConfig, 'COOKIE') and JiraConfig.COOKIE:
-        headers["Cookie"] = JiraConfig.COOKIE
-
     # Create fields object similar to Java implementation
     fields = {
         "project": { "id": project_id },  # Changed from key to id
@@ -103,22 +75,83 @@ async def create_jira_ticket(
     # if custom_fields:
     #     fields.update(custom_fields)
 
-    payload = {"fields": fields}
+    return fields
+
+async def create_jira_ticket(
+    summary: str,
+    description: str,
+    project_id: str = "20648",
+    issue_type: str = "1",  # Default to Bug type
+    priority: Optional[str] = None,
+    assignee: Optional[str] = None,
+    fin_business_cost_center: List[str] = ["EDC & Enterprise"],  # Default value for customfield_19805
+    flows: str = "*",  # Default value for customfield_20408
+    tag_types: str = "*",  # Default value for customfield_20411
+    beat_types: str = "*",  # Default value for customfield_20409
+    # reporter: Optional[str] = None,
+    # custom_fields: Optional[Dict[str, Any]] = None,
+    # parent_key: Optional[str] = None,
+    # labels: Optional[List[str]] = None,
+    # security_id: Optional[str] = None,
+    # original_estimate: Optional[str] = None,
+    # remaining_estimate: Optional[str] = None,
+    # versions: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Create a Jira ticket with the given parameters
+    Args:
+        summary: Title of the ticket
+        description: Description of the ticket
+        project_id: ID of the project
+        issue_type: Type of issue (default is "1" for Bug)
+        priority: Priority of the ticket
+        assignee: Username of the assignee
+        fin_business_cost_center: List of Fin_Business Cost Center values (customfield_19805)
+        flows: Flows value (customfield_20408)
+        tag_types: Tag Types value (customfield_20411)
+        beat_types: Beat Types value (customfield_20409)
+    Returns:
+        Dict containing the response from Jira
+    """
+    JiraConfig.validate_config()
+    url = JiraConfig.BASE_URL + "/rest/api/2/issue"
+
+    fields = build_create_fields(
+        summary=summary,
+        description=description,
+        project_id=project_id,
+        issue_type=issue_type,
+        priority=priority,
+        assignee=assignee,
+        fin_business_cost_center=fin_business_cost_center,
+        flows=flows,
+        tag_types=tag_types,
+        beat_types=beat_types,
+    )
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                headers=headers
-            )
-            response.raise_for_status()
-            result = response.json()
-            
+        # Checked against the create screen first, so a bad value costs no write
+        fields, errors = await prepare_create_fields(fields)
+        if errors:
             return {
-                "isIssueLogged": True,
-                "response": result
+                "isIssueLogged": False,
+                "error": "Invalid fields: " + "; ".join(errors)
             }
+
+        payload = {"fields": fields}
+        client = JiraClient.get()
+        response = await client.post(
+            url,
+            json=payload
+        )
+        response.raise_for_status()
+        result = response.json()
+        issue_written(result.get("key", ""))
+
+        return {
+            "isIssueLogged": True,
+            "response": result
+        }
     except httpx.HTTPStatusError as e:
         return {
             "isIssueLogged": False,
@@ -128,4 +161,131 @@ async def create_jira_ticket(
         return {
             "isIssueLogged": False,
             "error": f"An error occurred: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+def _is_bulk_result(body: Any) -> bool:
+    """
+    True for the bulk endpoint's own answer: created issues plus a list of
+    {failedElementNumber, elementErrors} entries. Jira's ordinary error body
+    also has an "errors" key, but holds a dict of field messages there.
+    """
+    if not isinstance(body, dict) or ("issues" not in body and "errors" not in body):
+        return False
+    errors = body.get("errors", [])
+    return (
+        isinstance(body.get("issues", []), list)
+        and isinstance(errors, list)
+        and all(isinstance(failure, dict) and "failedElementNumber" in failure for failure in errors)
+    )
+
+def _error_messages(response: httpx.Response) -> str:
+    """The errorMessages and field errors of a Jira error body, or its raw text."""
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        return response.text
+    messages = [str(message) for message in body.get("errorMessages") or []]
+    errors = body.get("errors")
+    if isinstance(errors, dict):
+        messages += [f"{field}: {message}" for field, message in errors.items()]
+    return "; ".join(messages) or response.text
+
+async def _post_bulk_chunk(client: httpx.AsyncClient, url: str, chunk: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Post one chunk of (index, fields) pairs and map Jira's answer back onto each item.
+    """
+    payload = {"issueUpdates": [{"fields": fields} for _, fields in chunk]}
+    try:
+        response = await client.post(url, json=payload)
+        # Jira answers 400 with the same body shape when every element failed
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if not _is_bulk_result(body):
+            response.raise_for_status()
+            error = f"Unexpected response from the bulk endpoint: {response.text}"
+            return [{"index": index, "isIssueLogged": False, "error": error} for index, _ in chunk]
+    except httpx.HTTPStatusError as e:
+        error = f"HTTP error occurred: {str(e)}\nResponse: {_error_messages(e.response)}"
+        return [{"index": index, "isIssueLogged": False, "error": error} for index, _ in chunk]
+    except Exception as e:
+        error = f"An error occurred: {str(e)}"
+        return [{"index": index, "isIssueLogged": False, "error": error} for index, _ in chunk]
+
+    failures = {}
+    for failure in body.get("errors", []):
+        element_errors = failure.get("elementErrors", {})
+        failures[failure.get("failedElementNumber")] = json.dumps(element_errors) if element_errors else f"HTTP {failure.get('status')}"
+
+    # Created issues are listed in request order, skipping the failed elements
+    created = iter(body.get("issues", []))
+    results = []
+    for position, (index, _) in enumerate(chunk):
+        if position in failures:
+            results.append({"index": index, "isIssueLogged": False, "error": failures[position]})
+        else:
+            issue = next(created, None)
+            if issue:
+                issue_written(issue.get("key", ""))
+            results.append({"index": index, "isIssueLogged": True, "response": issue})
+    return results
+
+async def create_jira_tickets_bulk(
+    tickets: List[Dict[str, Any]],
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Create many Jira tickets through the bulk issue endpoint
+    Args:
+        tickets: One dict per ticket, with the same keys as create_jira_ticket's arguments
+        chunk_size: Tickets per bulk request (default JIRA_BULK_CHUNK_SIZE, Jira allows at most 50)
+        concurrency: Maximum bulk requests in flight (default JIRA_BULK_CONCURRENCY)
+    Returns:
+        Dict containing one result per ticket, in input order
+    """
+    JiraConfig.validate_config()
+    url = JiraConfig.BASE_URL + "/rest/api/2/issue/bulk"
+    chunk_size = min(chunk_size or JiraConfig.BULK_CHUNK_SIZE, 50)
+    semaphore = asyncio.Semaphore(concurrency or JiraConfig.BULK_CONCURRENCY)
+
+    results: Dict[int, Dict[str, Any]] = {}
+    prepared = []
+    for index, ticket in enumerate(tickets):
+        try:
+            prepared.append((index, build_create_fields(**ticket)))
+        except TypeError as e:
+            results[index] = {"index": index, "isIssueLogged": False, "error": f"Invalid ticket: {str(e)}"}
+
+    # Every ticket is checked against its create screen; screens are cached, so this is mostly local
+    async def check(index: int, fields: Dict[str, Any]) -> Optional[tuple]:
+        fields, errors = await prepare_create_fields(fields)
+        if errors:
+            results[index] = {"index": index, "isIssueLogged": False, "error": "Invalid fields: " + "; ".join(errors)}
+            return None
+        return index, fields
+
+    checked = await asyncio.gather(*(check(index, fields) for index, fields in prepared))
+    prepared = [item for item in checked if item is not None]
+
+    client = JiraClient.get()
+
+    async def run(chunk: List[tuple]) -> None:
+        async with semaphore:
+            for result in await _post_bulk_chunk(client, url, chunk):
+                results[result["index"]] = result
+
+    chunks = [prepared[i:i + chunk_size] for i in range(0, len(prepared), chunk_size)]
+    await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+    ordered = [results[index] for index in range(len(tickets))]
+    created = sum(1 for result in ordered if result["isIssueLogged"])
+    return {
+        "isIssueLogged": created == len(tickets),
+        "created": created,
+        "failed": len(tickets) - created,
+        "results": ordered
+    }
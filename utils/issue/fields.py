@@ -0,0 +1,121 @@
+from typing import Any, Dict, List, Optional, Union
+from ..config import JiraConfig
+from ..client import JiraClient
+from ..retry import get_with_retry
+from ..cache import TTLCache
+from ..singleflight import single_flight
+
+# Jira's field list (system and custom) rarely changes. The single entry is
+# {"fields": [field, ...], "names": {id: display name}}
+field_cache = TTLCache("fields", ttl=JiraConfig.FIELD_CACHE_TTL, maxsize=1)
+
+# Named field projections for issue reads. "full" sends no projection, so Jira
+# returns its default field set.
+FIELD_PRESETS: Dict[str, Optional[List[str]]] = {
+    "summary": [
+        "summary",
+        "status",
+        "issuetype",
+        "priority",
+        "assignee",
+        "updated",
+    ],
+    "triage": [
+        "summary",
+        "status",
+        "issuetype",
+        "priority",
+        "assignee",
+        "reporter",
+        "created",
+        "updated",
+        "description",
+        "labels",
+        "components",
+        "fixVersions",
+        "customfield_10007",  # Sprint
+        "customfield_10008",  # Epic Link
+        "customfield_19204",  # Dev delivery date
+        "customfield_19205",  # QA delivery date
+    ],
+    "full": None,
+}
+
+def resolve_fields(fields: Optional[Union[str, List[str]]], require: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Turn a preset name, a comma separated string or a list of field ids into
+    the value of Jira's `fields` query parameter.
+
+    Args:
+        fields: Preset name (see FIELD_PRESETS), "a,b,c" or ["a", "b", "c"]
+        require: Fields that must be part of any projection that is sent
+
+    Returns:
+        Comma separated field list, or None to let Jira use its default set
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        name = fields.strip().lower()
+        if name in FIELD_PRESETS:
+            fields = FIELD_PRESETS[name]
+            if fields is None:
+                return None
+        else:
+            fields = fields.split(",")
+
+    names = [f.strip() for f in fields if f and f.strip()]
+    if not names:
+        return None
+    for field in require or []:
+        if field not in names:
+            names.append(field)
+    return ",".join(names)
+
+@single_flight("fields")
+async def _load_fields(refresh: bool = False) -> Dict[str, Any]:
+    cached = None if refresh else field_cache.get("all")
+    if cached is not None:
+        return cached
+
+    JiraConfig.validate_config()
+    client = JiraClient.get()
+    response = await get_with_retry(client, f"{JiraConfig.BASE_URL}/rest/api/2/field")
+    response.raise_for_status()
+    fields = response.json()
+    entry = {
+        "fields": fields,
+        "names": {field["id"]: field.get("name") or field["id"] for field in fields},
+    }
+    field_cache.set("all", entry)
+    return entry
+
+async def get_fields(refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Every field Jira knows (id, name, custom, schema, ...), from /rest/api/2/field.
+
+    Args:
+        refresh: Fetch the list again instead of serving the cached copy
+    """
+    return (await _load_fields(refresh))["fields"]
+
+async def get_field_names() -> Dict[str, str]:
+    """
+    Map every field id (e.g. "customfield_10007") to its display name ("Sprint").
+    """
+    return (await _load_fields())["names"]
+
+def _normalize_name(name: str) -> str:
+    return " ".join(name.replace("_", " ").lower().split())
+
+async def find_field(id_or_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Look a field up by id, or by display name ignoring case, underscores and
+    repeated spaces ("fin_business cost center" finds "Fin_Business Cost Center").
+    """
+    fields = await get_fields()
+    for field in fields:
+        if field["id"] == id_or_name:
+            return field
+    wanted = _normalize_name(id_or_name)
+    return next((field for field in fields if _normalize_name(field.get("name") or "") == wanted), None)
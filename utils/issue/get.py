@@ -1,39 +1,196 @@
+import asyncio
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 from ..config import JiraConfig
-import json
+from ..client import JiraClient
+from ..retry import get_with_retry
+from ..cache import TTLCache
+from ..singleflight import single_flight
+from ..events import on_issue_write
+from .fields import resolve_fields
+from .search import search_issues
 
-async def get_issue(issue_id_or_key: str) -> Dict[str, Any]:
+# Parsed issues with the validators needed to revalidate them cheaply, keyed
+# on (issue, fields, expand). Entries are
+# {"issue": payload, "updated": fields.updated, "etag": ETag or None}
+issue_cache = TTLCache(
+    "issue",
+    ttl=JiraConfig.ISSUE_CACHE_TTL,
+    maxsize=JiraConfig.ISSUE_CACHE_MAXSIZE,
+)
+
+def _name(issue_id_or_key: str) -> str:
+    return str(issue_id_or_key).strip().upper()
+
+def _store(issue_id_or_key: str, variant: Tuple, payload: Dict[str, Any], etag: Optional[str]) -> None:
+    entry = {
+        "issue": payload,
+        "updated": (payload.get("fields") or {}).get("updated"),
+        "etag": etag,
+    }
+    # Cache under the requested name as well as the issue's ID and key
+    for name in {_name(issue_id_or_key), payload.get("id"), payload.get("key")}:
+        if name:
+            issue_cache.set((_name(name),) + variant, entry)
+
+@on_issue_write
+def invalidate_issue(issue_id_or_key: str) -> None:
+    """
+    Drop every cached projection of an issue (under both its ID and key)
+    after it has been written to.
+    """
+    names = {_name(issue_id_or_key)}
+    for cache_key, entry in issue_cache.items():
+        if cache_key[0] in names:
+            for name in (entry["issue"].get("id"), entry["issue"].get("key")):
+                if name:
+                    names.add(_name(name))
+    issue_cache.invalidate_where(lambda cache_key: cache_key[0] in names)
+
+async def _revalidate(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, str],
+    entry: Dict[str, Any],
+) -> Optional[httpx.Response]:
+    """
+    Check whether a cached issue is still current.
+
+    Returns None when the cached copy is still current, otherwise the
+    response carrying the full, changed issue.
+    """
+    if entry["etag"]:
+        response = await get_with_retry(client, url, params=params, headers={"If-None-Match": entry["etag"]})
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return response
+
+    # No ETag from this Jira instance: probe only the updated timestamp
+    probe = await get_with_retry(client, url, params={"fields": "updated"})
+    probe.raise_for_status()
+    updated = (probe.json().get("fields") or {}).get("updated")
+    if updated is not None and updated == entry["updated"]:
+        return None
+    return await get_with_retry(client, url, params=params)
+
+@single_flight("issue")
+async def get_issue(
+    issue_id_or_key: str,
+    fields: Optional[Union[str, List[str]]] = None,
+    expand: Optional[str] = None,
+) -> Dict[str, Any]:
     """
     Get a single Jira issue by ID or key.
-    
+
+    Previously fetched issues are revalidated with If-None-Match (or a
+    fields=updated probe when Jira sends no ETag) instead of refetching the
+    full body.
+
     Args:
         issue_id_or_key: The ID or key of the issue to retrieve
-        
+        fields: Field preset ("summary", "triage", "full") or list of field ids
+            to return; None returns Jira's default field set
+        expand: Comma separated Jira expand options (e.g. "renderedFields,changelog")
+
     Returns:
         Dict containing the issue details
     """
     JiraConfig.validate_config()
     url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{issue_id_or_key}"
-    
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JiraConfig.API_TOKEN}"
+
+    params = {}
+    # updated is always projected so the cached copy can be revalidated
+    projection = resolve_fields(fields, require=["updated"])
+    if projection:
+        params["fields"] = projection
+    if expand:
+        params["expand"] = expand
+    variant = (projection, expand)
+
+    client = JiraClient.get()
+    entry = issue_cache.get((_name(issue_id_or_key),) + variant)
+    if entry is not None:
+        response = await _revalidate(client, url, params, entry)
+        if response is None:
+            return entry["issue"]
+    else:
+        response = await get_with_retry(client, url, params=params)
+
+    response.raise_for_status()
+    json_response = response.json()
+    _store(issue_id_or_key, variant, json_response, response.headers.get("ETag"))
+    return json_response
+
+async def get_issues_batch(
+    issue_keys: List[str],
+    fields: Optional[Union[str, List[str]]] = None,
+    expand: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Get many Jira issues at once.
+
+    Keys are deduplicated and fetched with chunked `key in (...)` JQL searches
+    sent with validateQuery=warn, so a missing or hidden key does not fail its
+    chunk: keys Jira warns about are reported as not found. Any other key a
+    search did not return (e.g. moved to another project, or the whole chunk
+    failed) is retried with a single GET. Failures are reported per key
+    instead of failing the batch.
+
+    Args:
+        issue_keys: Keys or IDs of the issues to retrieve
+        fields: Field preset ("summary", "triage", "full") or list of field ids
+        expand: Comma separated Jira expand options
+        chunk_size: Keys per JQL search (default JIRA_BATCH_CHUNK_SIZE)
+        concurrency: Maximum requests in flight (default JIRA_BATCH_CONCURRENCY)
+
+    Returns:
+        Dict containing the issues by key and the per-key errors
+    """
+    JiraConfig.validate_config()
+    chunk_size = chunk_size or JiraConfig.BATCH_CHUNK_SIZE
+    semaphore = asyncio.Semaphore(concurrency or JiraConfig.BATCH_CONCURRENCY)
+
+    keys = list(dict.fromkeys(_name(key) for key in issue_keys if key and str(key).strip()))
+    projection = resolve_fields(fields, require=["updated"])
+    issues: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+
+    async def search_chunk(chunk: List[str]) -> None:
+        joined = ", ".join(f'"{key}"' for key in chunk)
+        async with semaphore:
+            result = await search_issues(f"key in ({joined})", len(chunk), fields=projection, expand=expand, validate_query="warn")
+        if not result["success"]:
+            return
+        warnings = result["issues"].get("warningMessages") or []
+        for key in chunk:
+            if any(f"'{key}'" in warning.upper() for warning in warnings):
+                errors[key] = "Issue does not exist or you do not have permission to see it"
+        for issue in result["issues"].get("issues", []):
+            for name in (issue.get("key"), issue.get("id")):
+                if name and _name(name) in chunk:
+                    issues[_name(name)] = issue
+            # Search results have no ETag but can still seed the revalidation cache
+            if projection:
+                _store(issue.get("key"), (projection, expand), issue, None)
+
+    async def get_single(key: str) -> None:
+        try:
+            async with semaphore:
+                issues[key] = await get_issue(key, fields=fields, expand=expand)
+        except httpx.HTTPStatusError as e:
+            errors[key] = f"HTTP error occurred: {str(e)}"
+        except Exception as e:
+            errors[key] = f"An error occurred: {str(e)}"
+
+    chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+    await asyncio.gather(*(search_chunk(chunk) for chunk in chunks))
+    await asyncio.gather(*(get_single(key) for key in keys if key not in issues and key not in errors))
+
+    return {
+        "success": not errors,
+        "issues": {key: issues[key] for key in keys if key in issues},
+        "errors": errors,
     }
-    
-    # If you have a cookie for session authentication, add it here
-    cookies = {}
-    if hasattr(JiraConfig, 'SESSION_COOKIE') and JiraConfig.SESSION_COOKIE:
-        cookies = {"JSESSIONID": JiraConfig.SESSION_COOKIE}
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            url,
-            headers=headers,
-            cookies=cookies
-        )
-        response.raise_for_status()
-        json_response = response.json()
-        print(json.dumps(json_response, sort_keys=True, indent=4, separators=(",", ": ")))
-        return json_response
\ No newline at end of file
@@ -0,0 +1,177 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# JQL functions passed through as functions (matched case-insensitively); any
+# other value, including other call-like text, is quoted as a literal.
+# Functions returning one value can be compared with `=`
+SCALAR_FUNCTIONS = {
+    "currentuser", "currentlogin", "lastlogin", "now",
+    "startofday", "startofweek", "startofmonth", "startofyear",
+    "endofday", "endofweek", "endofmonth", "endofyear",
+    "latestreleasedversion", "earliestunreleasedversion",
+}
+# Functions returning a list, which Jira only accepts after `in` / `not in`
+LIST_FUNCTIONS = {
+    "membersof", "opensprints", "closedsprints", "futuresprints",
+    "releasedversions", "unreleasedversions",
+    "issuehistory", "watchedissues", "votedissues", "componentsleadbyuser", "projectsleadbyuser",
+}
+JQL_FUNCTIONS = SCALAR_FUNCTIONS | LIST_FUNCTIONS
+# Keywords matching fields without a value
+_EMPTY_KEYWORDS = {"empty", "null"}
+_FUNCTION = re.compile(r"^(\w+)\s*\((.*)\)$", re.DOTALL)
+# Arguments are double-quoted strings or bare text up to the next comma
+_ARGUMENT = re.compile(r'"(?:[^"\\]|\\.)*"|[^,]+')
+_INTEGER = re.compile(r"^[+-]?\d+$")
+_WHITESPACE = re.compile(r"\s+")
+
+# Fields whose values Jira matches case-insensitively; they are lower-cased so
+# "In Progress" and "in progress" produce the same query
+CASE_INSENSITIVE = {"assignee", "reporter", "status", "priority", "issuetype", '"dev assignee"', '"qa assignee"'}
+
+# search_issues_tool filter name -> JQL field
+SEARCH_FIELDS: Dict[str, str] = {
+    "assignee": "assignee",
+    "reporter": "reporter",
+    "fixVersion": "fixVersion",
+    "dev_assignee": '"Dev Assignee"',
+    "qa_assignee": '"QA Assignee"',
+    "be_delivery_date": "cf[20109]",
+    "fe_delivery_date": "cf[20108]",
+    "dev_delivery_date": "cf[19204]",
+    "qa_delivery_date": "cf[19205]",
+    "qa_required": "cf[13303]",
+    "dependent_systems": "cf[15506]",
+    "epic_link": "cf[10008]",
+    "sprint": "cf[10007]",
+    "priority": "priority",
+    "issue_type": "issuetype",
+    "status": "status",
+}
+
+def quote(value: str) -> str:
+    """
+    Render value as a JQL string literal, escaping backslashes and double quotes.
+    """
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def render_function(value: str) -> Optional[str]:
+    """
+    Render value as a call of one of JQL_FUNCTIONS, or None when it is not one.
+    Integer arguments are kept bare and every other argument is re-quoted, so
+    nothing but the function name reaches the query unescaped.
+
+        render_function('membersOf(jira-users)') -> 'membersOf("jira-users")'
+        render_function('a() OR project = OTHER OR b()') -> None
+    """
+    match = _FUNCTION.match(value.strip())
+    if not match or match.group(1).lower() not in JQL_FUNCTIONS:
+        return None
+    # Parentheses outside quoted arguments mean the text is more than one call
+    if re.search(r"[()]", re.sub(r'"(?:[^"\\]|\\.)*"', "", match.group(2))):
+        return None
+    arguments = []
+    for argument in _ARGUMENT.findall(match.group(2)):
+        argument = argument.strip()
+        if not argument:
+            continue
+        if _INTEGER.match(argument):
+            arguments.append(argument)
+            continue
+        if len(argument) >= 2 and argument[0] == argument[-1] == '"':
+            argument = re.sub(r"\\(.)", r"\1", argument[1:-1])
+        arguments.append(quote(argument))
+    return f"{match.group(1)}({', '.join(arguments)})"
+
+def is_list_function(rendered: str) -> bool:
+    """True when rendered (as returned by render_function) calls one of LIST_FUNCTIONS."""
+    return rendered.split("(", 1)[0].lower() in LIST_FUNCTIONS
+
+def is_literal(value: Any) -> bool:
+    """
+    False when value is a JQL function call or the EMPTY keyword, which only
+    Jira can evaluate.
+    """
+    text = str(value).strip()
+    return text.lower() not in _EMPTY_KEYWORDS and render_function(text) is None
+
+class JqlBuilder:
+    """
+    Builds a canonical JQL query: values are trimmed with inner whitespace
+    collapsed, case-insensitive fields are lower-cased, `in` lists are
+    de-duplicated and sorted, and clauses are emitted in sorted order, so
+    equivalent filters always produce the same string.
+
+        JqlBuilder().project("fca").equals("priority", "High").any_of("status", ["To Do", "Done"]).build()
+        -> 'priority = "high" AND project = "FCA" AND status in ("done", "to do") ORDER BY updated DESC'
+    """
+
+    def __init__(self, order_by: str = "updated DESC"):
+        self._clauses: Dict[Tuple[str, str], str] = {}
+        self._order_by = order_by
+
+    def _value(self, field: str, value: Any) -> str:
+        text = _WHITESPACE.sub(" ", str(value).strip())
+        if text.lower() in _EMPTY_KEYWORDS:
+            return "EMPTY"
+        function = render_function(text)
+        if function is not None:
+            return function
+        if field.lower() in CASE_INSENSITIVE:
+            text = text.lower()
+        return quote(text)
+
+    def project(self, key: str) -> "JqlBuilder":
+        key = key.strip().upper()
+        self._clauses[("project", "=")] = f"project = {quote(key)}"
+        return self
+
+    def equals(self, field: str, value: Any) -> "JqlBuilder":
+        """
+        Add `field = value`; None and blank values are skipped. EMPTY becomes
+        `field is EMPTY` and list functions `field in fn()`.
+        """
+        if value is None or not str(value).strip():
+            return self
+        rendered = self._value(field, value)
+        if rendered == "EMPTY":
+            clause = f"{field} is EMPTY"
+        elif is_list_function(rendered):
+            clause = f"{field} in {rendered}"
+        else:
+            clause = f"{field} = {rendered}"
+        self._clauses[(field.lower(), "=")] = clause
+        return self
+
+    def any_of(self, field: str, values: Optional[Iterable[Any]]) -> "JqlBuilder":
+        """
+        Add `field in (...)`; empty lists are skipped. List functions cannot
+        sit inside the list, so each becomes an OR-ed `field in fn()`.
+        """
+        rendered = sorted({self._value(field, v) for v in values or [] if v is not None and str(v).strip()})
+        functions = [value for value in rendered if is_list_function(value)]
+        listed = [value for value in rendered if not is_list_function(value)]
+        alternatives: List[str] = [f"{field} in ({', '.join(listed)})"] if listed else []
+        alternatives += [f"{field} in {function}" for function in functions]
+        if len(alternatives) == 1:
+            self._clauses[(field.lower(), "in")] = alternatives[0]
+        elif alternatives:
+            self._clauses[(field.lower(), "in")] = "(" + " OR ".join(alternatives) + ")"
+        return self
+
+    def build(self) -> str:
+        jql = " AND ".join(clause for _, clause in sorted(self._clauses.items()))
+        return f"{jql} ORDER BY {self._order_by}" if self._order_by else jql
+
+def search_jql(project_key: str, filters: Dict[str, Any]) -> str:
+    """
+    Canonical JQL for search_issues_tool's filters (see SEARCH_FIELDS).
+    """
+    builder = JqlBuilder().project(project_key)
+    for name, field in SEARCH_FIELDS.items():
+        value = filters.get(name)
+        if isinstance(value, (list, tuple, set)):
+            builder.any_of(field, value)
+        else:
+            builder.equals(field, value)
+    return builder.build()
@@ -0,0 +1,423 @@
+import asyncio
+import httpx
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..config import JiraConfig
+from ..client import JiraClient
+from ..retry import get_with_retry
+from ..cache import TTLCache
+from ..singleflight import single_flight
+from .fields import find_field, get_field_names, get_fields
+
+# Screen metadata keyed on ("create", project, issue type) or ("edit", project id,
+# issue type id, status id). Entries are {"fields": {field id: description} or None
+# when Jira would not say, "issue": key the edit metadata was read from}
+meta_cache = TTLCache(
+    "field_meta",
+    ttl=JiraConfig.FIELD_META_TTL,
+    maxsize=JiraConfig.FIELD_META_MAXSIZE,
+)
+
+# Failed lookups are remembered briefly so writes do not wait on a metadata endpoint that keeps failing
+FAILED_LOOKUP_TTL = 60
+
+# Custom fields the create and update tools set, by the id they were written
+# against and the display name used to find them where that id does not exist
+TOOL_FIELDS: Dict[str, str] = {
+    "customfield_19805": "Fin_Business Cost Center",
+    "customfield_20408": "Flows",
+    "customfield_20411": "Tag Types",
+    "customfield_20409": "Beat Types",
+}
+
+# Every edit screen carries these; updates touching nothing else skip the edit metadata lookup
+_ALWAYS_EDITABLE = {"summary", "description"}
+
+# Fields Jira fills in itself when a create leaves them out (the caller, the
+# project's default assignee), even where createmeta marks them required
+_SERVER_FILLED = {"reporter", "assignee"}
+
+# Attributes kept from each allowed value (icons and self links are dropped)
+_ALLOWED_ATTRIBUTES = ("id", "name", "value", "key", "disabled")
+
+def _describe(field_id: str, field: Dict[str, Any]) -> Dict[str, Any]:
+    allowed = [
+        {k: value[k] for k in _ALLOWED_ATTRIBUTES if k in value}
+        for value in field.get("allowedValues") or []
+        if isinstance(value, dict)
+    ]
+    return {
+        "id": field_id,
+        "name": field.get("name") or field_id,
+        "required": bool(field.get("required")),
+        "hasDefaultValue": bool(field.get("hasDefaultValue")),
+        "schema": field.get("schema") or {},
+        "allowedValues": allowed or None,
+    }
+
+async def _fetch_create_meta(client: httpx.AsyncClient, project: str, issue_type: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Fields of the create screen of one project and issue type. Uses the paged
+    endpoint of Jira 9+ and Cloud, and the older expanded createmeta when that
+    is missing or the issue type is given by name.
+    """
+    base = f"{JiraConfig.BASE_URL}/rest/api/2/issue/createmeta"
+    if issue_type.isdigit():
+        fields: Dict[str, Dict[str, Any]] = {}
+        start_at = 0
+        while True:
+            response = await get_with_retry(client, f"{base}/{project}/issuetypes/{issue_type}", params={"startAt": start_at, "maxResults": 100})
+            if response.status_code == 404 and start_at == 0:
+                break
+            response.raise_for_status()
+            body = response.json()
+            # Jira Data Center pages under "values", Cloud under "fields"
+            values = body.get("values") or body.get("fields") or []
+            for field in values:
+                field_id = field.get("fieldId") or field.get("key")
+                if field_id:
+                    fields[field_id] = _describe(field_id, field)
+            start_at += len(values)
+            if not values:
+                break
+            if "isLast" in body:
+                if body["isLast"]:
+                    break
+            elif start_at >= body.get("total", 0):
+                break
+        if fields:
+            return fields
+
+    params = {
+        "expand": "projects.issuetypes.fields",
+        "projectIds" if project.isdigit() else "projectKeys": project,
+        "issuetypeIds" if issue_type.isdigit() else "issuetypeNames": issue_type,
+    }
+    response = await get_with_retry(client, base, params=params)
+    response.raise_for_status()
+    for found_project in response.json().get("projects", []):
+        for found_type in found_project.get("issuetypes", []):
+            return {field_id: _describe(field_id, field) for field_id, field in (found_type.get("fields") or {}).items()}
+    return None
+
+@single_flight("create_meta")
+async def get_create_meta(project: str, issue_type: str, refresh: bool = False) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Create screen fields of a project (id or key) and issue type (id or name),
+    keyed by field id, or None when Jira does not provide them.
+
+    Args:
+        refresh: Fetch again; on failure the cached copy is kept
+    """
+    project = str(project).strip().upper()
+    issue_type = str(issue_type).strip()
+    key = ("create", project, issue_type.lower())
+    if not refresh:
+        cached = meta_cache.get(key)
+        if cached is not None:
+            return cached["fields"]
+
+    JiraConfig.validate_config()
+    try:
+        fields = await _fetch_create_meta(JiraClient.get(), project, issue_type)
+    except Exception as e:
+        print(f"Could not load create metadata for project {project}, issue type {issue_type}: {e}")
+        if not refresh:
+            meta_cache.set(key, {"fields": None}, ttl=FAILED_LOOKUP_TTL)
+        return None
+    meta_cache.set(key, {"fields": fields}, ttl=None if fields else FAILED_LOOKUP_TTL)
+    return fields
+
+@single_flight("edit_meta")
+async def _load_edit_meta(issue_key: str) -> Tuple[Optional[Dict[str, Dict[str, Any]]], Optional[Tuple]]:
+    JiraConfig.validate_config()
+    url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{issue_key}"
+    try:
+        response = await get_with_retry(JiraClient.get(), url, params={"fields": "project,issuetype,status", "expand": "editmeta"})
+        response.raise_for_status()
+        issue = response.json()
+    except Exception as e:
+        print(f"Could not load edit metadata for {issue_key}: {e}")
+        return None, None
+
+    issue_fields = issue.get("fields") or {}
+    workflow = (
+        (issue_fields.get("project") or {}).get("id"),
+        (issue_fields.get("issuetype") or {}).get("id"),
+        (issue_fields.get("status") or {}).get("id"),
+    )
+    fields = {
+        field_id: _describe(field_id, field)
+        for field_id, field in ((issue.get("editmeta") or {}).get("fields") or {}).items()
+    } or None
+    meta_cache.set(("edit",) + workflow, {"fields": fields, "issue": issue_key}, ttl=None if fields else FAILED_LOOKUP_TTL)
+    return fields, workflow
+
+async def get_edit_meta(issue_key: str, workflow: Optional[Tuple] = None) -> Tuple[Optional[Dict[str, Dict[str, Any]]], Optional[Tuple]]:
+    """
+    Edit screen fields of an issue, shared by every issue with the same
+    project, issue type and status.
+
+    Args:
+        workflow: The issue's (project id, issue type id, status id) when
+            known; then no request is needed once that screen is cached
+
+    Returns:
+        (fields keyed by id or None when Jira does not provide them, the issue's workflow key)
+    """
+    if workflow is not None:
+        cached = meta_cache.get(("edit",) + tuple(workflow))
+        if cached is not None:
+            return cached["fields"], workflow
+    return await _load_edit_meta(str(issue_key).strip().upper())
+
+def known_editable(workflow: Tuple, field_ids: Iterable[str]) -> bool:
+    """
+    True when the cached edit screen of a (project id, issue type id, status id)
+    position lists every one of field_ids. Unknown screens count as not editable.
+    """
+    fields = (meta_cache.get(("edit",) + tuple(workflow)) or {}).get("fields")
+    return fields is not None and all(field_id in fields for field_id in field_ids)
+
+def _label(description: Dict[str, Any]) -> str:
+    if description["id"].startswith("customfield_"):
+        return f"{description['name']} ({description['id']})"
+    return description["name"]
+
+def _choice(allowed: Dict[str, Any]) -> str:
+    return str(allowed.get("value") or allowed.get("name") or allowed.get("key") or allowed.get("id"))
+
+def _match(value: Any, allowed: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    The allowed value meant by value: an {"id": ...}, {"value"|"name"|"key": ...}
+    or a plain string matched case-insensitively, falling back to ids.
+    """
+    if isinstance(value, dict):
+        if "id" in value:
+            return next((a for a in allowed if str(a.get("id")) == str(value["id"])), None)
+        value = value.get("value", value.get("name", value.get("key")))
+    if value is None:
+        return None
+    wanted = str(value).strip().lower()
+    for attribute in ("value", "name", "key", "id"):
+        match = next((a for a in allowed if str(a.get(attribute, "")).strip().lower() == wanted), None)
+        if match is not None:
+            return match
+    return None
+
+def _resolve_value(description: Dict[str, Any], value: Any) -> Tuple[Any, Optional[str]]:
+    """
+    Rewrite a value of a field with allowed values (options, priorities, ...)
+    as references by id, or explain why it is not allowed.
+    """
+    allowed = description["allowedValues"]
+    if not allowed:
+        return value, None
+    items = value if isinstance(value, list) else [value]
+    resolved = []
+    for item in items:
+        match = _match(item, allowed)
+        if match is None:
+            shown = item.get("value", item.get("name", item.get("id"))) if isinstance(item, dict) else item
+            choices = ", ".join(_choice(a) for a in allowed[:25]) + (", ..." if len(allowed) > 25 else "")
+            return value, f"{_label(description)}: '{shown}' is not an allowed value (allowed: {choices})"
+        if match.get("disabled"):
+            return value, f"{_label(description)}: '{_choice(match)}' is disabled"
+        resolved.append({"id": str(match["id"])} if "id" in match else item)
+    if isinstance(value, list) or description["schema"].get("type") == "array":
+        return resolved, None
+    return resolved[0], None
+
+async def _resolve_ids(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rename TOOL_FIELDS ids this Jira does not have to its field of the same display name.
+    """
+    if not any(field_id in TOOL_FIELDS for field_id in fields):
+        return fields
+    try:
+        known = {field["id"] for field in await get_fields()}
+        renamed = {}
+        for field_id, value in fields.items():
+            if field_id in TOOL_FIELDS and field_id not in known:
+                match = await find_field(TOOL_FIELDS[field_id])
+                field_id = match["id"] if match else field_id
+            renamed[field_id] = value
+        return renamed
+    except Exception as e:
+        print(f"Could not resolve custom field ids: {e}")
+        return fields
+
+async def _check(fields: Dict[str, Any], meta: Dict[str, Dict[str, Any]], screen: str, required: bool) -> Tuple[Dict[str, Any], List[str]]:
+    try:
+        names = await get_field_names()
+    except Exception:
+        names = {}
+    checked: Dict[str, Any] = {}
+    errors: List[str] = []
+    for field_id, value in fields.items():
+        description = meta.get(field_id)
+        if description is None:
+            name = names.get(field_id)
+            label = f"{name} ({field_id})" if name and name != field_id else field_id
+            errors.append(f"{label} is not on the {screen} screen")
+            checked[field_id] = value
+            continue
+        checked[field_id], error = _resolve_value(description, value)
+        if error:
+            errors.append(error)
+    if required:
+        for field_id, description in meta.items():
+            if description["required"] and not description["hasDefaultValue"] and field_id not in fields and field_id not in _SERVER_FILLED:
+                errors.append(f"{_label(description)} is required")
+    return checked, errors
+
+async def prepare_create_fields(fields: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Check a new issue's fields against its create screen before posting them:
+    unknown custom field ids are resolved by name, option values and
+    priorities are resolved to ids, and unknown, disallowed or missing
+    required fields are reported. Without metadata the fields pass unchanged.
+
+    Returns:
+        (fields to send, errors; the issue should not be posted when there are any)
+    """
+    if not JiraConfig.FIELD_VALIDATION:
+        return fields, []
+    fields = await _resolve_ids(fields)
+    project = fields.get("project") or {}
+    issue_type = fields.get("issuetype") or {}
+    project = project.get("id") or project.get("key")
+    issue_type = issue_type.get("id") or issue_type.get("name")
+    if not project or not issue_type:
+        return fields, []
+    meta = await get_create_meta(project, issue_type)
+    if meta is None:
+        return fields, []
+    return await _check(fields, meta, "create", required=True)
+
+async def prepare_update_fields(issue_key: str, fields: Dict[str, Any], workflow: Optional[Tuple] = None) -> Tuple[Dict[str, Any], List[str], Optional[Tuple]]:
+    """
+    The edit screen counterpart of prepare_create_fields. Updates of only
+    summary and description are passed through without a lookup.
+
+    Returns:
+        (fields to send, errors, the issue's workflow key when it was looked up)
+    """
+    if not JiraConfig.FIELD_VALIDATION or set(fields) <= _ALWAYS_EDITABLE:
+        return fields, [], workflow
+    fields = await _resolve_ids(fields)
+    meta, workflow = await get_edit_meta(issue_key, workflow)
+    if meta is None:
+        return fields, [], workflow
+    checked, errors = await _check(fields, meta, "edit", required=False)
+    return checked, errors, workflow
+
+def _summary(description: Dict[str, Any]) -> Dict[str, Any]:
+    schema = description["schema"]
+    field_type = schema.get("type")
+    if field_type == "array" and schema.get("items"):
+        field_type = f"array<{schema['items']}>"
+    summary = {
+        "id": description["id"],
+        "name": description["name"],
+        "type": field_type,
+        "required": description["required"] and not description["hasDefaultValue"],
+    }
+    if description["allowedValues"]:
+        summary["allowedValues"] = [_choice(a) for a in description["allowedValues"] if not a.get("disabled")]
+    return summary
+
+async def describe_fields(
+    project: Optional[str] = None,
+    issue_type: Optional[str] = None,
+    issue_key: Optional[str] = None,
+    field: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Fields of a create screen (project and issue type) or of an issue's edit
+    screen, with their ids, types, whether they are required and their
+    allowed values, optionally narrowed to one field by id or name.
+    """
+    try:
+        if issue_key:
+            meta, _ = await get_edit_meta(issue_key)
+            screen = f"edit screen of {issue_key.upper()}"
+        else:
+            meta = await get_create_meta(project, issue_type)
+            screen = f"create screen of project {project}, issue type {issue_type}"
+        if meta is None:
+            return {"success": False, "error": f"Jira returned no metadata for the {screen}"}
+
+        described = list(meta.values())
+        if field:
+            wanted = " ".join(field.replace("_", " ").lower().split())
+            described = [
+                d for d in described
+                if d["id"] == field or " ".join(d["name"].replace("_", " ").lower().split()) == wanted
+            ]
+            if not described:
+                return {"success": False, "error": f"No field '{field}' on the {screen}"}
+        return {"success": True, "screen": screen, "fields": [_summary(d) for d in described]}
+    except Exception as e:
+        return {"success": False, "error": f"An error occurred: {str(e)}"}
+
+class FieldMetaSync:
+    """
+    Warms the field list and the create screens in JIRA_FIELD_META_WARM
+    ("project:issue type" pairs) on startup, then refreshes them and every
+    cached screen every JIRA_FIELD_META_REFRESH_INTERVAL seconds, before they
+    expire, so writes rarely wait on a metadata request.
+    """
+    _task: Optional[asyncio.Task] = None
+    stats: Dict[str, int] = {"refreshes": 0, "errors": 0}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return JiraConfig.FIELD_VALIDATION
+
+    @classmethod
+    async def refresh_all(cls) -> None:
+        try:
+            await get_fields(refresh=True)
+        except Exception as e:
+            cls.stats["errors"] += 1
+            print(f"Error refreshing the field list: {e}")
+
+        screens = set()
+        for pair in JiraConfig.FIELD_META_WARM:
+            project, _, issue_type = pair.partition(":")
+            screens.add(("create", project.strip().upper(), (issue_type.strip() or "1")))
+        edits = set()
+        for cache_key, entry in meta_cache.items():
+            if cache_key[0] == "create":
+                screens.add(cache_key)
+            elif entry.get("issue"):
+                edits.add(entry["issue"])
+
+        await asyncio.gather(
+            *(get_create_meta(project, issue_type, refresh=True) for _, project, issue_type in screens),
+            *(_load_edit_meta(issue_key) for issue_key in edits),
+        )
+        cls.stats["refreshes"] += 1
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await cls.refresh_all()
+            await asyncio.sleep(JiraConfig.FIELD_META_REFRESH_INTERVAL)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Start warming and refreshing. Called from the Starlette lifespan."""
+        if not cls.enabled() or cls._task is not None:
+            return
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
@@ -1,51 +1,203 @@
+import asyncio
+import contextlib
 import httpx
-from typing import Dict, Any
+from collections import deque
+from typing import Deque, Dict, Any, AsyncIterator, List, Optional, Union
 from ..config import JiraConfig
+from ..client import JiraClient
+from ..retry import get_with_retry
+from ..cache import TTLCache
+from ..singleflight import single_flight
+from ..events import on_issue_write
+from .fields import resolve_fields
 
-async def search_issues(jql: str, max_results: int = 50) -> Dict[str, Any]:
+# Successful project searches keyed on (project, canonical JQL, max_results, fields, expand, paginate)
+search_cache = TTLCache(
+    "search",
+    ttl=JiraConfig.SEARCH_CACHE_TTL,
+    maxsize=JiraConfig.SEARCH_CACHE_MAXSIZE,
+)
+
+# Writes seen per project, so a search that raced a write is not cached
+_project_writes: Dict[Optional[str], int] = {}
+
+@on_issue_write
+def invalidate_project_searches(issue_key: str) -> None:
+    """
+    Drop cached searches of the written issue's project, or of every project
+    when only a numeric issue ID is known.
+    """
+    project = issue_key.rsplit("-", 1)[0].upper() if "-" in issue_key else None
+    _project_writes[project] = _project_writes.get(project, 0) + 1
+    search_cache.invalidate_where(lambda cache_key: project is None or cache_key[0] == project)
+
+def _search_params(jql: str, max_results: int, fields: Optional[str], expand: Optional[str], validate_query: Optional[str] = None) -> Dict[str, Any]:
+    params = {
+        "jql": jql,
+        "maxResults": max_results
+    }
+    if fields:
+        params["fields"] = fields
+    if expand:
+        params["expand"] = expand
+    if validate_query:
+        params["validateQuery"] = validate_query
+    return params
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    jql: str,
+    start_at: int,
+    max_results: int,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    validate_query: Optional[str] = None,
+) -> Dict[str, Any]:
+    url = f"{JiraConfig.BASE_URL}/rest/api/2/search"
+    params = _search_params(jql, max_results, fields, expand, validate_query)
+    params["startAt"] = start_at
+    response = await get_with_retry(client, url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+async def _iter_pages(
+    jql: str,
+    limit: Optional[int] = None,
+    page_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    expand: Optional[str] = None,
+    validate_query: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield raw search pages in order. The first page is fetched alone to learn
+    `total`; after that up to `concurrency` pages are requested ahead of the
+    consumer, so a large result set costs few round trips without fetching
+    pages nobody reads. Closing the generator cancels the pages in flight.
+    """
+    JiraConfig.validate_config()
+    page_size = page_size or JiraConfig.SEARCH_PAGE_SIZE
+    concurrency = concurrency or JiraConfig.SEARCH_CONCURRENCY
+    if limit is not None:
+        page_size = min(page_size, limit)
+    fields = resolve_fields(fields)
+
+    client = JiraClient.get()
+    first = await _fetch_page(client, jql, 0, page_size, fields, expand, validate_query)
+    yield first
+
+    # Jira may cap maxResults below what we asked for, so step by what it granted
+    step = max(first.get("maxResults") or len(first.get("issues", [])) or page_size, 1)
+    target = first.get("total", 0)
+    if limit is not None:
+        target = min(target, limit)
+
+    starts = iter(range(step, target, step))
+    pending: Deque[asyncio.Task] = deque()
+
+    def fill() -> None:
+        while len(pending) < concurrency:
+            start_at = next(starts, None)
+            if start_at is None:
+                return
+            pending.append(asyncio.create_task(_fetch_page(client, jql, start_at, min(step, target - start_at), fields, expand, validate_query)))
+
+    try:
+        fill()
+        while pending:
+            page = await pending.popleft()
+            fill()
+            yield page
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+async def iter_search_issues(
+    jql: str,
+    limit: Optional[int] = None,
+    page_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    expand: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Iterate over every issue matching a JQL query, following pagination.
+
+    Args:
+        jql: The JQL query string
+        limit: Stop after this many issues (default: all matches)
+        page_size: Issues requested per page (default JIRA_SEARCH_PAGE_SIZE)
+        concurrency: Maximum pages in flight at once (default JIRA_SEARCH_CONCURRENCY)
+        fields: Field preset ("summary", "triage", "full") or list of field ids to return
+        expand: Comma separated Jira expand options
+
+    Yields:
+        Issue dicts in the order returned by Jira
+    """
+    count = 0
+    # Closed on the way out, so stopping early also stops the pages requested ahead
+    async with contextlib.aclosing(_iter_pages(jql, limit, page_size, concurrency, fields, expand)) as pages:
+        async for page in pages:
+            for issue in page.get("issues", []):
+                if limit is not None and count >= limit:
+                    return
+                count += 1
+                yield issue
+
+@single_flight("search")
+async def search_issues(
+    jql: str,
+    max_results: int = 50,
+    paginate: bool = False,
+    fields: Optional[Union[str, List[str]]] = None,
+    expand: Optional[str] = None,
+    validate_query: Optional[str] = None,
+) -> Dict[str, Any]:
     """
     Search Jira issues using JQL.
-    
+
     Args:
         jql: The JQL query string
         max_results: Maximum number of results to return (default 50)
-        
+        paginate: Follow startAt pagination, fetching pages concurrently, until
+            max_results issues are collected (default False, a single request)
+        fields: Field preset ("summary", "triage", "full") or list of field ids
+            to return; None returns Jira's default field set
+        expand: Comma separated Jira expand options (e.g. "renderedFields")
+        validate_query: Jira's validateQuery; "warn" turns unknown values (e.g.
+            missing issue keys) into warningMessages instead of a 400
+
     Returns:
         Dict containing the matching issues
     """
     JiraConfig.validate_config()
     url = f"{JiraConfig.BASE_URL}/rest/api/2/search"
-    
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JiraConfig.API_TOKEN}"
-    }
-    
-    # If you have a cookie for session authentication, add it here
-    cookies = {}
-    if hasattr(JiraConfig, 'SESSION_COOKIE') and JiraConfig.SESSION_COOKIE:
-        cookies = {"JSESSIONID": JiraConfig.SESSION_COOKIE}
-
-    params = {
-        "jql": jql,
-        "maxResults": max_results
-    }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        if paginate:
+            json_response = None
+            issues = []
+            async with contextlib.aclosing(_iter_pages(jql, limit=max_results, fields=fields, expand=expand, validate_query=validate_query)) as pages:
+                async for page in pages:
+                    if json_response is None:
+                        json_response = page
+                    issues.extend(page.get("issues", []))
+            json_response = dict(json_response, startAt=0, maxResults=max_results, issues=issues[:max_results])
+        else:
+            params = _search_params(jql, max_results, resolve_fields(fields), expand, validate_query)
+            client = JiraClient.get()
+            response = await get_with_retry(
+                client,
                 url,
-                headers=headers,
-                cookies=cookies,
                 params=params
             )
             response.raise_for_status()
             json_response = response.json()
-            return {
-                "success": True,
-                "issues": json_response
-            }
+        return {
+            "success": True,
+            "issues": json_response
+        }
     except httpx.HTTPStatusError as e:
         return {
             "success": False,
@@ -55,4 +207,29 @@ async def search_issues(jql: str, max_results: int = 50) -> Dict[str, Any]:
         return {
             "success": False,
             "error": f"An error occurred: {str(e)}"
-        } 
\ No newline at end of file
+        }
+
+async def search_project_issues(
+    project: str,
+    jql: str,
+    max_results: int = 50,
+    paginate: bool = False,
+    fields: Optional[Union[str, List[str]]] = None,
+    expand: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    search_issues for a query confined to one project, served from a cache for
+    JIRA_SEARCH_CACHE_TTL seconds. Pass canonical JQL (see jql.JqlBuilder) so
+    equivalent filters share an entry; writes made through this server to an
+    issue of the project drop its entries.
+    """
+    project = project.strip().upper()
+    key = (project, jql, max_results, resolve_fields(fields), expand, paginate)
+    cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+    writes = (_project_writes.get(project, 0), _project_writes.get(None, 0))
+    result = await search_issues(jql, max_results, paginate=paginate, fields=fields, expand=expand)
+    if result.get("success") and writes == (_project_writes.get(project, 0), _project_writes.get(None, 0)):
+        search_cache.set(key, result)
+    return result
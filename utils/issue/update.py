@@ -1,13 +1,17 @@
-import json
+import asyncio
 import httpx
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, AsyncIterator, Optional, List, Tuple
 from ..config import JiraConfig
+from ..client import JiraClient
+from ..cache import TTLCache
+from ..retry import get_with_retry
+from ..events import issue_written
+from .search import search_issues
+from .meta import known_editable, prepare_update_fields
 
-async def update_jira_ticket(
-    issue_key: str,
+def build_update_fields(
     summary: str = None,
     description: str = None,
-    status_name: str = None,
     priority: str = None,
     assignee: str = None,
     fin_business_cost_center: List[str] = None,
@@ -16,118 +20,278 @@ async def update_jira_ticket(
     beat_types: str = None,
 ) -> Dict[str, Any]:
     """
-    Update a Jira ticket with the given parameters
-    Args:
-        issue_key: Key of the ticket to update (e.g., 'FCA-1234')
-        summary: Updated title of the ticket
-        description: Updated description of the ticket
-        status_name (str): The **name** of the status to transition the ticket to (e.g., "In Progress", "Closed")
-        priority: Updated priority of the ticket
-        assignee: Updated username of the assignee
-        fin_business_cost_center: Updated list of Fin_Business Cost Center values (customfield_19805)
-        flows: Updated Flows value (customfield_20408)
-        tag_types: Updated Tag Types value (customfield_20411)
-        beat_types: Updated Beat Types value (customfield_20409)
-    Returns:
-        Dict containing the response from Jira
+    Build the `fields` object with only the fields that need to be updated.
+    See update_jira_ticket for the meaning of each argument.
     """
-    JiraConfig.validate_config()
-    url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{issue_key}"
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JiraConfig.API_TOKEN}",
-    }
-
-    # Add cookie if configured
-    if hasattr(JiraConfig, 'COOKIE') and JiraConfig.COOKIE:
-        headers["Cookie"] = JiraConfig.COOKIE
-
-    # Create fields object with only the fields that need to be updated
     fields = {}
-    
+
     if summary is not None:
         fields["summary"] = summary
     if description is not None:
         fields["description"] = description
-    
+
     if priority is not None:
         fields["priority"] = {"name": priority}
-    
+
     if assignee is not None:
         fields["assignee"] = {"name": assignee}
-    
+
     if fin_business_cost_center is not None:
         fields["customfield_19805"] = [{"value": str(value)} for value in fin_business_cost_center]
-    
+
     if flows is not None:
         fields["customfield_20408"] = flows
-    
+
     if tag_types is not None:
         fields["customfield_20411"] = tag_types
-    
+
     if beat_types is not None:
         fields["customfield_20409"] = beat_types
 
-    payload = {"fields": fields}
-
-    # If status needs to be updated, we need to make a transition request
-    if status_name is not None:
-        async with httpx.AsyncClient() as client:
-            transitions_response = await client.get(
-                f"{url}/transitions?expand=transitions.fields",
-                headers=headers
-            )
-            transitions_response.raise_for_status()
-            transitions = transitions_response.json()["transitions"]
-
-            print(f"Available transitions: {json.dumps(transitions, indent=2)}")
-
-            transition_id = None
-            transition_fields_required = {}
-
-            for transition in transitions:
-                if transition["to"]["name"].lower() == status_name.lower():
-                    transition_id = transition["id"]
-                    transition_fields_required = transition.get("fields", {})
-                    break
-
-            if transition_id:
-                transition_payload = {
-                    "transition": {
-                        "id": transition_id
-                    }
-                }
+    return fields
 
-                # Optional: Add resolution if required
-                if "resolution" in transition_fields_required:
-                    transition_payload["fields"] = {
-                        "resolution": {"name": "Done"}  # Or another value depending on workflow
-                    }
+# Transition lookups keyed on ((project, issue type, current status), target status name).
+# Entries are {"payload": transition request or None, "to": target status id}
+transition_cache = TTLCache(
+    "transition",
+    ttl=JiraConfig.TRANSITION_CACHE_TTL,
+    maxsize=JiraConfig.TRANSITION_CACHE_MAXSIZE,
+)
 
-                print("Sending transition payload:", json.dumps(transition_payload, indent=2))
+# Last known (project, issue type, status) of each issue we have looked at or transitioned
+issue_workflow_cache = TTLCache(
+    "issue_workflow",
+    ttl=JiraConfig.TRANSITION_CACHE_TTL,
+    maxsize=JiraConfig.ISSUE_CACHE_MAXSIZE,
+)
 
-                transition_resp = await client.post(
-                    f"{url}/transitions",
-                    json=transition_payload,
-                    headers=headers
-                )
-                transition_resp.raise_for_status()
+def _workflow_key(issue: Dict[str, Any]) -> Tuple:
+    """
+    Issues in the same project, of the same type and in the same status share
+    the transitions available to them.
+    """
+    fields = issue.get("fields") or {}
+    return (
+        (fields.get("project") or {}).get("id"),
+        (fields.get("issuetype") or {}).get("id"),
+        (fields.get("status") or {}).get("id"),
+    )
 
-    # Update other fields
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                url,
-                json=payload,
-                headers=headers
-            )
+def _match_transition(transitions: List[Dict[str, Any]], status_name: str) -> Dict[str, Any]:
+    """
+    Build the transition request moving an issue to status_name. The payload
+    is None when the workflow offers no such transition from the current status.
+    """
+    transition_id = None
+    transition_fields_required = {}
+    to_status = None
+
+    for transition in transitions:
+        if transition["to"]["name"].lower() == status_name.lower():
+            transition_id = transition["id"]
+            transition_fields_required = transition.get("fields", {})
+            to_status = transition["to"].get("id")
+            break
+
+    if not transition_id:
+        return {"payload": None, "to": None}
+
+    transition_payload = {
+        "transition": {
+            "id": transition_id
+        }
+    }
+
+    # Optional: Add resolution if required
+    if "resolution" in transition_fields_required:
+        transition_payload["fields"] = {
+            "resolution": {"name": "Done"}  # Or another value depending on workflow
+        }
+    return {"payload": transition_payload, "to": to_status}
+
+async def _resolve_transition(
+    client: httpx.AsyncClient,
+    issue_key: str,
+    url: str,
+    status_name: str,
+    refresh: bool = False,
+) -> Tuple[Dict[str, Any], Tuple, bool]:
+    """
+    Find the transition moving issue_key to status_name.
+
+    Served from the cache when the issue's workflow position is known;
+    otherwise a single GET returns both the position and its transitions.
+
+    Returns:
+        (resolved transition, workflow key, whether it came from the cache)
+    """
+    key = issue_key.upper()
+    if not refresh:
+        workflow = issue_workflow_cache.get(key)
+        if workflow is not None:
+            resolved = transition_cache.get((workflow, status_name.lower()))
+            if resolved is not None:
+                return resolved, workflow, True
+
+    response = await get_with_retry(client, url, params={"fields": "project,issuetype,status", "expand": "transitions.fields"})
+    response.raise_for_status()
+    issue = response.json()
+    transitions = issue.get("transitions", [])
+
+    workflow = _workflow_key(issue)
+    resolved = _match_transition(transitions, status_name)
+    issue_workflow_cache.set(key, workflow)
+    transition_cache.set((workflow, status_name.lower()), resolved)
+    return resolved, workflow, False
+
+async def _post_transition(
+    client: httpx.AsyncClient,
+    issue_key: str,
+    url: str,
+    status_name: str,
+    resolved: Dict[str, Any],
+    workflow: Tuple,
+    cached: bool,
+) -> Optional[Dict[str, Any]]:
+    """
+    Apply a resolved transition. A cached transition that Jira rejects is
+    treated as stale: it is resolved again and retried once.
+
+    Returns:
+        The transition that was applied, or None when none leads to status_name
+    """
+    transition_resp = await client.post(f"{url}/transitions", json=resolved["payload"])
+    if transition_resp.status_code in (400, 409) and cached:
+        resolved, workflow, cached = await _resolve_transition(client, issue_key, url, status_name, refresh=True)
+        if resolved["payload"] is None:
+            return None
+        transition_resp = await client.post(f"{url}/transitions", json=resolved["payload"])
+    transition_resp.raise_for_status()
+
+    issue_workflow_cache.set(issue_key.upper(), workflow[:2] + (resolved["to"],))
+    issue_written(issue_key)
+    return resolved
+
+async def _apply_update(
+    client: httpx.AsyncClient,
+    issue_key: str,
+    url: str,
+    status_name: Optional[str],
+    fields: Dict[str, Any],
+    always_put: bool = False,
+    require_transition: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run the status transition and the field PUT for one issue. The transition
+    goes first, as the target status usually keeps the fields editable. The
+    fields are PUT first only when the current status's cached edit screen
+    lists them all and the target status's does not. Both are sent
+    concurrently when the target status's cached edit screen lists every field.
+
+    Args:
+        always_put: Send the PUT even when there are no fields to update
+        require_transition: Skip the field update when no transition leads to status_name
+
+    Returns:
+        The applied transition (None when there was nothing to transition to)
+    """
+    async def put_fields() -> None:
+        if fields or always_put:
+            response = await client.put(url, json={"fields": fields})
             response.raise_for_status()
-            
+            issue_written(issue_key)
+
+    if status_name is None:
+        await put_fields()
+        return None
+
+    resolved, workflow, cached = await _resolve_transition(client, issue_key, url, status_name)
+    if resolved["payload"] is None and cached:
+        resolved, workflow, cached = await _resolve_transition(client, issue_key, url, status_name, refresh=True)
+    if resolved["payload"] is None:
+        if not require_transition:
+            await put_fields()
+        return None
+
+    def transition():
+        return _post_transition(client, issue_key, url, status_name, resolved, workflow, cached)
+
+    target = workflow[:2] + (resolved["to"],)
+    transition_fields = (resolved["payload"] or {}).get("fields", {})
+    if not set(transition_fields) & set(fields):
+        if not fields or known_editable(target, fields):
+            applied, _ = await asyncio.gather(transition(), put_fields())
+            return applied
+        if known_editable(workflow, fields):
+            # The target status may not be editable (e.g. Done with jira.issue.editable=false)
+            await put_fields()
+            return await transition()
+
+    applied = await transition()
+    await put_fields()
+    return applied
+
+async def update_jira_ticket(
+    issue_key: str,
+    summary: str = None,
+    description: str = None,
+    status_name: str = None,
+    priority: str = None,
+    assignee: str = None,
+    fin_business_cost_center: List[str] = None,
+    flows: str = None,
+    tag_types: str = None,
+    beat_types: str = None,
+) -> Dict[str, Any]:
+    """
+    Update a Jira ticket with the given parameters
+    Args:
+        issue_key: Key of the ticket to update (e.g., 'FCA-1234')
+        summary: Updated title of the ticket
+        description: Updated description of the ticket
+        status_name (str): The **name** of the status to transition the ticket to (e.g., "In Progress", "Closed")
+        priority: Updated priority of the ticket
+        assignee: Updated username of the assignee
+        fin_business_cost_center: Updated list of Fin_Business Cost Center values (customfield_19805)
+        flows: Updated Flows value (customfield_20408)
+        tag_types: Updated Tag Types value (customfield_20411)
+        beat_types: Updated Beat Types value (customfield_20409)
+    Returns:
+        Dict containing the response from Jira
+    """
+    JiraConfig.validate_config()
+    url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{issue_key}"
+    client = JiraClient.get()
+
+    fields = build_update_fields(
+        summary=summary,
+        description=description,
+        priority=priority,
+        assignee=assignee,
+        fin_business_cost_center=fin_business_cost_center,
+        flows=flows,
+        tag_types=tag_types,
+        beat_types=beat_types,
+    )
+
+    try:
+        # Checked against the issue's edit screen first, so a bad value costs no write
+        fields, errors, workflow = await prepare_update_fields(issue_key, fields, issue_workflow_cache.get(issue_key.upper()))
+        if workflow is not None:
+            issue_workflow_cache.set(issue_key.upper(), workflow)
+        if errors:
             return {
-                "isIssueUpdated": True,
-                "response": "Successfully updated"
+                "isIssueUpdated": False,
+                "error": "Invalid fields: " + "; ".join(errors)
             }
+
+        # Status changes go through a (cached) transition; other fields through a PUT
+        await _apply_update(client, issue_key, url, status_name, fields, always_put=True)
+
+        return {
+            "isIssueUpdated": True,
+            "response": "Successfully updated"
+        }
     except httpx.HTTPStatusError as e:
         return {
             "isIssueUpdated": False,
@@ -137,4 +301,117 @@ async def update_jira_ticket(
         return {
             "isIssueUpdated": False,
             "error": f"An error occurred: {str(e)}"
-        } 
\ No newline at end of file
+        }
+
+async def iter_bulk_update(
+    issue_keys: List[str],
+    status_name: str = None,
+    concurrency: Optional[int] = None,
+    **changes: Any,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Apply the same change set to many Jira tickets, yielding each ticket's
+    result as soon as it completes.
+
+    Issues are grouped by (project, issue type, current status) so the
+    transition to status_name is looked up once per group (or served from the
+    transition cache) rather than once per issue.
+
+    Args:
+        issue_keys: Keys of the tickets to update
+        status_name: Name of the status to transition every ticket to
+        concurrency: Maximum tickets updated at once (default JIRA_UPDATE_CONCURRENCY)
+        **changes: Field changes accepted by build_update_fields (summary, priority, assignee, ...)
+
+    Yields:
+        Dict per ticket with issue_key, isIssueUpdated and response or error
+    """
+    JiraConfig.validate_config()
+    keys = list(dict.fromkeys(str(key).strip().upper() for key in issue_keys if key and str(key).strip()))
+    fields = build_update_fields(**changes)
+    semaphore = asyncio.Semaphore(concurrency or JiraConfig.UPDATE_CONCURRENCY)
+    client = JiraClient.get()
+
+    # Keys the grouping search reported as unknown; they are not updated
+    missing: set = set()
+
+    if status_name is not None and keys:
+        # One search tells us where every issue sits in its workflow. Unknown keys come
+        # back as warnings instead of failing the whole search
+        joined = ", ".join(f'"{key}"' for key in keys)
+        representatives: Dict[Tuple, str] = {}
+        result = await search_issues(f"key in ({joined})", len(keys), paginate=True, fields="project,issuetype,status", validate_query="warn")
+        if result["success"]:
+            warnings = result["issues"].get("warningMessages") or []
+            missing = {key for key in keys if any(f"'{key}'" in warning.upper() for warning in warnings)}
+            for issue in result["issues"].get("issues", []):
+                workflow = _workflow_key(issue)
+                issue_workflow_cache.set(issue["key"].upper(), workflow)
+                representatives.setdefault(workflow, issue["key"])
+        else:
+            print(f"Could not group issues by workflow, resolving transitions per issue: {result['error']}")
+
+        # Resolve each group's transition once; its members then hit the cache
+        async def resolve(key: str) -> None:
+            url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{key}"
+            try:
+                async with semaphore:
+                    await _resolve_transition(client, key, url, status_name)
+            except Exception as e:
+                print(f"Could not resolve transitions for {key}: {e}")
+
+        await asyncio.gather(*(resolve(key) for key in representatives.values()))
+
+    async def update_one(key: str) -> Dict[str, Any]:
+        url = f"{JiraConfig.BASE_URL}/rest/api/2/issue/{key}"
+        if key in missing:
+            return {
+                "issue_key": key,
+                "isIssueUpdated": False,
+                "error": "Issue does not exist or you do not have permission to see it"
+            }
+        try:
+            async with semaphore:
+                # Issues sharing a workflow key share an edit screen, so this is mostly cached
+                checked, errors, workflow = await prepare_update_fields(key, fields, issue_workflow_cache.get(key))
+                if workflow is not None:
+                    issue_workflow_cache.set(key, workflow)
+                if errors:
+                    return {
+                        "issue_key": key,
+                        "isIssueUpdated": False,
+                        "error": "Invalid fields: " + "; ".join(errors)
+                    }
+                applied = await _apply_update(client, key, url, status_name, checked, require_transition=True)
+            if status_name is not None and applied is None:
+                return {
+                    "issue_key": key,
+                    "isIssueUpdated": False,
+                    "error": f"No transition to status '{status_name}' is available"
+                }
+
+            return {
+                "issue_key": key,
+                "isIssueUpdated": True,
+                "response": "Successfully updated"
+            }
+        except httpx.HTTPStatusError as e:
+            return {
+                "issue_key": key,
+                "isIssueUpdated": False,
+                "error": f"HTTP error occurred: {str(e)}\nResponse: {e.response.text if hasattr(e, 'response') else 'No response text'}"
+            }
+        except Exception as e:
+            return {
+                "issue_key": key,
+                "isIssueUpdated": False,
+                "error": f"An error occurred: {str(e)}"
+            }
+
+    tasks = [asyncio.create_task(update_one(key)) for key in keys]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,240 @@
+import functools
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
+
+# Every metric registers itself here; /metrics renders them all in the Prometheus text format
+REGISTRY: List["_Metric"] = []
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._values.items()):
+            lines.extend(self._samples(key, value))
+        return lines
+
+    def _samples(self, key: Tuple[str, ...], value: Any) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # Per-bucket (non-cumulative) counts, then sum and count
+            state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[0][i] += 1
+                break
+        state[1] += value
+        state[2] += 1
+
+    def _samples(self, key: Tuple[str, ...], value: Any) -> List[str]:
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            le = 'le="%s"' % _number(bound)
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+        le = 'le="+Inf"'
+        lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+def render() -> str:
+    """
+    Every registered metric in the Prometheus text exposition format.
+    """
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+tool_duration = Histogram("jira_tool_duration_seconds", "MCP tool call latency.", ("tool", "outcome"))
+tools_in_flight = Gauge("jira_tool_in_flight", "MCP tool calls currently running.", ("tool",))
+tool_result_bytes = Histogram("jira_tool_result_bytes", "Serialized size of tool results.", ("tool",), buckets=SIZE_BUCKETS)
+request_duration = Histogram(
+    "jira_request_duration_seconds",
+    "Outbound Jira request latency including the response body.",
+    ("method", "endpoint", "status"),
+)
+requests_in_flight = Gauge("jira_requests_in_flight", "Outbound Jira requests currently open.")
+request_bytes = Histogram("jira_request_bytes", "Outbound Jira request body size.", ("method", "endpoint"), buckets=SIZE_BUCKETS)
+response_bytes = Histogram("jira_response_bytes", "Jira response body size.", ("method", "endpoint"), buckets=SIZE_BUCKETS)
+sse_sessions = Gauge("jira_sse_sessions", "Open MCP SSE sessions.")
+requests_in_flight.set(0)
+sse_sessions.set(0)
+
+# Issue keys and numeric IDs (but not the API version) are collapsed so endpoints stay a small label set
+_ISSUE_KEY = re.compile(r"/[A-Za-z][A-Za-z0-9_]*-\d+(?=/|$)")
+_NUMERIC_ID = re.compile(r"(?<!/api)/\d+(?=/|$)")
+
+def endpoint(path: str) -> str:
+    return _NUMERIC_ID.sub("/{id}", _ISSUE_KEY.sub("/{key}", path))
+
+def encode_result(result: Any) -> Any:
+    """
+    A tool result as the text FastMCP sends it: strings as they are, lists
+    item by item, anything else as JSON. Encoding here lets the size be read
+    off the text FastMCP then passes through, so the result is encoded once.
+    """
+    if result is None or isinstance(result, str):
+        return result
+    if isinstance(result, (list, tuple)):
+        return [encode_result(item) for item in result]
+    # Already loaded by mcp once a tool runs; imported here to keep this module light at startup
+    import pydantic_core
+    return pydantic_core.to_json(result, fallback=str).decode()
+
+def result_size(result: Any) -> int:
+    """Bytes of text of a result returned by encode_result."""
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return sum(result_size(item) for item in result)
+    return len(result.encode())
+
+def timed_tool(name: str) -> Callable:
+    """
+    Decorator recording latency, in-flight count and result size of a tool.
+    The result is returned already encoded (see encode_result).
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            outcome = "error"
+            tools_in_flight.inc(tool=name)
+            try:
+                result = await fn(*args, **kwargs)
+                if isinstance(result, dict) and result.get("success") is False:
+                    outcome = "failure"
+                else:
+                    outcome = "success"
+                result = encode_result(result)
+                tool_result_bytes.observe(result_size(result), tool=name)
+                return result
+            finally:
+                tools_in_flight.dec(tool=name)
+                tool_duration.observe(time.perf_counter() - started, tool=name, outcome=outcome)
+
+        return wrapper
+
+    return decorator
+
+class ObservedStream(httpx.AsyncByteStream):
+    """
+    Response stream that records the request once its body is read and closed.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[int], None]):
+        self._stream = stream
+        self._on_close: Optional[Callable[[int], None]] = on_close
+        self._size = 0
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._size += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close(self._size)
+                self._on_close = None
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper recording latency, status, body sizes and in-flight
+    count of every outbound Jira request.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        method = request.method
+        path = endpoint(request.url.path)
+        request_bytes.observe(len(request.content), method=method, endpoint=path)
+        started = time.perf_counter()
+        requests_in_flight.inc()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            requests_in_flight.dec()
+            request_duration.observe(time.perf_counter() - started, method=method, endpoint=path, status="error")
+            raise
+
+        def on_close(size: int) -> None:
+            requests_in_flight.dec()
+            request_duration.observe(time.perf_counter() - started, method=method, endpoint=path, status=response.status_code)
+            response_bytes.observe(size, method=method, endpoint=path)
+
+        if response.is_closed:
+            # Body already loaded in memory (e.g. a mock transport), nothing left to stream
+            on_close(len(response.content))
+        else:
+            response.stream = ObservedStream(response.stream, on_close)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,361 @@
+import asyncio
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .config import JiraConfig
+from .events import on_issue_write
+from .issue.fields import resolve_fields
+from .issue.jql import is_literal
+from .issue.search import iter_search_issues
+
+# Sprint values on Jira Server are serialized objects:
+# "com.atlassian.greenhopper.service.sprint.Sprint@1a2b[id=12,rapidViewId=3,state=ACTIVE,name=Sprint 5,...]"
+_SPRINT_ATTR = re.compile(r"\b(id|name)=([^,\]]*)")
+
+def _values(value: Any) -> List[str]:
+    """
+    Flatten a Jira field value (string, option, user, version, sprint, or a
+    list of those) into the lower-cased strings a JQL `=` clause can match.
+    """
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [v for item in value for v in _values(item)]
+    if isinstance(value, dict):
+        found = []
+        for attr in ("name", "value", "key", "id", "accountId", "emailAddress"):
+            if value.get(attr) is not None:
+                found.append(str(value[attr]).lower())
+        return found
+    text = str(value)
+    if "greenhopper" in text and "[" in text:
+        return [v.lower() for _, v in _SPRINT_ATTR.findall(text)]
+    return [text.lower().replace("/", "-")]
+
+def _field(name: str) -> Callable[[Dict[str, Any]], List[str]]:
+    return lambda fields: _values(fields.get(name))
+
+# search_issues_tool filter name -> (column, extractor over the issue's fields)
+FILTER_COLUMNS: Dict[str, tuple] = {
+    "assignee": ("assignee", _field("assignee")),
+    "reporter": ("reporter", _field("reporter")),
+    "fixVersion": ("fix_versions", _field("fixVersions")),
+    "be_delivery_date": ("be_delivery_date", _field("customfield_20109")),
+    "fe_delivery_date": ("fe_delivery_date", _field("customfield_20108")),
+    "dev_delivery_date": ("dev_delivery_date", _field("customfield_19204")),
+    "qa_delivery_date": ("qa_delivery_date", _field("customfield_19205")),
+    "qa_required": ("qa_required", _field("customfield_13303")),
+    "dependent_systems": ("dependent_systems", _field("customfield_15506")),
+    "epic_link": ("epic_link", _field("customfield_10008")),
+    "sprint": ("sprint", _field("customfield_10007")),
+    "priority": ("priority", _field("priority")),
+    "issue_type": ("issuetype", _field("issuetype")),
+    "status": ("status", _field("status")),
+}
+
+def _parse_updated(value: Optional[str]) -> float:
+    if not value:
+        return 0.0
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z").timestamp()
+    except ValueError:
+        return 0.0
+
+class IssueMirror:
+    """
+    Local SQLite copy of the issues in the mirrored projects, with one
+    indexed column per search_issues_tool filter.
+
+    Each multi-valued column is stored as "|a|b|" so a filter matches with a
+    single instr() lookup.
+
+    Writes share one connection behind a lock. Reads use a connection per
+    thread, which WAL mode lets run while a sync batch is being written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._dirty: Dict[str, float] = {}
+        self._init_schema()
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    def _init_schema(self) -> None:
+        columns = ", ".join(f"{column} TEXT" for column, _ in FILTER_COLUMNS.values())
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS issues ("
+                f"key TEXT PRIMARY KEY, id TEXT, project TEXT, updated REAL, {columns}, raw TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_issues_project_updated ON issues (project, updated)")
+            for column, _ in FILTER_COLUMNS.values():
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_issues_{column} ON issues (project, {column})")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (project TEXT PRIMARY KEY, last_sync REAL, last_full_sync REAL)"
+            )
+
+    def upsert(self, issues: Iterable[Dict[str, Any]]) -> int:
+        rows = []
+        for issue in issues:
+            fields = issue.get("fields") or {}
+            project = ((fields.get("project") or {}).get("key") or issue["key"].rsplit("-", 1)[0]).upper()
+            filter_values = ["|" + "|".join(extract(fields)) + "|" for _, extract in FILTER_COLUMNS.values()]
+            rows.append([issue["key"], issue.get("id"), project, _parse_updated(fields.get("updated")), *filter_values, json.dumps(issue)])
+        if not rows:
+            return 0
+        placeholders = ", ".join("?" for _ in rows[0])
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO issues VALUES ({placeholders})", rows)
+        return len(rows)
+
+    def delete_missing(self, project: str, seen_keys: Iterable[str]) -> int:
+        """
+        Drop issues of project that a full sync did not return (deleted or moved).
+        """
+        seen = set(seen_keys)
+        with self._lock, self._conn:
+            stored = [row[0] for row in self._conn.execute("SELECT key FROM issues WHERE project = ?", (project,))]
+            doomed = [(key,) for key in stored if key not in seen]
+            self._conn.executemany("DELETE FROM issues WHERE key = ?", doomed)
+        return len(doomed)
+
+    def sync_state(self, project: str) -> Dict[str, float]:
+        row = self._reader().execute(
+            "SELECT last_sync, last_full_sync FROM sync_state WHERE project = ?", (project,)
+        ).fetchone()
+        return {"last_sync": row[0] if row else 0.0, "last_full_sync": row[1] if row else 0.0}
+
+    def set_synced(self, project: str, synced_at: float, full: bool) -> None:
+        state = self.sync_state(project)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (project, synced_at, synced_at if full else state["last_full_sync"]),
+            )
+
+    def mark_dirty(self, project: str) -> None:
+        """
+        Record a write made through this server; the project is not served
+        from the mirror again until a sync started after the write completes.
+        """
+        self._dirty[project] = time.time()
+
+    def is_fresh(self, project: str, max_age: float) -> bool:
+        last_sync = self.sync_state(project)["last_sync"]
+        if last_sync <= self._dirty.get(project, 0.0):
+            return False
+        return time.time() - last_sync <= max_age
+
+    def query(
+        self,
+        project: str,
+        filters: Dict[str, Any],
+        max_results: int,
+        fields: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer a search_issues_tool query from the mirror.
+
+        Returns:
+            A search response shaped like Jira's, or None when the query uses a
+            filter or field the mirror does not hold
+        """
+        clauses = ["project = ?"]
+        params: List[Any] = [project.upper()]
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name not in FILTER_COLUMNS:
+                return None
+            column = FILTER_COLUMNS[name][0]
+            wanted = value if isinstance(value, list) else [value]
+            clauses.append("(" + " OR ".join(f"instr({column}, ?) > 0" for _ in wanted) + ")")
+            params.extend(f"|{str(v).lower().replace('/', '-')}|" for v in wanted)
+
+        where = " AND ".join(clauses)
+        reader = self._reader()
+        total = reader.execute(f"SELECT COUNT(*) FROM issues WHERE {where}", params).fetchone()[0]
+        rows = reader.execute(
+            f"SELECT raw FROM issues WHERE {where} ORDER BY updated DESC LIMIT ?", [*params, max_results]
+        ).fetchall()
+
+        issues = [json.loads(raw) for (raw,) in rows]
+        if fields:
+            wanted_fields = fields.split(",")
+            projected = []
+            for issue in issues:
+                issue_fields = issue.get("fields") or {}
+                if any(name not in issue_fields for name in wanted_fields):
+                    return None
+                projected.append(dict(issue, fields={name: issue_fields[name] for name in wanted_fields}))
+            issues = projected
+
+        return {
+            "startAt": 0,
+            "maxResults": max_results,
+            "total": total,
+            "issues": issues,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._conn.close()
+
+class MirrorSync:
+    """
+    Background engine keeping an IssueMirror of the JIRA_MIRROR_PROJECTS
+    projects up to date with incremental `updated >= -Nm` searches and a
+    periodic full resync that also drops deleted issues.
+    """
+    mirror: Optional[IssueMirror] = None
+    _task: Optional[asyncio.Task] = None
+    _wake: Optional[asyncio.Event] = None
+    stats: Dict[str, Any] = {"syncs": 0, "issues_synced": 0, "errors": 0, "served": 0, "fallbacks": 0}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return bool(JiraConfig.MIRROR_PROJECTS)
+
+    @classmethod
+    async def sync_project(cls, project: str) -> int:
+        state = await asyncio.to_thread(cls.mirror.sync_state, project)
+        started = time.time()
+        full = started - state["last_full_sync"] >= JiraConfig.MIRROR_FULL_SYNC_INTERVAL
+
+        jql = f'project = "{project}"'
+        if not full:
+            # Relative dates avoid any mismatch between our clock and the Jira user's timezone
+            minutes = math.ceil((started - state["last_sync"]) / 60) + JiraConfig.MIRROR_SYNC_OVERLAP_MINUTES
+            jql += f" AND updated >= -{minutes}m"
+
+        batch: List[Dict[str, Any]] = []
+        seen: List[str] = []
+        count = 0
+        async for issue in iter_search_issues(jql + " ORDER BY updated ASC"):
+            batch.append(issue)
+            seen.append(issue["key"])
+            if len(batch) >= 500:
+                count += await asyncio.to_thread(cls.mirror.upsert, batch)
+                batch = []
+        count += await asyncio.to_thread(cls.mirror.upsert, batch)
+        if full:
+            await asyncio.to_thread(cls.mirror.delete_missing, project, seen)
+        await asyncio.to_thread(cls.mirror.set_synced, project, started, full)
+        return count
+
+    @classmethod
+    async def sync_all(cls) -> None:
+        for project in JiraConfig.MIRROR_PROJECTS:
+            try:
+                cls.stats["issues_synced"] += await cls.sync_project(project)
+                cls.stats["syncs"] += 1
+            except Exception as e:
+                cls.stats["errors"] += 1
+                print(f"Error syncing project {project} into the mirror: {e}")
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await cls.sync_all()
+            try:
+                await asyncio.wait_for(cls._wake.wait(), JiraConfig.MIRROR_SYNC_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            cls._wake.clear()
+
+    @classmethod
+    async def start(cls) -> None:
+        """Open the mirror and start syncing. Called from the Starlette lifespan."""
+        if not cls.enabled() or cls.mirror is not None:
+            return
+        cls.mirror = IssueMirror(JiraConfig.MIRROR_DB_PATH)
+        cls._wake = asyncio.Event()
+        # Behind the dispatcher only worker 0 syncs; the others read the same database
+        if JiraConfig.WORKER_INDEX == 0:
+            cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+        if cls.mirror is not None:
+            cls.mirror.close()
+            cls.mirror = None
+
+    @classmethod
+    async def search(
+        cls,
+        project: str,
+        filters: Dict[str, Any],
+        max_results: int,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer a search from the mirror when the project is mirrored and fresh.
+        The SQLite reads and row decoding run in a worker thread.
+
+        Returns:
+            A result shaped like search_issues', or None to query Jira instead
+        """
+        project = project.upper()
+        if cls.mirror is None or expand or project not in JiraConfig.MIRROR_PROJECTS:
+            return None
+        # JQL functions (currentUser(), membersOf(...)) and EMPTY are only evaluated by Jira
+        for value in filters.values():
+            values = value if isinstance(value, list) else [value]
+            if any(v is not None and not is_literal(v) for v in values):
+                cls.stats["fallbacks"] += 1
+                return None
+
+        mirror = cls.mirror
+
+        def read() -> tuple:
+            if not mirror.is_fresh(project, JiraConfig.MIRROR_MAX_STALENESS):
+                return False, None
+            return True, mirror.query(project, filters, max_results, resolve_fields(fields))
+
+        fresh, result = await asyncio.to_thread(read)
+        if not fresh:
+            return None
+        if result is None:
+            cls.stats["fallbacks"] += 1
+            return None
+        cls.stats["served"] += 1
+        return {
+            "success": True,
+            "source": "mirror",
+            "issues": result
+        }
+
+@on_issue_write
+def _mark_project_dirty(issue_key: str) -> None:
+    if MirrorSync.mirror is not None and "-" in issue_key:
+        MirrorSync.mirror.mark_dirty(issue_key.rsplit("-", 1)[0].upper())
+        # Pull the change in now instead of waiting for the next interval
+        MirrorSync._wake.set()
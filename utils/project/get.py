@@ -2,11 +2,29 @@ import httpx
 from httpx import BasicAuth
 from typing import Dict, Any, Optional
 from ..config import JiraConfig
+from ..client import JiraClient
+from ..retry import get_with_retry
+from ..cache import TTLCache
+from ..singleflight import single_flight
 
+# Project metadata rarely changes, so lookups are cached by both ID and key
+project_cache = TTLCache(
+    "project",
+    ttl=JiraConfig.PROJECT_CACHE_TTL,
+    maxsize=JiraConfig.PROJECT_CACHE_MAXSIZE,
+)
+
+def _cache_key(id_or_key: str) -> str:
+    id_or_key = str(id_or_key).strip()
+    if id_or_key.isdigit():
+        return f"id:{id_or_key}"
+    return f"key:{id_or_key.upper()}"
+
+@single_flight("project")
 async def get_project(project_key: Optional[str] = None, project_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Get a single Jira project by ID or key.
-    
+
     Args:
         project_key: The ID or key of the project to retrieve
         project_key: The key of the project to retrieve
@@ -21,30 +39,27 @@ async def get_project(project_key: Optional[str] = None, project_id: Optional[st
     else:
         raise ValueError("Either project_key or project_id must be provided")
 
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {JiraConfig.API_TOKEN}"
-    }
-    
-    # If you have a cookie for session authentication, add it here
-    cookies = {}
-    if hasattr(JiraConfig, 'SESSION_COOKIE') and JiraConfig.SESSION_COOKIE:
-        cookies = {"JSESSIONID": JiraConfig.SESSION_COOKIE}
+    cache_key = _cache_key(project_key or project_id)
+    cached = project_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=headers,
-                cookies=cookies
-            )
-            response.raise_for_status()
-            json_response = response.json()
-            return {
-                "success": True,
-                "project": json_response
-            }
+        client = JiraClient.get()
+        response = await get_with_retry(client, url)
+        response.raise_for_status()
+        json_response = response.json()
+        result = {
+            "success": True,
+            "project": json_response
+        }
+        # Warm both lookups so an ID request also serves the key request
+        if json_response.get("id"):
+            project_cache.set(_cache_key(json_response["id"]), result)
+        if json_response.get("key"):
+            project_cache.set(_cache_key(json_response["key"]), result)
+        project_cache.set(cache_key, result)
+        return result
     except httpx.HTTPStatusError as e:
         return {
             "success": False,
@@ -2,24 +2,31 @@ import httpx
 import json
 
 from utils.config import JiraConfig
+from utils.client import JiraClient
+from utils.retry import get_with_retry
+from utils.cache import TTLCache
+from utils.singleflight import single_flight
 
+all_projects_cache = TTLCache("all_projects", ttl=JiraConfig.PROJECT_CACHE_TTL, maxsize=1)
+
+@single_flight("all_projects")
 async def get_all_projects():
+    cached = all_projects_cache.get("all")
+    if cached is not None:
+        return cached
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{JiraConfig.BASE_URL}/rest/api/3/project/search",
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json"
-                },
-                auth=(JiraConfig.USER_EMAIL, JiraConfig.API_TOKEN)
-            )
-            response.raise_for_status()
-            data = response.json()
-            projects = data.get('values', [])
-            print("projects")
-            print(projects)
-            return projects
+        client = JiraClient.get()
+        response = await get_with_retry(
+            client,
+            f"{JiraConfig.BASE_URL}/rest/api/3/project/search",
+            auth=(JiraConfig.USER_EMAIL, JiraConfig.API_TOKEN)
+        )
+        response.raise_for_status()
+        data = response.json()
+        projects = data.get('values', [])
+        all_projects_cache.set("all", projects)
+        return projects
     except httpx.RequestError as e:
         print(f"Error fetching projects: {e}")
         raise
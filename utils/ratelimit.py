@@ -0,0 +1,226 @@
+import asyncio
+import email.utils
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import httpx
+from .config import JiraConfig
+
+# Floors keeping the limiter able to admit a request whatever it is configured with
+MIN_RATE = 0.1
+MIN_CONCURRENCY = 1
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP date).
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds until an X-RateLimit-Reset time (ISO 8601 as sent by Atlassian, or epoch seconds).
+    """
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(float(value) - time.time(), 0.0)
+    except ValueError:
+        return None
+
+class AdaptiveRateLimiter:
+    """
+    Client-side token bucket combined with an AIMD concurrency window.
+
+    Every request takes a token (refilled at `rate` per second up to `burst`)
+    and a slot in the concurrency window, held until its response body is
+    closed. Successful responses grow the window by roughly one slot per
+    window's worth of requests; a 429 halves it (never below MIN_CONCURRENCY)
+    and pauses all requests until Retry-After / X-RateLimit-Reset has passed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+    ):
+        self.rate = max(rate, MIN_RATE)
+        self.burst = max(burst, 1)
+        self.min_concurrency = max(min_concurrency, MIN_CONCURRENCY)
+        self.max_concurrency = max(max_concurrency, self.min_concurrency)
+        self.concurrency_limit = float(self.max_concurrency)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._cond = asyncio.Condition()
+
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def acquire(self) -> None:
+        """
+        Wait for a token and a concurrency slot.
+        """
+        started = time.monotonic()
+        self.queue_depth += 1
+        try:
+            async with self._cond:
+                while True:
+                    now = time.monotonic()
+                    delay = None
+                    if now < self._blocked_until:
+                        delay = self._blocked_until - now
+                    elif self.in_flight < int(self.concurrency_limit):
+                        self._refill(now)
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            self.in_flight += 1
+                            self.requests += 1
+                            return
+                        delay = (1 - self._tokens) / self.rate
+
+                    # Woken early when a slot frees up or the window changes
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            self.queue_depth -= 1
+            self.wait_seconds += time.monotonic() - started
+
+    async def release(self, response: Optional[httpx.Response]) -> None:
+        """
+        Free the slot taken by acquire and adapt to the response's throttling signals.
+        """
+        async with self._cond:
+            self.in_flight -= 1
+            if response is not None:
+                self._adapt(response)
+            self._cond.notify_all()
+
+    async def observe(self, response: httpx.Response) -> None:
+        """
+        Adapt to a response's throttling signals as soon as its headers arrive,
+        keeping its slot until release.
+        """
+        async with self._cond:
+            self._adapt(response)
+            self._cond.notify_all()
+
+    def _adapt(self, response: httpx.Response) -> None:
+        headers = response.headers
+        pause = None
+        if response.status_code == 429:
+            self.throttled += 1
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+            pause = _parse_retry_after(headers.get("Retry-After"))
+            if pause is None:
+                pause = _parse_reset(headers.get("X-RateLimit-Reset"))
+            if pause is None:
+                pause = 1.0
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            pause = _parse_reset(headers.get("X-RateLimit-Reset"))
+        elif headers.get("X-RateLimit-NearLimit", "").lower() == "true":
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * 0.75)
+        elif response.status_code < 500:
+            self.concurrency_limit = min(
+                self.max_concurrency,
+                self.concurrency_limit + 1 / max(self.concurrency_limit, 1),
+            )
+
+        if pause:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "concurrency_limit": round(self.concurrency_limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "paused_for": round(max(self._blocked_until - time.monotonic(), 0.0), 3),
+        }
+
+class _SlotStream(httpx.AsyncByteStream):
+    """
+    Response stream that gives its concurrency slot back once it is closed.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, limiter: AdaptiveRateLimiter):
+        self._stream = stream
+        self._limiter: Optional[AdaptiveRateLimiter] = limiter
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._limiter is not None:
+                limiter, self._limiter = self._limiter, None
+                await limiter.release(None)
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that routes every outbound Jira request through an
+    AdaptiveRateLimiter and transparently retries requests answered with 429
+    once the server's requested pause is over.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: AdaptiveRateLimiter, max_retries: int = 2):
+        self._transport = transport
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except BaseException:
+                await self.limiter.release(None)
+                raise
+
+            if response.status_code != 429 or attempt >= self.max_retries:
+                # The slot stays taken until the body is read and closed
+                await self.limiter.observe(response)
+                response.stream = _SlotStream(response.stream, self.limiter)
+                return response
+            # The limiter is now paused until Retry-After; the next acquire waits it out
+            await self.limiter.release(response)
+            await response.aclose()
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,123 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+import httpx
+from .config import JiraConfig
+
+# Gateway errors Jira returns while a node is restarting or overloaded
+RETRY_STATUSES = {502, 503, 504}
+
+class LatencyTracker:
+    """
+    Rolling window of recent read latencies used to pick the hedging delay.
+    """
+
+    def __init__(self, size: int = 500, min_samples: int = 20):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+read_latency = LatencyTracker()
+
+retry_stats: Dict[str, int] = {
+    "requests": 0,
+    "retries": 0,
+    "hedges": 0,
+    "hedge_wins": 0,
+    "deadline_exceeded": 0,
+}
+
+def _hedge_delay() -> Optional[float]:
+    """
+    Seconds to wait before firing a hedged request, or None when hedging is off.
+    JIRA_HEDGE_DELAY is either a number of seconds or "p95" to follow observed latency.
+    """
+    if JiraConfig.HEDGE_PERCENTILE is not None:
+        observed = read_latency.percentile(JiraConfig.HEDGE_PERCENTILE)
+        return observed if observed is not None else JiraConfig.HEDGE_FALLBACK_DELAY
+    return JiraConfig.HEDGE_DELAY
+
+async def _timed_get(client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+    started = time.monotonic()
+    response = await client.get(url, **kwargs)
+    read_latency.record(time.monotonic() - started)
+    return response
+
+async def _hedged_get(client: httpx.AsyncClient, url: str, timeout: float, **kwargs: Any) -> httpx.Response:
+    """
+    Send a GET and, if it has not answered within the hedging delay, a second
+    identical one; whichever completes first wins and the other is cancelled.
+    """
+    delay = _hedge_delay()
+    primary = asyncio.create_task(_timed_get(client, url, **kwargs))
+    if delay is None or delay >= timeout:
+        return await asyncio.wait_for(primary, timeout)
+
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            retry_stats["hedges"] += 1
+            tasks.add(asyncio.create_task(_timed_get(client, url, **kwargs)))
+            done, _ = await asyncio.wait(tasks, timeout=timeout - delay, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                raise asyncio.TimeoutError()
+        winner = done.pop()
+        if winner is not primary:
+            retry_stats["hedge_wins"] += 1
+        return winner.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def get_with_retry(client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    GET an idempotent Jira resource, retrying transport errors and 502/503/504
+    responses with jittered exponential backoff until JIRA_RETRY_MAX_ATTEMPTS
+    or the overall JIRA_RETRY_DEADLINE is reached. Optionally hedges slow
+    requests (see JIRA_HEDGE_DELAY).
+
+    Args:
+        client: The shared Jira client
+        url: The URL to fetch
+        **kwargs: Passed through to httpx.AsyncClient.get (params, headers, auth, ...)
+
+    Returns:
+        The last response received; callers still call raise_for_status()
+    """
+    retry_stats["requests"] += 1
+    deadline = time.monotonic() + JiraConfig.RETRY_DEADLINE
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = deadline - time.monotonic()
+        try:
+            response = await _hedged_get(client, url, remaining, **kwargs)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            failure: Optional[BaseException] = None
+        except (httpx.TransportError, asyncio.TimeoutError) as e:
+            response, failure = None, e
+
+        # Full jitter: sleep a random amount up to the exponential backoff cap
+        backoff = random.uniform(0, min(JiraConfig.RETRY_MAX_DELAY, JiraConfig.RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+        if attempt >= JiraConfig.RETRY_MAX_ATTEMPTS or time.monotonic() + backoff >= deadline:
+            if failure is None:
+                return response
+            if isinstance(failure, asyncio.TimeoutError):
+                retry_stats["deadline_exceeded"] += 1
+                raise httpx.ReadTimeout(f"Jira did not answer within {JiraConfig.RETRY_DEADLINE}s") from failure
+            raise failure
+
+        retry_stats["retries"] += 1
+        await asyncio.sleep(backoff)
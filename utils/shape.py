@@ -0,0 +1,183 @@
+import json
+import re
+from typing import Any, Dict, Optional
+from .config import JiraConfig
+from .issue.fields import get_field_names
+
+# orjson encodes several times faster; fall back to the stdlib encoder without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SHAPES = ("raw", "compact")
+
+# Keys that only carry links and images back into Jira
+_DROPPED_KEYS = frozenset({"self", "avatarUrls", "iconUrl", "expand", "renderedFields", "names", "schema"})
+
+# Jira Server renders sprints as "com.atlassian.greenhopper.service.sprint.Sprint@1a2b[id=1,...,name=Sprint 7,...]"
+_SPRINT_NAME = re.compile(r"\[.*?\bname=([^,\]]*)")
+
+def encode(value: Any) -> str:
+    """
+    Encode to JSON without whitespace.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=str).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def _empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+def _flatten(value: Any) -> Any:
+    """
+    Reduce a Jira field value to the part a reader cares about: users to
+    their display name, projects to their key, options and statuses to their
+    name, linked issues to key/summary/status.
+    """
+    if isinstance(value, list):
+        return [v for v in map(_flatten, value) if not _empty(v)]
+    if isinstance(value, str):
+        match = _SPRINT_NAME.search(value) if value.startswith("com.atlassian.greenhopper") else None
+        return match.group(1) if match else value
+    if not isinstance(value, dict):
+        return value
+
+    if "displayName" in value:
+        return value["displayName"]
+    if "key" in value and "fields" in value:
+        fields = value["fields"] or {}
+        return {
+            k: v for k, v in (
+                ("key", value["key"]),
+                ("summary", fields.get("summary")),
+                ("status", _flatten(fields.get("status"))),
+            ) if not _empty(v)
+        }
+    if "type" in value and ("inwardIssue" in value or "outwardIssue" in value):
+        if "outwardIssue" in value:
+            return {"type": value["type"].get("outward"), "issue": _flatten(value["outwardIssue"])}
+        return {"type": value["type"].get("inward"), "issue": _flatten(value["inwardIssue"])}
+    if "value" in value:
+        child = value.get("child")
+        return f"{value['value']} / {child['value']}" if child else value["value"]
+    if "name" in value and ("self" in value or "id" in value):
+        # Projects keep the key the other tools take as project_key
+        return value.get("key") or value["name"]
+
+    shaped = {}
+    for key, item in value.items():
+        if key in _DROPPED_KEYS:
+            continue
+        item = _flatten(item)
+        if not _empty(item):
+            shaped[key] = item
+    return shaped
+
+def shape_comment(comment: Dict[str, Any]) -> Dict[str, Any]:
+    shaped = {
+        "id": comment.get("id"),
+        "author": _flatten(comment.get("author")),
+        "created": comment.get("created"),
+        "body": comment.get("body"),
+    }
+    if comment.get("updated") and comment.get("updated") != comment.get("created"):
+        shaped["updated"] = comment["updated"]
+    return shaped
+
+def shape_issue(issue: Dict[str, Any], names: Dict[str, str]) -> Dict[str, Any]:
+    """
+    One flat record per issue: system fields keep their ids, custom fields are
+    renamed to their display name (unless that name is already taken).
+    """
+    shaped = {"key": issue.get("key"), "id": issue.get("id")}
+    for field_id, value in (issue.get("fields") or {}).items():
+        if field_id == "comment" and isinstance(value, dict):
+            value = [shape_comment(c) for c in value.get("comments", [])]
+        else:
+            value = _flatten(value)
+        if _empty(value):
+            continue
+        name = names.get(field_id, field_id) if field_id.startswith("customfield_") else field_id
+        shaped[field_id if name in shaped else name] = value
+    return shaped
+
+def shape_project(project: Dict[str, Any]) -> Dict[str, Any]:
+    shaped = {
+        "id": project.get("id"),
+        "key": project.get("key"),
+        "name": project.get("name"),
+        "type": project.get("projectTypeKey"),
+        "lead": _flatten(project.get("lead")),
+        "description": project.get("description"),
+        "category": _flatten(project.get("projectCategory")),
+        "components": _flatten(project.get("components")),
+        "issueTypes": _flatten(project.get("issueTypes")),
+        "versions": [v.get("name") for v in project.get("versions") or [] if not v.get("archived")],
+    }
+    return {k: v for k, v in shaped.items() if not _empty(v)}
+
+async def _names() -> Dict[str, str]:
+    # Custom fields keep their ids when the field list cannot be read
+    try:
+        return await get_field_names()
+    except Exception as e:
+        print(f"Error fetching field names: {e}")
+        return {}
+
+def resolve_shape(shape: Optional[str]) -> str:
+    shape = (shape or JiraConfig.RESPONSE_SHAPE).strip().lower()
+    if shape not in SHAPES:
+        raise ValueError(f"shape must be one of {', '.join(SHAPES)}")
+    return shape
+
+async def shape_result(result: Any, kind: str, shape: Optional[str] = None) -> Any:
+    """
+    Return a tool result as-is ("raw") or as compact records encoded to a
+    JSON string ("compact"), which FastMCP passes through without re-encoding.
+
+    Args:
+        result: What the underlying helper returned
+        kind: "issue", "issues" (get_issues_batch), "search", "comments", "project" or "projects"
+        shape: "raw" or "compact"; defaults to JIRA_RESPONSE_SHAPE
+    """
+    if resolve_shape(shape) == "raw":
+        return result
+    if isinstance(result, dict) and result.get("success") is False:
+        return encode(result)
+
+    if kind == "issue":
+        compact = shape_issue(result, await _names())
+    elif kind == "issues":
+        names = await _names()
+        compact = {
+            "success": result["success"],
+            "issues": {key: shape_issue(issue, names) for key, issue in result["issues"].items()},
+        }
+        if result.get("errors"):
+            compact["errors"] = result["errors"]
+    elif kind == "search":
+        names = await _names()
+        body = result["issues"]
+        compact = {
+            "success": True,
+            "total": body.get("total"),
+            "issues": [shape_issue(issue, names) for issue in body.get("issues", [])],
+        }
+        if result.get("source"):
+            compact["source"] = result["source"]
+    elif kind == "comments":
+        body = result["comments"]
+        compact = {
+            "success": True,
+            "startAt": body.get("startAt"),
+            "total": body.get("total"),
+            "comments": [shape_comment(c) for c in body.get("comments", [])],
+        }
+    elif kind == "project":
+        compact = {"success": True, "project": shape_project(result["project"])}
+    elif kind == "projects":
+        compact = [shape_project(project) for project in result]
+    else:
+        raise ValueError(f"Unknown result kind: {kind}")
+    return encode(compact)
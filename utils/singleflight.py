@@ -0,0 +1,62 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# Registry of groups, as cache.CACHES is of caches
+GROUPS: Dict[str, "SingleFlight"] = {}
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key onto one in-flight future,
+    whose result every caller shares read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        GROUPS[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._forget, key))
+        # Shielded so one caller being cancelled does not cancel the others' request
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+def single_flight(name: str) -> Callable:
+    """Decorator coalescing concurrent calls of an async read helper with identical arguments."""
+    group = SingleFlight(name)
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # repr keeps list arguments (e.g. field lists) usable as part of the key
+            key = repr((args, sorted(kwargs.items())))
+            return await group.do(key, lambda: fn(*args, **kwargs))
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Call and coalesced-call counters for every single-flight group, keyed by name."""
+    return {name: group.stats() for name, group in GROUPS.items()}
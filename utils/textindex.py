@@ -0,0 +1,285 @@
+import asyncio
+import heapq
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from .config import JiraConfig
+from .events import on_issue_write
+from .issue.comments import fetch_all_comments
+from .issue.search import iter_search_issues
+
+# Seconds between checks for a newer snapshot in workers that do not index themselves
+FOLLOW_INTERVAL = 5
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_][a-z0-9]+)*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased word tokens; issue keys and snake/kebab identifiers stay whole.
+    """
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+class TextIndex:
+    """
+    In-memory inverted index over issue summaries, descriptions and comments
+    ranked with BM25. Summary terms are counted twice so title matches rank higher.
+    """
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.doc_length: Dict[str, int] = {}
+        self.summaries: Dict[str, str] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_terms)
+
+    def add(self, key: str, summary: str, body: str) -> None:
+        """
+        Index (or re-index) one issue.
+        """
+        self.remove(key)
+        terms = Counter(tokenize(summary) * 2 + tokenize(body))
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[key] = tf
+        self.doc_terms[key] = dict(terms)
+        self.doc_length[key] = sum(terms.values())
+        self.summaries[key] = summary
+        self._total_length += self.doc_length[key]
+
+    def remove(self, key: str) -> None:
+        terms = self.doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(key, None)
+                if not docs:
+                    del self.postings[term]
+        self._total_length -= self.doc_length.pop(key, 0)
+        self.summaries.pop(key, None)
+
+    def search(self, query: str, limit: int = 10, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked issue keys matching any query term.
+        """
+        n = len(self.doc_terms)
+        if not n:
+            return []
+        avg_length = self._total_length / n
+        prefix = f"{project.upper()}-" if project else None
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for key, tf in docs.items():
+                if prefix and not key.startswith(prefix):
+                    continue
+                norm = tf + self.K1 * (1 - self.B + self.B * self.doc_length[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.K1 + 1) / norm
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [{"key": key, "score": round(score, 4), "summary": self.summaries.get(key)} for key, score in best]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"docs": self.doc_terms, "summaries": self.summaries}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TextIndex":
+        index = cls()
+        for key, terms in data.get("docs", {}).items():
+            for term, tf in terms.items():
+                index.postings.setdefault(term, {})[key] = tf
+            index.doc_terms[key] = terms
+            index.doc_length[key] = sum(terms.values())
+            index._total_length += index.doc_length[key]
+        index.summaries = data.get("summaries", {})
+        return index
+
+class TextIndexSync:
+    """
+    Background engine filling a TextIndex for the JIRA_TEXT_INDEX_PROJECTS
+    projects by paging search_issues and pulling each changed issue's
+    comments, then refreshing incrementally with `updated >= -Nm` searches.
+    The index is snapshotted to JIRA_TEXT_INDEX_PATH so restarts only catch up.
+    """
+    index: TextIndex = TextIndex()
+    state: Dict[str, Dict[str, float]] = {}
+    _task: Optional[asyncio.Task] = None
+    _wake: Optional[asyncio.Event] = None
+    stats: Dict[str, Any] = {"syncs": 0, "issues_indexed": 0, "errors": 0, "queries": 0}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return bool(JiraConfig.TEXT_INDEX_PROJECTS)
+
+    @classmethod
+    async def _index_issue(cls, issue: Dict[str, Any]) -> None:
+        fields = issue.get("fields") or {}
+        parts = [fields.get("description") or ""]
+        # Fetched directly so a full sync does not evict the interactive comment cache
+        try:
+            comments = await fetch_all_comments(issue["key"])
+        except Exception as e:
+            print(f"Indexing {issue['key']} without comments: {e}")
+            comments = []
+        parts.extend(c.get("body") or "" for c in comments)
+        cls.index.add(issue["key"], fields.get("summary") or "", "\n".join(parts))
+
+    @classmethod
+    async def sync_project(cls, project: str) -> int:
+        state = cls.state.setdefault(project, {"last_sync": 0.0, "last_full_sync": 0.0})
+        started = time.time()
+        full = started - state["last_full_sync"] >= JiraConfig.TEXT_INDEX_FULL_SYNC_INTERVAL
+
+        jql = f'project = "{project}"'
+        if not full:
+            minutes = math.ceil((started - state["last_sync"]) / 60) + JiraConfig.TEXT_INDEX_SYNC_OVERLAP_MINUTES
+            jql += f" AND updated >= -{minutes}m"
+
+        # A fixed pool of workers fed through a bounded queue, so memory does not grow with the project
+        queue: asyncio.Queue = asyncio.Queue(maxsize=JiraConfig.TEXT_INDEX_CONCURRENCY * 2)
+        seen = set()
+
+        async def worker() -> None:
+            while True:
+                issue = await queue.get()
+                try:
+                    if issue is None:
+                        return
+                    await cls._index_issue(issue)
+                except Exception as e:
+                    cls.stats["errors"] += 1
+                    print(f"Error indexing {issue['key']}: {e}")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(JiraConfig.TEXT_INDEX_CONCURRENCY)]
+        try:
+            async for issue in iter_search_issues(jql, fields="summary,description,updated"):
+                seen.add(issue["key"])
+                await queue.put(issue)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        if full:
+            for key in [k for k in cls.index.doc_terms if k.startswith(f"{project}-") and k not in seen]:
+                cls.index.remove(key)
+        state["last_sync"] = started
+        if full:
+            state["last_full_sync"] = started
+        return len(seen)
+
+    @classmethod
+    async def sync_all(cls) -> None:
+        for project in JiraConfig.TEXT_INDEX_PROJECTS:
+            try:
+                cls.stats["issues_indexed"] += await cls.sync_project(project)
+                cls.stats["syncs"] += 1
+            except Exception as e:
+                cls.stats["errors"] += 1
+                print(f"Error indexing project {project}: {e}")
+        if JiraConfig.TEXT_INDEX_PATH:
+            await asyncio.to_thread(cls._save)
+
+    @classmethod
+    def _save(cls) -> None:
+        tmp = JiraConfig.TEXT_INDEX_PATH + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"state": cls.state, "index": cls.index.to_dict()}, f)
+        os.replace(tmp, JiraConfig.TEXT_INDEX_PATH)
+
+    @classmethod
+    def _load(cls) -> None:
+        if not JiraConfig.TEXT_INDEX_PATH or not os.path.exists(JiraConfig.TEXT_INDEX_PATH):
+            return
+        try:
+            with open(JiraConfig.TEXT_INDEX_PATH) as f:
+                data = json.load(f)
+            cls.state = data.get("state", {})
+            cls.index = TextIndex.from_dict(data.get("index", {}))
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable text index snapshot: {e}")
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await cls.sync_all()
+            try:
+                await asyncio.wait_for(cls._wake.wait(), JiraConfig.TEXT_INDEX_SYNC_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            cls._wake.clear()
+
+    @classmethod
+    async def _follow(cls) -> None:
+        """Reload the snapshot whenever another process replaces it."""
+        loaded = None
+        while True:
+            try:
+                modified = os.path.getmtime(JiraConfig.TEXT_INDEX_PATH)
+            except (OSError, TypeError):
+                modified = None
+            if modified is not None and modified != loaded:
+                await asyncio.to_thread(cls._load)
+                loaded = modified
+            await asyncio.sleep(FOLLOW_INTERVAL)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Load the snapshot and start indexing. Called from the Starlette lifespan."""
+        if not cls.enabled() or cls._task is not None:
+            return
+        cls._wake = asyncio.Event()
+        # Behind the dispatcher only worker 0 indexes; the others follow its snapshot
+        if JiraConfig.WORKER_INDEX == 0:
+            await asyncio.to_thread(cls._load)
+            cls._task = asyncio.create_task(cls._run())
+        else:
+            cls._task = asyncio.create_task(cls._follow())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    def search(cls, query: str, project: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
+        if not cls.enabled():
+            return {
+                "success": False,
+                "error": "Text index is disabled; set JIRA_TEXT_INDEX_PROJECTS to enable it"
+            }
+        cls.stats["queries"] += 1
+        return {
+            "success": True,
+            "indexed_issues": len(cls.index),
+            "results": cls.index.search(query, limit=limit, project=project)
+        }
+
+@on_issue_write
+def _reindex_soon(issue_key: str) -> None:
+    if TextIndexSync._wake is not None:
+        TextIndexSync._wake.set()
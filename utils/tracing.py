@@ -0,0 +1,271 @@
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+from .config import JiraConfig
+from .metrics import ObservedStream, endpoint
+
+# httpcore trace events (minus the "http11."/"http2."/"connection." prefix) and the phase they time
+_PHASES = {
+    "connect_tcp": "connect",
+    "start_tls": "tls",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "ttfb",
+    "receive_response_body": "body",
+}
+
+class Span:
+    """
+    One timed operation: a tool call (root) or an outbound Jira request.
+    Phase durations are in milliseconds.
+    """
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "phases", "start_ns", "end_ns")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str] = None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes: Dict[str, Any] = {}
+        self.phases: Dict[str, float] = {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = round(self.phases.get(phase, 0.0) + seconds * 1000, 3)
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace.span_ended(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return round(((self.end_ns or time.time_ns()) - self.start_ns) / 1e6, 3)
+
+    def to_jsonl(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "phases_ms": self.phases,
+            "attributes": self.attributes,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        attributes = {**self.attributes, **{f"phase.{k}_ms": v for k, v in self.phases.items()}}
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": 3 if self.parent_id else 2,  # CLIENT / SERVER
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+        }
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+class Trace:
+    """
+    Spans of one tool call (or one untraced outbound request). Spans are
+    buffered until the root ends, then the whole trace is kept or dropped:
+    it is kept when sampled or when it took at least JIRA_TRACE_SLOW_MS.
+    Spans ending after that follow the same decision and are exported alone.
+    """
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.sampled = random.random() < JiraConfig.TRACE_SAMPLE_RATE
+        self.root: Optional[Span] = None
+        self.spans: List[Span] = []
+        # None until the root ends, then whether the trace was kept
+        self.kept: Optional[bool] = None
+
+    def start_span(self, name: str, parent: Optional[Span] = None) -> Span:
+        span = Span(self, name, parent.span_id if parent else None)
+        if self.root is None:
+            self.root = span
+        return span
+
+    def span_ended(self, span: Span) -> None:
+        if self.kept is not None:
+            if self.kept:
+                Tracer.export([span], new_trace=False)
+            return
+        self.spans.append(span)
+        if span is self.root:
+            self.kept = self.sampled or span.duration_ms >= JiraConfig.TRACE_SLOW_MS
+            if self.kept:
+                Tracer.export(self.spans)
+            self.spans = []
+
+# The span of the tool call currently running in this task
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("jira_trace_span", default=None)
+
+class Tracer:
+    """
+    Buffers kept spans and appends them to JIRA_TRACE_PATH, one JSON record
+    per line, in the "jsonl" or "otlp" (OTLP/JSON span) layout.
+    """
+    _buffer: List[Dict[str, Any]] = []
+    _flushing: Optional[asyncio.Task] = None
+    stats: Dict[str, int] = {"traces_exported": 0, "spans_exported": 0, "write_errors": 0}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return JiraConfig.TRACE_ENABLED
+
+    @classmethod
+    def export(cls, spans: List[Span], new_trace: bool = True) -> None:
+        otlp = JiraConfig.TRACE_FORMAT == "otlp"
+        cls._buffer.extend(span.to_otlp() if otlp else span.to_jsonl() for span in spans)
+        if new_trace:
+            cls.stats["traces_exported"] += 1
+        cls.stats["spans_exported"] += len(spans)
+        if len(cls._buffer) >= JiraConfig.TRACE_BUFFER_SIZE and cls._flushing is None:
+            cls._flushing = asyncio.get_running_loop().create_task(cls.flush())
+
+    @classmethod
+    async def flush(cls) -> None:
+        try:
+            records, cls._buffer = cls._buffer, []
+            if records:
+                await asyncio.to_thread(cls._write, records)
+        finally:
+            cls._flushing = None
+
+    @classmethod
+    def _write(cls, records: List[Dict[str, Any]]) -> None:
+        try:
+            with open(JiraConfig.TRACE_PATH, "a") as f:
+                f.writelines(json.dumps(record, separators=(",", ":"), default=str) + "\n" for record in records)
+        except OSError as e:
+            cls.stats["write_errors"] += 1
+            print(f"Error writing traces to {JiraConfig.TRACE_PATH}: {e}")
+
+def traced_tool(name: str) -> Callable:
+    """
+    Decorator opening a root span for a tool call; outbound requests made
+    while it runs become its children. A no-op unless JIRA_TRACE_ENABLED.
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        if not Tracer.enabled():
+            return fn
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            span = Trace().start_span(f"tool {name}")
+            span.attributes["tool"] = name
+            token = _current_span.set(span)
+            try:
+                result = await fn(*args, **kwargs)
+                if isinstance(result, dict) and result.get("success") is False:
+                    span.attributes["error"] = str(result.get("error"))
+                return result
+            except BaseException as e:
+                span.attributes["error"] = repr(e)
+                raise
+            finally:
+                _current_span.reset(token)
+                span.end()
+
+        return wrapper
+
+    return decorator
+
+class _TracedResponse(httpx.Response):
+    """
+    Response whose json() time is recorded as the "parse" phase of its span.
+    """
+    _span: Optional[Span] = None
+
+    def json(self, **kwargs: Any) -> Any:
+        span = self._span
+        if span is not None and span.trace.kept is not None:
+            # A request outside any tool call is its own trace, exported when its body closed;
+            # the parse is timed as a child span exported after it
+            span = span.trace.start_span("parse", span)
+        started = time.perf_counter()
+        try:
+            return super().json(**kwargs)
+        finally:
+            if span is not None:
+                span.add_phase("parse", time.perf_counter() - started)
+                if span is not self._span:
+                    span.end()
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper opening a span per outbound Jira request and timing
+    connect, TLS, send, time-to-first-byte, body read and JSON parse from
+    httpcore's trace events.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        parent = _current_span.get()
+        trace = parent.trace if parent is not None else Trace()
+        span = trace.start_span(f"{request.method} {endpoint(request.url.path)}", parent)
+        span.attributes.update({"http.method": request.method, "http.url": str(request.url.copy_with(query=None))})
+        started: Dict[str, float] = {}
+
+        async def on_event(event: str, info: Dict[str, Any]) -> None:
+            step, _, state = event.partition(".")[2].rpartition(".")
+            phase = _PHASES.get(step)
+            if phase is None:
+                return
+            if state == "started":
+                started[step] = time.perf_counter()
+            elif step in started:
+                span.add_phase(phase, time.perf_counter() - started.pop(step))
+
+        request.extensions = {**request.extensions, "trace": on_event}
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException as e:
+            span.attributes["error"] = repr(e)
+            span.end()
+            raise
+        span.attributes["http.status_code"] = response.status_code
+
+        def on_close(size: int) -> None:
+            span.attributes["http.response_size"] = size
+            span.end()
+
+        if response.is_closed:
+            on_close(len(response.content))
+            stream = response.stream
+        else:
+            stream = ObservedStream(response.stream, on_close)
+        traced = _TracedResponse(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=stream,
+            extensions=response.extensions,
+            request=request,
+        )
+        traced._span = span
+        return traced
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
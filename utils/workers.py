@@ -0,0 +1,304 @@
+import asyncio
+import contextlib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+import anyio
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from .config import JiraConfig
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The first event of an SSE stream names the session: "data: /jira/messages/?session_id=<hex>"
+_SESSION_ID = re.compile(rb"session_id=([0-9a-f]+)")
+_HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding", "te", "trailer", "upgrade", "host", "content-length"}
+# Files each process writes on its own; workers get a suffixed copy so they never share one.
+# The mirror database and text index snapshot are shared: worker 0 writes them, the others read
+_PER_WORKER_PATHS = ("JIRA_TRACE_PATH",)
+_PATH_DEFAULTS = {"JIRA_TRACE_PATH": "jira-traces.jsonl"}
+
+class Worker:
+    """
+    One `uvicorn jira:app` process listening on a unix socket, and the
+    client the dispatcher uses to reach it.
+    """
+
+    def __init__(self, index: int, socket_dir: str, count: int = 1):
+        self.index = index
+        self.count = count
+        self.socket_path = os.path.join(socket_dir, f"worker-{index}.sock")
+        self.process: Optional[subprocess.Popen] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.sessions: set = set()
+        # SSE streams opened through this worker, including ones still waiting for their session id
+        self.streams = 0
+        # Stateless streamable-HTTP requests being answered by this worker
+        self.requests = 0
+        self.restarts = 0
+
+    def _env(self) -> Dict[str, str]:
+        env = dict(os.environ, JIRA_WORKER_INDEX=str(self.index))
+        # The rate limit protects Jira, so the workers split one budget between them
+        max_concurrency = max(JiraConfig.RATE_LIMIT_MAX_CONCURRENCY // self.count, 1)
+        env.update(
+            JIRA_RATE_LIMIT_RPS=str(JiraConfig.RATE_LIMIT_RPS / self.count),
+            JIRA_RATE_LIMIT_BURST=str(max(JiraConfig.RATE_LIMIT_BURST // self.count, 1)),
+            JIRA_RATE_LIMIT_MAX_CONCURRENCY=str(max_concurrency),
+            JIRA_RATE_LIMIT_MIN_CONCURRENCY=str(min(JiraConfig.RATE_LIMIT_MIN_CONCURRENCY, max_concurrency)),
+        )
+        for name in _PER_WORKER_PATHS:
+            path = os.getenv(name, _PATH_DEFAULTS[name])
+            if path:
+                env[name] = f"{path}.worker-{self.index}"
+        return env
+
+    async def start(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "jira:app", "--uds", self.socket_path, "--log-level", "info"],
+            cwd=ROOT,
+            env=self._env(),
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=self.socket_path),
+            base_url="http://worker",
+            timeout=httpx.Timeout(30.0, read=None),
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"worker {self.index} exited during startup")
+            try:
+                (await self.client.get("/metrics", timeout=1)).raise_for_status()
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+        raise RuntimeError(f"worker {self.index} did not start")
+
+    async def stop(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                # uvicorn waits for SSE streams to drain on shutdown, and idle sessions never do
+                await asyncio.to_thread(self.process.wait, 5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                await asyncio.to_thread(self.process.wait)
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive(),
+            "sessions": len(self.sessions),
+            "streams": self.streams,
+            "requests": self.requests,
+            "restarts": self.restarts,
+        }
+
+class Dispatcher:
+    """
+    Front process for JIRA_WORKERS > 1. Each new /jira/sse stream goes to the
+    worker with the fewest open streams; the session id in its first event is
+    recorded so every /jira/messages/ post for that session reaches the same
+    worker, which holds the session in memory. Stateless /jira/mcp/ requests
+    can go anywhere.
+    """
+
+    def __init__(self, count: int):
+        self._socket_dir = tempfile.mkdtemp(prefix="jira-mcp-")
+        self.workers = [Worker(i, self._socket_dir, count) for i in range(count)]
+        self.sessions: Dict[str, Worker] = {}
+        self._monitor: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"streams_opened": 0, "messages_forwarded": 0, "unknown_sessions": 0, "stateless_requests": 0, "worker_restarts": 0}
+
+    async def start(self) -> None:
+        await asyncio.gather(*(worker.start() for worker in self.workers))
+        self._monitor = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+        with contextlib.suppress(OSError):
+            os.rmdir(self._socket_dir)
+
+    async def _watch(self) -> None:
+        """Restart crashed workers. Their sessions are gone; clients reconnect."""
+        while True:
+            await asyncio.sleep(1)
+            for worker in self.workers:
+                if worker.alive():
+                    continue
+                print(f"Worker {worker.index} exited with {worker.process.returncode}, restarting")
+                for session_id in worker.sessions:
+                    self.sessions.pop(session_id, None)
+                worker.sessions.clear()
+                await worker.stop()
+                try:
+                    await worker.start()
+                    worker.restarts += 1
+                    self.stats["worker_restarts"] += 1
+                except RuntimeError as e:
+                    print(f"Error restarting worker {worker.index}: {e}")
+
+    async def handle_sse(self, request: Request) -> Response:
+        worker = min((w for w in self.workers if w.alive()), key=lambda w: w.streams, default=None)
+        if worker is None:
+            return PlainTextResponse("No worker available", status_code=503)
+        upstream = worker.client.build_request("GET", request.url.path, params=request.query_params, headers=_forward_headers(request))
+        worker.streams += 1
+        try:
+            response = await worker.client.send(upstream, stream=True)
+        except httpx.TransportError as e:
+            worker.streams -= 1
+            return PlainTextResponse(f"Worker unavailable: {e}", status_code=502)
+        self.stats["streams_opened"] += 1
+
+        async def body() -> AsyncIterator[bytes]:
+            session_id = None
+            head = b""
+            try:
+                async for chunk in response.aiter_raw():
+                    if session_id is None and len(head) < 4096:
+                        head += chunk
+                        match = _SESSION_ID.search(head)
+                        if match:
+                            # Registered before the client learns the id, so its first post finds the worker
+                            session_id = match.group(1).decode()
+                            self.sessions[session_id] = worker
+                            worker.sessions.add(session_id)
+                    yield chunk
+            finally:
+                worker.streams -= 1
+                if session_id is not None:
+                    self.sessions.pop(session_id, None)
+                    worker.sessions.discard(session_id)
+                # The body is cancelled when the client disconnects; closing upstream must still happen
+                with anyio.CancelScope(shield=True):
+                    await response.aclose()
+
+        return StreamingResponse(body(), status_code=response.status_code, headers=_response_headers(response))
+
+    async def handle_message(self, request: Request) -> Response:
+        session_id = request.query_params.get("session_id")
+        if session_id is None:
+            return PlainTextResponse("session_id is required", status_code=400)
+        worker = self.sessions.get(session_id)
+        if worker is None:
+            self.stats["unknown_sessions"] += 1
+            return PlainTextResponse("Could not find session", status_code=404)
+        self.stats["messages_forwarded"] += 1
+        return await _forward(worker, request)
+
+    async def handle_stateless(self, request: Request) -> Response:
+        """/jira/mcp/ carries no session, so each request goes to the worker with the fewest in flight."""
+        worker = min((w for w in self.workers if w.alive()), key=lambda w: w.requests, default=None)
+        if worker is None:
+            return PlainTextResponse("No worker available", status_code=503)
+        self.stats["stateless_requests"] += 1
+        worker.requests += 1
+        try:
+            return await _forward(worker, request)
+        finally:
+            worker.requests -= 1
+
+    async def handle_worker(self, request: Request) -> Response:
+        """/workers/{index}/{path}: reach one worker's own routes, e.g. its stats."""
+        index = int(request.path_params["index"])
+        if not 0 <= index < len(self.workers):
+            return PlainTextResponse("Unknown worker", status_code=404)
+        return await _forward(self.workers[index], request, "/" + request.path_params["path"])
+
+    async def handle_other(self, request: Request) -> Response:
+        return await _forward(self.workers[0], request)
+
+    async def handle_stats(self, request: Request) -> Response:
+        return JSONResponse({**self.stats, "sessions": len(self.sessions), "workers": [w.stats() for w in self.workers]})
+
+    async def handle_metrics(self, request: Request) -> Response:
+        """Every worker's metrics, each series labelled with worker="<index>"."""
+        lines: List[str] = []
+        seen_comments = set()
+        for worker in self.workers:
+            try:
+                response = await worker.client.get("/metrics")
+            except httpx.TransportError:
+                continue
+            for line in response.text.splitlines():
+                if line.startswith("#"):
+                    if line not in seen_comments:
+                        seen_comments.add(line)
+                        lines.append(line)
+                elif line:
+                    lines.append(_label(line, worker.index))
+        return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+    def app(self) -> Starlette:
+        @contextlib.asynccontextmanager
+        async def lifespan(app):
+            await self.start()
+            try:
+                yield
+            finally:
+                await self.stop()
+
+        return Starlette(
+            routes=[
+                Route("/jira/sse", endpoint=self.handle_sse),
+                Route("/jira/messages/", endpoint=self.handle_message, methods=["POST"]),
+                Route("/jira/mcp/", endpoint=self.handle_stateless, methods=["GET", "POST", "DELETE"]),
+                Route("/jira/workers/stats", endpoint=self.handle_stats),
+                Route("/metrics", endpoint=self.handle_metrics),
+                Route("/workers/{index:int}/{path:path}", endpoint=self.handle_worker, methods=["GET", "POST"]),
+                Route("/{path:path}", endpoint=self.handle_other, methods=["GET", "POST"]),
+            ],
+            lifespan=lifespan,
+        )
+
+def _forward_headers(request: Request) -> Dict[str, str]:
+    return {k: v for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP}
+
+def _response_headers(response: httpx.Response) -> Dict[str, str]:
+    return {k: v for k, v in response.headers.items() if k.lower() not in _HOP_BY_HOP}
+
+async def _forward(worker: Worker, request: Request, path: Optional[str] = None) -> Response:
+    try:
+        response = await worker.client.request(
+            request.method,
+            path or request.url.path,
+            params=request.query_params,
+            headers=_forward_headers(request),
+            content=await request.body(),
+        )
+    except httpx.TransportError as e:
+        return PlainTextResponse(f"Worker unavailable: {e}", status_code=502)
+    return Response(response.content, status_code=response.status_code, headers=_response_headers(response))
+
+def _label(sample: str, index: int) -> str:
+    name, brace, rest = sample.partition("{")
+    if brace:
+        return f'{name}{{worker="{index}",{rest}'
+    name, _, value = sample.partition(" ")
+    return f'{name}{{worker="{index}"}} {value}'
+
+def serve(host: str, port: int, workers: int) -> None:
+    """Run the dispatcher in front of `workers` worker processes until interrupted."""
+    import uvicorn
+
+    uvicorn.run(Dispatcher(workers).app(), host=host, port=port, log_level="info")